@@ -3,6 +3,8 @@ Stock Price Prediction Engine
 
 Primary Interface:
     analyze_stock(ticker: str) -> dict: Main prediction pipeline
+    analyze_many(tickers, workers=N): Batch pipeline yielding one result per ticker
+    prewarm(tickers=None): Load heavy modules and cached models before the first request
 
 Example Usage:
     from PredictionEngine import analyze_stock
@@ -10,9 +12,22 @@ Example Usage:
     print(results['prediction']['price'])
 """
 
-from .stock_predictor import analyze_stock
+# Only expose the main interface functions
+__all__ = ['analyze_stock', 'analyze_many', 'prewarm']
 
-# Only expose the main interface function
-__all__ = ['analyze_stock']
+__version__ = '0.1.0'
 
-__version__ = '0.1.0'
\ No newline at end of file
+# Resolved on first access, so light submodules (profiling, feature_engineer,
+# result_cache) can be imported without loading scikit-learn
+_LAZY = {
+    'analyze_stock': '.stock_predictor',
+    'analyze_many': '.batch',
+    'prewarm': '.stock_predictor',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
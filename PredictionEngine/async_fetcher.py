@@ -0,0 +1,285 @@
+import asyncio
+import atexit
+from datetime import datetime
+import random
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+from .bar_store import DownloadError
+
+YAHOO_CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{ticker}"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limit shared by every event loop and thread.
+
+    Each acquire reserves the next free slot under a plain lock and then
+    sleeps asynchronously until it, so many coroutines (or several
+    fetches running in different threads) stay under one global rate.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate = rate_per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class FetchError(DownloadError):
+    """Raised when a ticker could not be fetched after every retry"""
+
+
+def parse_chart(payload: dict) -> pd.DataFrame:
+    """
+    Convert a Yahoo chart API response into adjusted daily bars
+    Args:
+        payload: Decoded JSON from the v8 chart endpoint
+    Returns:
+        pd.DataFrame: Open/High/Low/Close/Volume adjusted like
+        yf.download(auto_adjust=True), indexed by exchange-local date
+    """
+    chart = payload.get('chart') or {}
+    if chart.get('error'):
+        raise FetchError(chart['error'].get('description', str(chart['error'])))
+    results = chart.get('result') or []
+    if not results or not results[0].get('timestamp'):
+        return pd.DataFrame()
+
+    result = results[0]
+    quote = result['indicators']['quote'][0]
+    bars = pd.DataFrame({
+        'Open': quote.get('open'),
+        'High': quote.get('high'),
+        'Low': quote.get('low'),
+        'Close': quote.get('close'),
+        'Volume': quote.get('volume'),
+    }, dtype=float)
+
+    adjclose = (result['indicators'].get('adjclose') or [{}])[0].get('adjclose')
+    if adjclose is not None:
+        ratio = np.asarray(adjclose, dtype=float) / bars['Close'].to_numpy()
+        for column in ('Open', 'High', 'Low'):
+            bars[column] *= ratio
+        bars['Close'] = np.asarray(adjclose, dtype=float)
+
+    timezone = result.get('meta', {}).get('exchangeTimezoneName', 'UTC')
+    dates = pd.to_datetime(result['timestamp'], unit='s', utc=True).tz_convert(timezone)
+    bars.index = pd.DatetimeIndex(dates.tz_localize(None).normalize(), name='Date')
+    bars = bars.dropna(how='all')
+    return bars[~bars.index.duplicated(keep='last')]
+
+
+class AsyncBarFetcher:
+    """
+    Concurrent daily-bar downloader for the Yahoo chart API.
+
+    Every request goes through one pooled aiohttp session per fetcher, so
+    connections are reused across calls. Requests are capped at
+    max_concurrency in flight, pass through a global RateLimiter and
+    retry throttling/server errors with exponential backoff plus jitter
+    instead of blocking sleeps. Use it as ``async with AsyncBarFetcher()``
+    from async code. The sync API runs on a background event loop owned
+    by the fetcher until close_sync; it backs fetch_many_sync and the
+    BarStore downloader (the instance itself) and batch_downloader
+    (``batch``). base_url can point at a local stub server.
+    """
+
+    def __init__(self, base_url: str = YAHOO_CHART_URL, max_concurrency: int = 16,
+                 rate_per_second: float = 10, burst: int = 10, max_retries: int = 4,
+                 backoff_base: float = 0.5, backoff_cap: float = 8, timeout: float = 15):
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = RateLimiter(rate_per_second, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.retries = 0
+        self._session = None
+        self._session_loop = None
+        # Event loop thread behind the sync API, started on first use
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+        return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close_sync()
+        return False
+
+    async def _get_session(self):
+        """The fetcher's pooled session, opened on first use in the running loop"""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed:
+            if self._session_loop is loop:
+                return self._session
+            if not self._session_loop.is_closed():
+                raise RuntimeError("AsyncBarFetcher is already in use from another event loop")
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={'User-Agent': 'Mozilla/5.0'})
+        self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        """Close the pooled session; await it from the loop that used the fetcher"""
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    def close_sync(self):
+        """Close the session opened by the sync API and stop its event loop"""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+        atexit.unregister(self.close_sync)
+        if self._session_loop is loop:
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def _run(self, coro):
+        """Run a coroutine on the fetcher's own loop, so the session outlives the call"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name='AsyncBarFetcher', daemon=True)
+                self._loop_thread.start()
+                atexit.register(self.close_sync)
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def _backoff(self, attempt: int, retry_after: str = None) -> float:
+        if retry_after:
+            try:
+                return min(self.backoff_cap, float(retry_after))
+            except ValueError:
+                pass
+        # "Full jitter": uniform in [0, capped exponential delay]
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    async def fetch(self, session, ticker: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """Fetch one ticker using an open aiohttp session (empty frame for an unknown ticker)"""
+        import aiohttp
+
+        params = {
+            'period1': int(pd.Timestamp(start).timestamp()),
+            'period2': int(pd.Timestamp(end).timestamp()),
+            'interval': '1d',
+            'events': 'div,splits',
+            'includeAdjustedClose': 'true',
+        }
+        url = self.base_url.format(ticker=ticker)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retries += 1
+            await self.rate_limiter.acquire()
+            retry_after = None
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status == 200:
+                        return parse_chart(await response.json(content_type=None))
+                    if response.status == 404:
+                        return pd.DataFrame()  # no such symbol
+                    if response.status not in RETRY_STATUSES:
+                        raise FetchError(f"HTTP {response.status} for '{ticker}'")
+                    retry_after = response.headers.get('Retry-After')
+                    last_error = FetchError(f"HTTP {response.status} for '{ticker}'")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+        raise FetchError(f"Giving up on '{ticker}' after {self.max_retries + 1} attempts: {last_error}")
+
+    async def fetch_many(self, tickers: list, start: datetime, end: datetime) -> tuple:
+        """
+        Fetch many tickers concurrently
+        Args:
+            tickers: Stock symbols to fetch
+            start: First date (inclusive)
+            end: Last date (exclusive)
+        Returns:
+            tuple: (bars, errors) - ticker -> bars for every ticker that
+            returned data, and ticker -> error message for every ticker that
+            failed (failures do not abort the batch); unknown tickers are in
+            neither
+        """
+        session = await self._get_session()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        errors = {}
+
+        async def fetch_one(ticker):
+            async with semaphore:
+                try:
+                    return ticker, await self.fetch(session, ticker, start, end)
+                except Exception as e:
+                    errors[ticker] = str(e)
+                    return ticker, None
+
+        results = await asyncio.gather(*(fetch_one(ticker) for ticker in tickers))
+        bars = {ticker: frame for ticker, frame in results if frame is not None and not frame.empty}
+        return bars, errors
+
+    def fetch_many_sync(self, tickers: list, start: datetime, end: datetime) -> tuple:
+        """Blocking wrapper around fetch_many, safe to call from inside a running loop"""
+        return self._run(self.fetch_many(tickers, start, end))
+
+    def __call__(self, ticker: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        BarStore downloader interface
+        Raises:
+            FetchError: If the ticker failed (an unknown ticker gives an empty frame)
+        """
+        bars, errors = self.fetch_many_sync([ticker], start, end)
+        if ticker in errors:
+            raise FetchError(errors[ticker])
+        return bars.get(ticker, pd.DataFrame())
+
+    def batch(self, tickers: list, start: datetime, end: datetime) -> dict:
+        """
+        BarStore batch_downloader interface
+        Raises:
+            FetchError: If any ticker failed; its frames and errors attributes
+                hold the bars that did arrive and the per-ticker messages
+        """
+        bars, errors = self.fetch_many_sync(list(tickers), start, end)
+        if errors:
+            raise FetchError(f"{len(errors)} of {len(tickers)} tickers failed", frames=bars, errors=errors)
+        return bars
@@ -0,0 +1,123 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, accuracy_score, roc_auc_score
+
+from .feature_engineer import FEATURES, TARGETS
+from .model_predictor import StockPredictor
+from .shared_frames import open_frame, share_all
+
+
+def walk_forward_splits(n_rows: int, n_folds: int = 5, test_size: int = None,
+                        min_train_size: int = 60, expanding: bool = True) -> list:
+    """
+    Chronological train/test windows for a walk-forward backtest
+    Args:
+        n_rows: Number of rows in the series
+        n_folds: Number of test windows
+        test_size: Rows per test window (defaults to an even split of
+            everything after min_train_size)
+        min_train_size: Rows in the first training window
+        expanding: Grow the training window (True) or slide a window of
+            min_train_size rows (False)
+    Returns:
+        list: (train_start, train_end, test_end) row positions per fold;
+        each fold tests on rows [train_end, test_end)
+    """
+    if test_size is None:
+        test_size = (n_rows - min_train_size) // n_folds
+    if test_size < 1 or min_train_size + test_size > n_rows:
+        raise ValueError(
+            f"Not enough rows ({n_rows}) for {n_folds} folds after {min_train_size} training rows")
+
+    splits = []
+    train_end = n_rows - n_folds * test_size
+    train_end = max(train_end, min_train_size)
+    while train_end + test_size <= n_rows and len(splits) < n_folds:
+        train_start = 0 if expanding else train_end - min_train_size
+        splits.append((train_start, train_end, train_end + test_size))
+        train_end += test_size
+    return splits
+
+
+def _run_fold(handle, start: int, stop: int, train_start: int, train_end: int, test_end: int) -> dict:
+    """Train on one fold of a ticker's shared frame (rows [start, stop)) and score the test window"""
+    matrix = open_frame(handle, start, stop).to_numpy()
+    n_features = len(FEATURES)
+    train = matrix[train_start:train_end]
+    test = matrix[train_end:test_end]
+
+    X_train, X_test = train[:, :n_features], test[:, :n_features]
+    y_train_reg, y_test_reg = train[:, n_features], test[:, n_features]
+    y_train_clf = train[:, n_features + 1].astype(int)
+    y_test_clf = test[:, n_features + 1].astype(int)
+
+    predictor = StockPredictor()
+    predictor.train_models(X_train, y_train_reg, y_train_clf)
+    reg_preds = predictor.reg_model.predict(X_test)
+    clf_preds = predictor.clf_model.predict(X_test)
+    clf_proba = predictor.clf_model.predict_proba(X_test)[:, 1]
+
+    return {
+        'n_train': train_end - train_start,
+        'n_test': test_end - train_end,
+        'mae': mean_absolute_error(y_test_reg, reg_preds),
+        'accuracy': accuracy_score(y_test_clf, clf_preds),
+        # ROC-AUC is undefined when the window only holds one direction
+        'roc_auc': roc_auc_score(y_test_clf, clf_proba) if len(np.unique(y_test_clf)) == 2 else np.nan,
+    }
+
+
+def walk_forward_backtest(processed, n_folds: int = 5, test_size: int = None,
+                          min_train_size: int = 60, expanding: bool = True,
+                          workers: int = None) -> pd.DataFrame:
+    """
+    Walk-forward backtest of StockPredictor over one or many tickers
+    Feature matrices are written once to a SharedFrames matrix; the worker
+    processes only receive its handle and row ranges, so folds run in
+    parallel without pickling the history to each of them.
+    Args:
+        processed: Output of add_technical_features, or a dict of
+            ticker -> output for a multi-ticker backtest
+        n_folds: Test windows per ticker
+        test_size: Rows per test window (see walk_forward_splits)
+        min_train_size: Rows in the first training window
+        expanding: Expanding (True) or sliding (False) training window
+        workers: Number of worker processes (None = one per CPU, 1 = in-process)
+    Returns:
+        pd.DataFrame: One row per ticker and fold with dates, sizes and
+        out-of-sample MAE, accuracy and ROC-AUC
+    """
+    if isinstance(processed, pd.DataFrame):
+        processed = {'': processed}
+
+    jobs = []
+    for ticker, data in processed.items():
+        for fold, (train_start, train_end, test_end) in enumerate(
+                walk_forward_splits(len(data), n_folds, test_size, min_train_size, expanding)):
+            jobs.append({
+                'ticker': ticker,
+                'fold': fold,
+                'train_start': data.index[train_start],
+                'test_start': data.index[train_end],
+                'test_end': data.index[test_end - 1],
+                'args': (train_start, train_end, test_end),
+            })
+
+    with ExitStack() as stack:
+        shared = share_all(processed, stack, columns=FEATURES + TARGETS, dtype=np.float64)
+        args = [shared[job['ticker']] + job['args'] for job in jobs]
+        if workers == 1:
+            scores = [_run_fold(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_run_fold, *a) for a in args]
+                scores = [future.result() for future in futures]
+
+    rows = []
+    for job, score in zip(jobs, scores):
+        row = {k: v for k, v in job.items() if k != 'args'}
+        row.update(score)
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,419 @@
+from datetime import datetime, timedelta
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from .profiling import profile_stage
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "STOCK_BAR_STORE_DIR", os.path.join("/tmp", "stock_bars"))
+# Parquet metadata keys: the earliest start date requested for a ticker, and
+# the end of the last request the downloader answered for it
+REQUESTED_START_ATTR = "requested_start"
+CHECKED_AT_ATTR = "checked_at"
+# Relative difference in the overlapping bar's adjusted close above which
+# stored history is treated as re-adjusted upstream (split or dividend)
+ADJUSTMENT_TOLERANCE = 1e-4
+
+
+class TickerNotFoundError(ValueError):
+    """Raised when the downloader has no bars at all for a ticker"""
+
+
+class DownloadError(Exception):
+    """
+    Raised by a downloader when the source failed, as opposed to having no bars
+    Batch downloaders attach the frames that did arrive (``frames``) and
+    ticker -> message for the ones that failed (``errors``), so the rest of
+    the batch is kept.
+    """
+
+    def __init__(self, message: str, frames: dict = None, errors: dict = None):
+        super().__init__(message)
+        self.frames = frames or {}
+        self.errors = errors or {}
+
+
+def _import_yfinance():
+    """yfinance, imported on the first download with its cache redirected to /tmp"""
+    import appdirs
+    appdirs.user_cache_dir = lambda *args: "/tmp"
+    import yfinance as yf
+    return yf
+
+
+def yfinance_downloader(ticker: str, start: datetime, end: datetime) -> pd.DataFrame:
+    """
+    Download daily bars from Yahoo Finance in a single attempt
+    yf.download reports failures as an empty frame, so for this source an
+    empty answer only counts as fresh for BarStore.recheck_after.
+    Args:
+        ticker: Stock symbol to download
+        start: First date to request (inclusive)
+        end: Last date to request (exclusive)
+    Returns:
+        pd.DataFrame: Bars as returned by yfinance (may be empty)
+    """
+    yf = _import_yfinance()
+
+    return yf.download(
+        ticker,
+        start=start.strftime("%Y-%m-%d"),
+        end=end.strftime("%Y-%m-%d"),
+        auto_adjust=True,
+        progress=False
+    )
+
+
+def yfinance_batch_downloader(tickers: list, start: datetime, end: datetime) -> dict:
+    """
+    Download daily bars for several tickers in one grouped request
+    Args:
+        tickers: Stock symbols to download
+        start: First date to request (inclusive)
+        end: Last date to request (exclusive)
+    Returns:
+        dict: Ticker -> bars for every ticker that returned data
+    """
+    yf = _import_yfinance()
+
+    df = yf.download(
+        tickers,
+        start=start.strftime("%Y-%m-%d"),
+        end=end.strftime("%Y-%m-%d"),
+        auto_adjust=True,
+        progress=False,
+        group_by="ticker"
+    )
+    frames = {}
+    for ticker in tickers:
+        if ticker in df.columns.get_level_values(0):
+            bars = df[ticker].dropna(how="all")
+            if not bars.empty:
+                frames[ticker] = bars
+    return frames
+
+
+def flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Drop the ticker level from yfinance's (Price, Ticker) column index"""
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    df.columns.name = None
+    return df
+
+
+class BarStore:
+    """
+    On-disk store of daily OHLCV bars, one Parquet file per ticker.
+
+    History is kept across calls and only the bars from the last stored
+    date on are requested from the downloader, so a store that already
+    holds the previous session never touches the network. The downloader
+    is any callable ``(ticker, start, end) -> DataFrame`` which makes the
+    store usable offline with a fake source; it raises on failure and
+    returns an empty frame only when there are no bars.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, downloader=yfinance_downloader,
+                 batch_downloader=yfinance_batch_downloader,
+                 max_retries: int = 3, retry_delay: float = 2,
+                 recheck_after: timedelta = timedelta(hours=1)):
+        """
+        Args:
+            root: Directory holding the Parquet files
+            downloader: ``(ticker, start, end) -> DataFrame``
+            batch_downloader: ``(tickers, start, end) -> dict`` or None to
+                download one ticker at a time
+            max_retries: Download attempts per ticker
+            retry_delay: Seconds between attempts
+            recheck_after: How long after a successful check (by request end)
+                the store counts as fresh while the previous session is still missing
+        """
+        self.root = root
+        self.downloader = downloader
+        self.batch_downloader = batch_downloader
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.recheck_after = recheck_after
+
+    def path(self, ticker: str) -> str:
+        safe_name = ticker.upper().replace("/", "_")
+        return os.path.join(self.root, f"{safe_name}.parquet")
+
+    def read(self, ticker: str) -> pd.DataFrame:
+        """Load every stored bar for ticker (empty frame if none)"""
+        return self._load(ticker)[0]
+
+    def _load(self, ticker: str) -> tuple:
+        """(stored bars, earliest start ever requested for them, last check time); None when unknown"""
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return pd.DataFrame(), None, None
+        with profile_stage('fetch.store_read'):
+            bars = pd.read_parquet(path)
+        meta = [bars.attrs.get(key) for key in (REQUESTED_START_ATTR, CHECKED_AT_ATTR)]
+        bars.attrs.clear()
+        return (bars, *(None if value is None else pd.Timestamp(value) for value in meta))
+
+    def write(self, ticker: str, bars: pd.DataFrame, requested_start: datetime = None,
+              checked_at: datetime = None):
+        """
+        Replace the stored history for ticker
+        Args:
+            ticker: Stock symbol
+            bars: Complete history to store
+            requested_start: Earliest date these bars were requested from; a
+                ticker listed later than that is then not re-downloaded
+            checked_at: End of the last request the downloader answered for
+                ticker (the time of that check, for callers asking up to now)
+        """
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.path(ticker) + ".tmp"
+        bars = bars.copy(deep=False)
+        bars.attrs = {}
+        for key, value in ((REQUESTED_START_ATTR, requested_start), (CHECKED_AT_ATTR, checked_at)):
+            if value is not None:
+                bars.attrs[key] = pd.Timestamp(value).isoformat()
+        bars.to_parquet(tmp_path)
+        os.replace(tmp_path, self.path(ticker))
+
+    @staticmethod
+    def _covers(stored: pd.DataFrame, requested_start, start: datetime) -> bool:
+        """True when stored bars already hold everything upstream has from start on"""
+        if stored.empty:
+            return False
+        if requested_start is not None and requested_start <= pd.Timestamp(start):
+            return True
+        return stored.index[0] <= start + timedelta(days=7)
+
+    @staticmethod
+    def _window_start(stored: pd.DataFrame, requested_start, start: datetime) -> pd.Timestamp:
+        """First date of a full download that keeps every stored bar"""
+        start = pd.Timestamp(start)
+        earliest = requested_start if requested_start is not None else (
+            stored.index[0] if not stored.empty else start)
+        return min(start, earliest)
+
+    def _is_fresh(self, stored: pd.DataFrame, checked_at, end: datetime) -> bool:
+        if stored.empty:
+            return False
+        # Every session before end is stored: nothing more can exist upstream
+        if stored.index[-1] >= pd.Timestamp(end).normalize() - pd.offsets.BDay(1):
+            return True
+        # Otherwise (holiday, late data) only a recent answer counts
+        return checked_at is not None and checked_at > pd.Timestamp(end) - self.recheck_after
+
+    def is_fresh(self, ticker: str, today: datetime) -> bool:
+        """True when ticker's stored bars need no download for a request ending today"""
+        stored, _, checked_at = self._load(ticker)
+        return self._is_fresh(stored, checked_at, today)
+
+    @staticmethod
+    def _rebased(stored: pd.DataFrame, new_bars: pd.DataFrame) -> bool:
+        """True when new_bars' adjusted close on the last stored date differs from the stored one"""
+        last = stored.index[-1]
+        if last not in new_bars.index:
+            return True
+        old, new = stored['Close'].iloc[-1], new_bars['Close'].loc[last]
+        return not np.isclose(new, old, rtol=ADJUSTMENT_TOLERANCE, atol=0)
+
+    def _download(self, ticker: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Download with retries
+        Returns:
+            pd.DataFrame: Flat bars, empty when the downloader answered with none
+        Raises:
+            DownloadError: If the last attempt failed
+        """
+        error = None
+        for attempt in range(self.max_retries):
+            try:
+                with profile_stage('fetch.download'):
+                    df = self.downloader(ticker, start, end)
+            except Exception as e:
+                error = e
+            else:
+                if not df.empty:
+                    return flatten_columns(df)
+                error = None
+            if attempt < self.max_retries - 1:
+                with profile_stage('fetch.retry_sleep'):
+                    time.sleep(self.retry_delay)
+        if error is not None:
+            raise DownloadError(
+                f"Download for '{ticker}' failed after {self.max_retries} attempts: {error}") from error
+        return pd.DataFrame()
+
+    def _download_many(self, tickers: list, start: datetime, end: datetime) -> tuple:
+        """(ticker -> bars, tickers whose download failed) from one grouped request"""
+        try:
+            with profile_stage('fetch.download'):
+                return self.batch_downloader(tickers, start, end), set()
+        except DownloadError as e:
+            return e.frames, set(e.errors) or set(tickers) - set(e.frames)
+
+    def _mark_checked(self, ticker: str, stored: pd.DataFrame, requested_start, end: datetime):
+        """Record that the downloader answered up to end for ticker without new bars"""
+        if not stored.empty:
+            self.write(ticker, stored, requested_start, end)
+
+    def refresh(self, ticker: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Bring the stored history up to date and return all stored bars
+        Args:
+            ticker: Stock symbol to refresh
+            start: Earliest date the caller needs
+            end: Last date to request (exclusive)
+        Returns:
+            pd.DataFrame: Complete stored history with flat OHLCV columns
+            (the stored bars as they are if the download fails)
+        Raises:
+            TickerNotFoundError: If nothing is stored and the download is empty
+            DownloadError: If nothing is stored and the download fails
+        """
+        stored, requested_start, checked_at = self._load(ticker)
+        covered = self._covers(stored, requested_start, start)
+        if covered and self._is_fresh(stored, checked_at, end):
+            return stored
+
+        rebased = False
+        if covered:
+            # Warm store: ask from the last stored date on. The overlapping bar
+            # shows whether upstream re-adjusted history since it was stored.
+            try:
+                new_bars = self._download(ticker, stored.index[-1], end)
+            except DownloadError:
+                return stored  # not marked as checked, so the next call retries
+            if new_bars.empty:
+                self._mark_checked(ticker, stored, requested_start, end)
+                return stored
+            rebased = self._rebased(stored, new_bars)
+            if not rebased:
+                return self._merge(ticker, stored, new_bars, requested_start, end)
+
+        # Cold store, history shorter than requested, or re-adjusted history:
+        # fetch the full window
+        window_start = self._window_start(stored, requested_start, start)
+        try:
+            new_bars = self._download(ticker, window_start, end)
+        except DownloadError:
+            if stored.empty:
+                raise
+            return stored
+        if new_bars.empty and stored.empty:
+            raise TickerNotFoundError(
+                f"No data returned for ticker '{ticker}' after {self.max_retries} attempts.")
+        requested_start = window_start
+        if new_bars.empty:
+            self._mark_checked(ticker, stored, requested_start, end)
+            return stored
+        # Re-adjusted history is replaced rather than stitched onto
+        return self._merge(ticker, pd.DataFrame() if rebased else stored, new_bars, requested_start, end)
+
+    def _merge(self, ticker: str, stored: pd.DataFrame, new_bars: pd.DataFrame,
+               requested_start, end: datetime) -> pd.DataFrame:
+        merged = pd.concat([stored, new_bars]) if not stored.empty else new_bars
+        stored = merged[~merged.index.duplicated(keep="last")].sort_index()
+        self.write(ticker, stored, requested_start, end)
+        return stored
+
+    def get(self, ticker: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """Return bars in [start, end) for ticker, refreshing the store as needed"""
+        bars = self.refresh(ticker, start, end)
+        return bars.loc[(bars.index >= start) & (bars.index < end)]
+
+    def get_many(self, tickers: list, start: datetime, end: datetime) -> dict:
+        """
+        Return bars in [start, end) for several tickers
+        Stale tickers are refreshed with at most two grouped downloads (one
+        for warm tickers, one for cold or re-adjusted ones) instead of one
+        request each.
+        Args:
+            tickers: Stock symbols to load
+            start: Earliest date the caller needs
+            end: Last date to request (exclusive)
+        Returns:
+            dict: Ticker -> bars; tickers without any data (or whose first
+            download failed) are left out
+        """
+        if self.batch_downloader is None:
+            frames = {}
+            for ticker in tickers:
+                try:
+                    frames[ticker] = self.get(ticker, start, end)
+                except (ValueError, DownloadError):
+                    continue
+            return frames
+
+        stored, requested, checked = {}, {}, {}
+        for ticker in tickers:
+            stored[ticker], requested[ticker], checked[ticker] = self._load(ticker)
+        cold, warm = [], []
+        for ticker, bars in stored.items():
+            if not self._covers(bars, requested[ticker], start):
+                cold.append(ticker)
+            elif not self._is_fresh(bars, checked[ticker], end):
+                warm.append(ticker)
+
+        rebased = set()
+        if warm:
+            # From the earliest last stored date, so every ticker gets an overlapping bar
+            new_frames, failed = self._download_many(
+                warm, min(stored[t].index[-1] for t in warm), end)
+            for ticker in warm:
+                new_bars = new_frames.get(ticker)
+                if ticker in failed:
+                    continue
+                if new_bars is None or new_bars.empty:
+                    self._mark_checked(ticker, stored[ticker], requested[ticker], end)
+                    continue
+                new_bars = flatten_columns(new_bars)
+                if self._rebased(stored[ticker], new_bars):
+                    rebased.add(ticker)
+                    cold.append(ticker)
+                else:
+                    stored[ticker] = self._merge(ticker, stored[ticker], new_bars, requested[ticker], end)
+
+        if cold:
+            window_start = min(self._window_start(stored[t], requested[t], start) for t in cold)
+            new_frames, failed = self._download_many(cold, window_start, end)
+            for ticker in cold:
+                new_bars = new_frames.get(ticker)
+                if ticker in failed:
+                    continue
+                requested[ticker] = window_start
+                if new_bars is None or new_bars.empty:
+                    self._mark_checked(ticker, stored[ticker], requested[ticker], end)
+                    continue
+                old = pd.DataFrame() if ticker in rebased else stored[ticker]
+                stored[ticker] = self._merge(ticker, old, flatten_columns(new_bars), requested[ticker], end)
+
+        return {
+            ticker: bars.loc[(bars.index >= start) & (bars.index < end)]
+            for ticker, bars in stored.items()
+            if not bars.empty
+        }
+
+
+_default_store = None
+
+
+def get_default_store() -> BarStore:
+    """
+    Shared store instance used by fetch_stock_data
+    Set STOCK_FETCH_BACKEND=async to download through AsyncBarFetcher
+    (pooled, rate-limited, non-blocking retries) instead of yfinance.
+    """
+    global _default_store
+    if _default_store is None:
+        if os.environ.get("STOCK_FETCH_BACKEND") == "async":
+            from .async_fetcher import AsyncBarFetcher
+            fetcher = AsyncBarFetcher()
+            # The fetcher retries with backoff itself
+            _default_store = BarStore(downloader=fetcher, batch_downloader=fetcher.batch,
+                                      max_retries=1)
+        else:
+            _default_store = BarStore()
+    return _default_store
@@ -0,0 +1,76 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from .data_fetcher import fetch_many
+from .feature_engineer import add_technical_features_many
+from .profiling import Profiler, profile_stage
+from .shared_frames import open_frame, try_share
+from .stock_predictor import run_models
+
+def _run_models_safe(ticker, processed_data, horizons=None) -> dict:
+    try:
+        profiler = Profiler()
+        with profiler, profile_stage('run_models'):
+            results = run_models(ticker, processed_data, horizons=horizons)
+        results['profile'] = profiler.records
+        return results
+    except Exception as e:
+        return {'ticker': ticker, 'error': str(e)}
+
+def _run_models_shared(handle, ticker, start, stop, horizons=None) -> dict:
+    return _run_models_safe(ticker, open_frame(handle, start, stop), horizons)
+
+def analyze_many(tickers, workers: int = None, store=None, horizons=None):
+    """
+    Run the analysis pipeline for many tickers
+    Bars are loaded with one grouped fetch, features are built in one
+    vectorized pass and the per-ticker models train in a process pool
+    that reads the features from one shared memory-mapped matrix (frames
+    whose columns differ from the rest are pickled to the workers).
+    Args:
+        tickers: Stock symbols to analyze
+        workers: Number of worker processes (None = one per CPU, 1 = in-process)
+        store: Optional BarStore to read bars from
+        horizons: Forecast horizons (see analyze_stock)
+    Yields:
+        dict: One analyze_stock result per ticker, in completion order;
+        'profile' holds the ticker's model stages (fetching and features
+        run once for the whole batch). Tickers that fail to fetch, build
+        features or train yield {'ticker': ..., 'error': ...} instead so
+        the rest of the batch keeps running.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    raw_frames = fetch_many(tickers, store=store)
+
+    for ticker in tickers:
+        if ticker not in raw_frames:
+            yield {'ticker': ticker, 'error': f"No data returned for ticker '{ticker}'."}
+
+    errors = {}
+    processed = add_technical_features_many(raw_frames, horizons=horizons, errors=errors)
+    for ticker, message in errors.items():
+        yield {'ticker': ticker, 'error': message}
+
+    if workers == 1:
+        for ticker, data in processed.items():
+            yield _run_models_safe(ticker, data, horizons)
+        return
+
+    if not processed:
+        return
+    with try_share(processed) or nullcontext() as shared, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for ticker in list(processed):
+            data = processed.pop(ticker)
+            if shared is not None and ticker in shared.ranges:
+                future = pool.submit(_run_models_shared, shared.handle, ticker, *shared.ranges[ticker], horizons)
+            else:
+                # Columns differ from the shared matrix's (or it could not be written): pickle the frame
+                future = pool.submit(_run_models_safe, ticker, data, horizons)
+            futures[future] = ticker
+        del data
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # Worker crashed or the result could not be pickled back
+                yield {'ticker': futures[future], 'error': str(e)}
@@ -0,0 +1,265 @@
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.multioutput import MultiOutputRegressor
+
+
+class CompiledForest:
+    """
+    A fitted RandomForestRegressor flattened into contiguous node arrays.
+
+    Every tree's nodes are stored back to back. All (row, tree) pairs
+    advance one level per vectorized step, and pairs that reach a leaf
+    drop out of the working set. Rows are compared in float32 like
+    sklearn's tree code, and tree outputs are summed in estimator order
+    before dividing by the tree count, so predictions are bit-identical
+    to ``forest.predict``. Multi-output forests keep one leaf value per
+    output, so all outputs come from the same traversal.
+    """
+
+    # sklearn's tree code compares float32 copies of the inputs
+    input_dtype = np.float32
+
+    def __init__(self, forest):
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        if not trees:
+            raise ValueError("CompiledForest needs a fitted forest")
+        self._flatten([(tree.children_left, tree.children_right, tree.feature, tree.threshold,
+                        getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=bool)),
+                        tree.value[:, :, 0]) for tree in trees],
+                      forest.n_features_in_)
+
+    def _flatten(self, trees: list, n_features: int):
+        """
+        Store trees back to back
+        Args:
+            trees: Per tree, (children_left, children_right, feature, threshold,
+                missing_go_to_left, value) node arrays with -1 children at
+                leaves and value shaped (nodes, outputs)
+            n_features: Input columns
+        """
+        self.n_outputs = trees[0][5].shape[1]
+        sizes = np.array([len(tree[0]) for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        children = np.empty((sizes.sum(), 2), dtype=np.intp)
+        feature = np.zeros(sizes.sum(), dtype=np.intp)
+        threshold = np.zeros(sizes.sum(), dtype=np.float64)
+        missing_left = np.zeros(sizes.sum(), dtype=bool)
+        value = np.empty((sizes.sum(), self.n_outputs), dtype=np.float64)
+
+        for (left, right, split_feature, split_threshold, missing, leaf_value), offset, size in zip(
+                trees, offsets, sizes):
+            nodes = slice(offset, offset + size)
+            own = np.arange(offset, offset + size)
+            is_leaf = left == -1
+            children[nodes, 0] = np.where(is_leaf, own, left + offset)
+            children[nodes, 1] = np.where(is_leaf, own, right + offset)
+            feature[nodes] = np.where(is_leaf, 0, split_feature)
+            threshold[nodes] = split_threshold
+            missing_left[nodes] = missing
+            value[nodes] = leaf_value
+
+        self.roots = offsets.astype(np.intp)
+        self.children = children.reshape(-1)  # node * 2 + go_right
+        self.is_leaf = children[:, 0] == np.arange(len(children))
+        self.feature = feature
+        self.threshold = threshold
+        self.missing_go_to_left = missing_left
+        self.value = np.ascontiguousarray(value[:, 0]) if self.n_outputs == 1 else value
+        self.n_features = n_features
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Leaf node index reached by every row in every tree, shaped (rows, trees)"""
+        X = np.asarray(X, dtype=self.input_dtype)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected an array of shape (n, {self.n_features})")
+        X = np.ascontiguousarray(X).reshape(-1)
+        has_nan = np.isnan(X).any()
+        n_trees = len(self.roots)
+        n_rows = len(X) // self.n_features
+
+        # Tree-major order keeps each step's node lookups within one tree at a time
+        nodes = np.repeat(self.roots, n_rows)
+        row_start = np.tile(np.arange(n_rows, dtype=np.intp) * self.n_features, n_trees)
+        active = np.flatnonzero(~self.is_leaf[nodes])
+        while active.size:
+            current = nodes[active]
+            x = X[row_start[active] + self.feature[current]]
+            if has_nan:
+                go_right = ~(x <= self.threshold[current]) & ~(np.isnan(x) & self.missing_go_to_left[current])
+            else:
+                go_right = x > self.threshold[current]
+            current = self.children[2 * current + go_right]
+            nodes[active] = current
+            active = active[~self.is_leaf[current]]
+        return nodes.reshape(n_trees, n_rows).T
+
+    def tree_predictions(self, X: np.ndarray) -> np.ndarray:
+        """Every tree's output for each row of X, shaped (rows, trees[, outputs])"""
+        return self.value[self.apply(X)]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Forest mean prediction for each row of X, shaped (rows, outputs) for multi-output forests"""
+        leaf_values = self.tree_predictions(X)
+        # accumulate adds strictly left to right, matching sklearn's per-tree +=
+        return np.add.accumulate(leaf_values, axis=1)[:, -1] / len(self.roots)
+
+
+class CompiledGradientBoosting(CompiledForest):
+    """
+    A fitted HistGradientBoostingRegressor on the same flat node layout.
+
+    Splits compare the raw float64 inputs against each node's numeric
+    threshold, and tree outputs are added to the baseline in boosting
+    order, matching ``model.predict`` bit for bit.
+    """
+    input_dtype = np.float64
+
+    def __init__(self, model):
+        predictors = [iteration[0] for iteration in model._predictors]
+        if not predictors:
+            raise ValueError("CompiledGradientBoosting needs a fitted model")
+        if any(predictor.nodes['is_categorical'].any() for predictor in predictors):
+            raise ValueError("CompiledGradientBoosting does not support categorical splits")
+        trees = []
+        for predictor in predictors:
+            nodes = predictor.nodes
+            is_leaf = nodes['is_leaf'].astype(bool)
+            trees.append((np.where(is_leaf, -1, nodes['left'].astype(np.intp)),
+                          np.where(is_leaf, -1, nodes['right'].astype(np.intp)),
+                          nodes['feature_idx'], nodes['num_threshold'],
+                          nodes['missing_go_to_left'].astype(bool), nodes['value'][:, None]))
+        self._flatten(trees, model.n_features_in_)
+        self.baseline = float(model._baseline_prediction.reshape(-1)[0])
+        self.inverse_link = model._loss.link.inverse
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Boosted prediction for each row of X"""
+        leaf_values = self.value[self.apply(X)]
+        raw = np.concatenate([np.full((len(leaf_values), 1), self.baseline), leaf_values], axis=1)
+        return self.inverse_link(np.add.accumulate(raw, axis=1)[:, -1])
+
+
+class CompiledLinearRegressor:
+    """Ridge or least-squares regression reduced to one dot product"""
+
+    def __init__(self, model):
+        self.coef_T = model.coef_.T
+        self.intercept = model.intercept_
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64) @ self.coef_T + self.intercept
+
+
+class _StackedRegressor:
+    """One compiled regressor per target of a MultiOutputRegressor"""
+
+    def __init__(self, regressors):
+        self.regressors = regressors
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return np.stack([regressor.predict(X) for regressor in self.regressors], axis=1)
+
+
+class _EstimatorRegressor:
+    """Regressors without a compiled form keep their own predict"""
+
+    def __init__(self, model, features):
+        self.model = model
+        # Hand back feature names only if the model was fitted with them
+        self.features = list(features) if hasattr(model, 'feature_names_in_') else None
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if self.features is not None:
+            X = pd.DataFrame(X, columns=self.features)
+        return self.model.predict(X)
+
+
+def compile_regressor(model, features=None):
+    """
+    Compiled form of a fitted price regressor
+    Args:
+        model: RandomForestRegressor, HistGradientBoostingRegressor, Ridge or
+            LinearRegression; anything else falls back to its own predict
+        features: Column names the model was fitted on
+    Returns:
+        Object with predict(X) -> prices
+    """
+    if isinstance(model, RandomForestRegressor):
+        return CompiledForest(model)
+    if isinstance(model, HistGradientBoostingRegressor) and model.n_trees_per_iteration_ == 1:
+        return CompiledGradientBoosting(model)
+    if isinstance(model, (Ridge, LinearRegression)):
+        return CompiledLinearRegressor(model)
+    if isinstance(model, MultiOutputRegressor):
+        return _StackedRegressor([compile_regressor(estimator, features) for estimator in model.estimators_])
+    return _EstimatorRegressor(model, features)
+
+
+class CompiledLinearClassifier:
+    """
+    Binary linear classifier reduced to one dot product.
+
+    Accepts LogisticRegression or OnlineClassifier (standard scaling
+    followed by SGD with log loss) and reproduces their predict and
+    predict_proba exactly.
+    """
+
+    def __init__(self, model):
+        scaler = getattr(model, 'scaler', None)
+        estimator = getattr(model, 'model', model)
+        if len(estimator.classes_) != 2:
+            raise ValueError("CompiledLinearClassifier supports binary classifiers only")
+        self.mean = scaler.mean_ if scaler is not None and scaler.with_mean else None
+        self.scale = scaler.scale_ if scaler is not None and scaler.with_std else None
+        self.coef_T = estimator.coef_.T
+        self.intercept = estimator.intercept_
+        self.classes = estimator.classes_
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if self.mean is not None:
+            X = X - self.mean
+        if self.scale is not None:
+            X = X / self.scale
+        return (X @ self.coef_T + self.intercept).reshape(-1)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes[(self.decision_function(X) > 0).astype(np.intp)]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        prob = expit(self.decision_function(X))
+        return np.stack([1 - prob, prob], axis=1)
+
+
+class CompiledPredictor:
+    """Compiled price regressor plus direction classifier(s) of a trained StockPredictor"""
+
+    def __init__(self, predictor):
+        self.features = list(predictor.features)
+        self.regressor = compile_regressor(predictor.reg_model, self.features)
+        # MultiOutputClassifier: one binary classifier per horizon
+        estimators = getattr(predictor.clf_model, 'estimators_', None)
+        self.classifiers = [CompiledLinearClassifier(model) for model in estimators] if estimators else None
+        self.classifier = None if estimators else CompiledLinearClassifier(predictor.clf_model)
+
+    def predict_arrays(self, X) -> tuple:
+        """
+        Predict many rows at once
+        Args:
+            X: (rows, features) array or DataFrame in predictor.features order
+        Returns:
+            tuple: (price, direction, up_probability) arrays, one entry per row
+            (rows of one entry per horizon for multi-horizon predictors)
+        """
+        if hasattr(X, 'columns'):
+            X = X[self.features]
+        X = np.asarray(X, dtype=np.float64)
+        if self.classifiers is not None:
+            return (self.regressor.predict(X),
+                    np.stack([c.predict(X) for c in self.classifiers], axis=1),
+                    np.stack([c.predict_proba(X)[:, 1] for c in self.classifiers], axis=1))
+        return (self.regressor.predict(X), self.classifier.predict(X),
+                self.classifier.predict_proba(X)[:, 1])
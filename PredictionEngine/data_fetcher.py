@@ -1,27 +1,65 @@
 from datetime import datetime, timedelta
-import time
-import pandas as pd
 import os
-import yfinance as yf
+import numpy as np
+import pandas as pd
+
+from .bar_store import get_default_store
+from .profiling import profiled
+
+# Bar dtype for ingested frames; float32 halves memory for large universes
+DEFAULT_DTYPE = os.environ.get("STOCK_FRAME_DTYPE", "float64")
+
+@profiled('fetch')
+def fetch_stock_data(ticker: str, store=None, days: int = 365, dtype=None) -> pd.DataFrame:
+    """
+    Fetch recent daily bars for ticker (the last year by default)
+    Args:
+        ticker: Stock symbol to fetch
+        store: Optional BarStore; defaults to the shared on-disk store
+        days: Calendar days of history to return
+        dtype: Value dtype (defaults to DEFAULT_DTYPE)
+    Returns:
+        pd.DataFrame: Flat OHLCV bars (see compact_frame)
+    """
+    end_date = datetime.today()
+    start_date = end_date - timedelta(days=days)
+    store = store or get_default_store()
+
+    return compact_frame(store.get(ticker, start_date, end_date), dtype)
 
-import appdirs
-appdirs.user_cache_dir = lambda *args: "/tmp"
 
-def fetch_stock_data(ticker: str) -> pd.DataFrame:
+@profiled('fetch')
+def fetch_many(tickers: list, store=None, days: int = 365, dtype=None) -> dict:
+    """
+    Fetch recent daily bars for several tickers at once
+    Args:
+        tickers: Stock symbols to fetch
+        store: Optional BarStore; defaults to the shared on-disk store
+        days: Calendar days of history to return
+        dtype: Value dtype (defaults to DEFAULT_DTYPE)
+    Returns:
+        dict: Ticker -> bars (same layout as fetch_stock_data); tickers
+        with no data are left out
+    """
     end_date = datetime.today()
-    start_date = end_date - timedelta(days=365)
-    max_retries = 3
-
-    for attempt in range(max_retries):
-        df = yf.download(
-            ticker,
-            start=start_date.strftime("%Y-%m-%d"),
-            end=end_date.strftime("%Y-%m-%d"),
-            auto_adjust=True,
-            progress=False
-        )
-        if not df.empty:
-            return df
-        time.sleep(2)
-
-    raise ValueError(f"No data returned for ticker '{ticker}' after {max_retries} attempts.")
\ No newline at end of file
+    start_date = end_date - timedelta(days=days)
+    store = store or get_default_store()
+
+    frames = store.get_many(list(tickers), start_date, end_date)
+    return {ticker: compact_frame(df, dtype) for ticker, df in frames.items()}
+
+
+def compact_frame(bars: pd.DataFrame, dtype=None) -> pd.DataFrame:
+    """
+    Normalize bars into a flat frame backed by one contiguous array
+    Args:
+        bars: Bars with flat or yfinance-style (Price, Ticker) columns
+        dtype: Value dtype (defaults to DEFAULT_DTYPE)
+    Returns:
+        pd.DataFrame: Single-level columns over one column-major block, so
+        each column is contiguous and no per-column arrays are allocated
+    """
+    if isinstance(bars.columns, pd.MultiIndex):
+        bars = bars.droplevel(list(range(1, bars.columns.nlevels)), axis=1)
+    values = np.asfortranarray(bars.to_numpy(dtype=np.dtype(dtype or DEFAULT_DTYPE)))
+    return pd.DataFrame(values, index=bars.index, columns=list(bars.columns), copy=False)
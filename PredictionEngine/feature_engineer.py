@@ -1,30 +1,251 @@
+import numpy as np
 import pandas as pd
 
-def add_technical_features(data: pd.DataFrame) -> pd.DataFrame:
+from .feature_registry import INDICATORS, compute_indicators, register_indicator, warmup_rows
+from .profiling import profiled
+
+# Bump whenever an indicator definition changes so cached models are retrained
+FEATURE_SET_VERSION = 1
+
+# Default model inputs; any registered indicator name can be requested instead
+FEATURES = ['Lag_1', 'Lag_2', 'MA_5', 'MA_20', 'RSI']
+TARGETS = ['Target_Price', 'Target_UpDown']
+# Forecast horizons (trading days) for multi-horizon models
+HORIZONS = [1, 5, 10, 20]
+
+# Indicator definitions. Each function receives its dependencies in the
+# order listed and works on a Series (one ticker) or a wide DataFrame (one
+# column per ticker); pandas applies the same operations column-wise.
+
+# Lag features
+for _lag in range(1, 6):
+    register_indicator(f'Lag_{_lag}', window=_lag)(lambda close, k=_lag: close.shift(k))
+
+@register_indicator('Return_1', depends=('Close', 'Lag_1'))
+def _return_1(close, lag_1):
+    return close / lag_1 - 1
+
+# Moving averages
+for _window in (5, 10, 20, 50):
+    register_indicator(f'MA_{_window}', window=_window - 1)(
+        lambda close, w=_window: close.rolling(window=w).mean())
+
+for _span in (12, 26):
+    register_indicator(f'EMA_{_span}', window=_span - 1)(
+        lambda close, s=_span: close.ewm(span=s, adjust=False, min_periods=s).mean())
+
+@register_indicator('MACD', depends=('EMA_12', 'EMA_26'))
+def _macd(ema_12, ema_26):
+    return ema_12 - ema_26
+
+@register_indicator('MACD_Signal', depends=('MACD',), window=8)
+def _macd_signal(macd):
+    return macd.ewm(span=9, adjust=False, min_periods=9).mean()
+
+@register_indicator('MACD_Hist', depends=('MACD', 'MACD_Signal'))
+def _macd_hist(macd, signal):
+    return macd - signal
+
+# RSI
+@register_indicator('_delta', window=1)
+def _delta(close):
+    return close.diff()
+
+@register_indicator('_avg_gain_14', depends=('_delta',), window=13)
+def _avg_gain_14(delta):
+    return (delta.where(delta > 0, 0)).rolling(window=14).mean()
+
+@register_indicator('_avg_loss_14', depends=('_delta',), window=13)
+def _avg_loss_14(delta):
+    return (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+
+@register_indicator('RSI', depends=('_avg_gain_14', '_avg_loss_14'))
+def _rsi(gain, loss):
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+# Bollinger bands
+@register_indicator('_std_20', window=19)
+def _std_20(close):
+    return close.rolling(window=20).std()
+
+@register_indicator('BB_Upper', depends=('MA_20', '_std_20'))
+def _bb_upper(ma_20, std_20):
+    return ma_20 + 2 * std_20
+
+@register_indicator('BB_Lower', depends=('MA_20', '_std_20'))
+def _bb_lower(ma_20, std_20):
+    return ma_20 - 2 * std_20
+
+@register_indicator('BB_Width', depends=('BB_Upper', 'BB_Lower', 'MA_20'))
+def _bb_width(upper, lower, ma_20):
+    return (upper - lower) / ma_20
+
+# Average true range
+@register_indicator('_true_range', depends=('High', 'Low', 'Lag_1'))
+def _true_range(high, low, prev_close):
+    return np.maximum(high - low, np.maximum((high - prev_close).abs(), (low - prev_close).abs()))
+
+@register_indicator('ATR', depends=('_true_range',), window=13)
+def _atr(true_range):
+    return true_range.rolling(window=14).mean()
+
+# Volume
+@register_indicator('Volume_MA_20', depends=('Volume',), window=19)
+def _volume_ma_20(volume):
+    return volume.rolling(window=20).mean()
+
+@register_indicator('Volume_Ratio', depends=('Volume', 'Volume_MA_20'))
+def _volume_ratio(volume, volume_ma):
+    return (volume / volume_ma).replace([np.inf, -np.inf], np.nan)
+
+# Targets
+@register_indicator('Target_Price')
+def _target_price(close):
+    return close.shift(-1)
+
+@register_indicator('Target_UpDown', depends=('Close', 'Target_Price'))
+def _target_up_down(close, target_price):
+    return (target_price > close).astype(int)
+
+def target_columns(horizons=None) -> tuple:
+    """
+    Price and direction target names for forecast horizons
+    Horizon 1 maps to Target_Price/Target_UpDown; other horizons h are
+    registered on first use as Target_Price_h/Target_UpDown_h (NaN where
+    the future close is not known yet).
+    Args:
+        horizons: Trading-day horizons (None = the single next-day target)
+    Returns:
+        tuple: (price target names, direction target names)
+    """
+    prices, directions = [], []
+    for h in horizons or [1]:
+        if h == 1:
+            prices.append('Target_Price')
+            directions.append('Target_UpDown')
+            continue
+        price, direction = f'Target_Price_{h}', f'Target_UpDown_{h}'
+        if price not in INDICATORS:
+            register_indicator(price)(lambda close, h=h: close.shift(-h))
+            register_indicator(direction, depends=('Close', price))(
+                lambda close, target: (target > close).astype(float).where(target.notna()))
+        prices.append(price)
+        directions.append(direction)
+    return prices, directions
+
+@profiled('features')
+def add_technical_features(data: pd.DataFrame, features=None, horizons=None) -> pd.DataFrame:
     """
     Add technical indicators to stock data
     Args:
         data: Raw stock data DataFrame
+        features: Indicator names to add (defaults to FEATURES); only these,
+            the targets and their dependencies are computed
+        horizons: Forecast horizons to add targets for (see target_columns).
+            When given, only the feature warm-up is trimmed and the latest
+            bars are kept with NaN targets so they can still be predicted.
     Returns:
         pd.DataFrame: Data with engineered features
     """
-    # Lag features
-    data['Lag_1'] = data['Close'].shift(1)
-    data['Lag_2'] = data['Close'].shift(2)
-    
-    # Moving averages
-    data['MA_5'] = data['Close'].rolling(window=5).mean()
-    data['MA_20'] = data['Close'].rolling(window=20).mean()
-    
-    # RSI calculation
-    delta = data['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    data['RSI'] = 100 - (100 / (1 + rs))
-    
-    # Targets
-    data['Target_Price'] = data['Close'].shift(-1)
-    data['Target_UpDown'] = (data['Close'].shift(-1) > data['Close']).astype(int)
-    
-    return data.dropna()
\ No newline at end of file
+    features = list(features or FEATURES)
+    names = features + _target_names(horizons)
+    processed = _assemble(data, compute_indicators(lambda column: data[column], names),
+                          None if horizons is None else features)
+    if processed.empty:
+        raise ValueError(f"Not enough history: {len(data)} bars, the features need "
+                         f"more than {warmup_rows(names)}")
+    return processed
+
+@profiled('features')
+def add_technical_features_many(frames: dict, features=None, horizons=None, errors: dict = None) -> dict:
+    """
+    Add technical indicators to several tickers in one vectorized pass
+    Tickers sharing a trading calendar are stacked into wide frames (one
+    per raw column used) so each rolling window runs once for the group.
+    Args:
+        frames: Ticker -> raw stock data (as returned by fetch_many)
+        features: Indicator names to add (defaults to FEATURES)
+        horizons: Forecast horizons (see add_technical_features)
+        errors: Optional dict that receives ticker -> message for frames
+            that could not be processed; they are left out of the result
+            instead of raising (the rest of their group is redone per ticker)
+    Returns:
+        dict: Ticker -> data with engineered features, same values as
+        add_technical_features on each frame
+    """
+    groups = {}
+    for ticker, data in frames.items():
+        groups.setdefault(tuple(data.index), []).append(ticker)
+
+    features = list(features or FEATURES)
+    names = features + _target_names(horizons)
+    processed = {}
+    for tickers in groups.values():
+        try:
+            processed.update(_engineer_group(frames, tickers, features, names, horizons))
+        except Exception as e:
+            if errors is None:
+                raise
+            if len(tickers) == 1:
+                errors[tickers[0]] = str(e)
+                continue
+            for ticker in tickers:
+                try:
+                    processed.update(_engineer_group(frames, [ticker], features, names, horizons))
+                except Exception as e:
+                    errors[ticker] = str(e)
+    return processed
+
+def _engineer_group(frames: dict, tickers: list, features: list, names: list, horizons) -> dict:
+    """add_technical_features_many for tickers sharing one index"""
+    def wide(column):
+        return pd.concat(
+            {ticker: _column_series(frames[ticker], column) for ticker in tickers}, axis=1)
+
+    indicators = compute_indicators(wide, names)
+    return {
+        ticker: _assemble(frames[ticker], {name: values[ticker] for name, values in indicators.items()},
+                          None if horizons is None else features)
+        for ticker in tickers
+    }
+
+def _target_names(horizons) -> list:
+    if horizons is None:
+        return list(TARGETS)
+    prices, directions = target_columns(horizons)
+    return prices + directions
+
+def _assemble(data: pd.DataFrame, indicators: dict, required=None) -> pd.DataFrame:
+    """
+    Write bars plus indicators into one column-major block and drop NaN rows
+    Rows with NaNs are normally only the warm-up at the start and the
+    target-less last bar, so the result is a slice of the block rather
+    than a filtered copy. The block uses the bars' dtype when every bar
+    column is float32, float64 otherwise. When required is given, only
+    the bars and those indicators are checked for NaNs.
+    """
+    bars = data.drop(columns=[name for name in indicators if name in data.columns])
+    if isinstance(bars.columns, pd.MultiIndex):
+        bars = bars.droplevel(list(range(1, bars.columns.nlevels)), axis=1)
+    dtype = np.float32 if (bars.dtypes == np.float32).all() else np.float64
+    columns = list(bars.columns) + list(indicators)
+
+    values = np.empty((len(bars), len(columns)), dtype=dtype, order='F')
+    values[:, :bars.shape[1]] = bars.to_numpy(dtype=dtype)
+    for i, column in enumerate(indicators.values(), start=bars.shape[1]):
+        values[:, i] = np.asarray(column, dtype=dtype).reshape(-1)
+    frame = pd.DataFrame(values, index=bars.index, columns=columns, copy=False)
+
+    checked = values if required is None else values[:, :bars.shape[1] + len(required)]
+    valid = np.flatnonzero(~np.isnan(checked).any(axis=1))
+    if len(valid) and valid[-1] - valid[0] + 1 == len(valid):
+        return frame.iloc[valid[0]:valid[-1] + 1]
+    return frame.iloc[valid]
+
+def _column_series(data: pd.DataFrame, column: str) -> pd.Series:
+    values = data[column]
+    return values.iloc[:, 0] if isinstance(values, pd.DataFrame) else values
+
+def _close_series(data: pd.DataFrame) -> pd.Series:
+    return _column_series(data, 'Close')
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from typing import Callable
+
+# Raw bar columns indicators can depend on
+RAW_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """
+    One named column computed from raw bars and/or other indicators.
+
+    ``window`` is the number of leading rows this step consumes on top of
+    its inputs (shift(k) -> k, rolling(w) -> w - 1, diff() -> 1), which is
+    what warmup_rows adds up along the dependency graph.
+    """
+    name: str
+    compute: Callable
+    depends: tuple = ('Close',)
+    window: int = 0
+
+
+INDICATORS = {}
+
+
+def register_indicator(name: str, depends=('Close',), window: int = 0):
+    """
+    Decorator declaring an indicator
+    Args:
+        name: Column name; a leading underscore marks an intermediate that
+            is shared between indicators but not meant as a model input
+        depends: Raw columns or indicator names passed positionally to the function
+        window: Leading rows consumed by this step (see Indicator)
+    Returns:
+        Callable: The decorated function, unchanged
+    """
+    def decorator(func):
+        INDICATORS[name] = Indicator(name, func, tuple(depends), window)
+        return func
+    return decorator
+
+
+def resolve(names) -> list:
+    """
+    Every indicator needed for names, in dependency order
+    Raw columns are inputs rather than indicators and are left out.
+    Raises:
+        ValueError: If a name (or one of its dependencies) is not registered
+    """
+    order, seen = [], set()
+
+    def visit(name, path):
+        if name in seen or name in RAW_COLUMNS:
+            return
+        if name not in INDICATORS:
+            raise ValueError(f"Unknown feature '{name}'" + (f" (needed by '{path[-1]}')" if path else ""))
+        if name in path:
+            raise ValueError(f"Circular feature dependency: {' -> '.join(path + [name])}")
+        for dependency in INDICATORS[name].depends:
+            visit(dependency, path + [name])
+        seen.add(name)
+        order.append(name)
+
+    for name in names:
+        visit(name, [])
+    return order
+
+
+def warmup_rows(names) -> int:
+    """Leading rows of history consumed before every one of names is defined"""
+    warmup = {}
+    for name in resolve(names):
+        indicator = INDICATORS[name]
+        warmup[name] = indicator.window + max(
+            (warmup.get(dependency, 0) for dependency in indicator.depends), default=0)
+    return max((warmup[name] for name in names if name in warmup), default=0)
+
+
+def compute_indicators(column: Callable, names) -> dict:
+    """
+    Compute only the requested indicators and what they depend on
+    Each intermediate is computed once, shared by all its consumers and
+    released as soon as its last consumer has run.
+    Args:
+        column: Callable returning a raw column (Series, or a wide
+            DataFrame with one column per ticker) by name
+        names: Indicators to return; raw columns among them (e.g. 'Close'
+            used as a model input) are passed through unchanged
+    Returns:
+        dict: Name -> values for each of names
+    """
+    order = resolve(names)
+    wanted = set(names)
+    remaining = {}
+    for name in order:
+        for dependency in INDICATORS[name].depends:
+            remaining[dependency] = remaining.get(dependency, 0) + 1
+
+    values, raw = {}, {}
+    for name in order:
+        indicator = INDICATORS[name]
+        args = []
+        for dependency in indicator.depends:
+            if dependency in RAW_COLUMNS:
+                if dependency not in raw:
+                    raw[dependency] = column(dependency)
+                args.append(raw[dependency])
+            else:
+                args.append(values[dependency])
+        values[name] = indicator.compute(*args)
+
+        for dependency in indicator.depends:
+            remaining[dependency] -= 1
+            if not remaining[dependency] and dependency not in wanted:
+                values.pop(dependency, None)
+                raw.pop(dependency, None)
+
+    for name in wanted.intersection(RAW_COLUMNS).difference(raw):
+        raw[name] = column(name)
+    return {name: raw[name] if name in RAW_COLUMNS else values[name] for name in names}
@@ -0,0 +1,78 @@
+import time
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, accuracy_score
+
+from .model_predictor import StockPredictor
+
+
+def compare_incremental_to_refit(processed_data: pd.DataFrame, initial_fraction: float = 0.6,
+                                 step: int = 5, window: int = 60,
+                                 trees_per_update: int = 10, max_trees: int = 200) -> pd.DataFrame:
+    """
+    Replay daily updates and compare incremental training with full refits
+    Both predictors start from the same fit on the first initial_fraction
+    of rows. Every `step` bars the full-refit predictor retrains on all
+    history while the incremental one calls update_models on the last
+    `window` bars; both are then scored on the following `step` bars.
+    Args:
+        processed_data: Output of add_technical_features
+        initial_fraction: Share of rows used for the initial fit
+        step: New bars per simulated update
+        window: Trailing bars passed to update_models
+        trees_per_update: Trees added per incremental update
+        max_trees: Forest size cap for the incremental predictor
+    Returns:
+        pd.DataFrame: One row per update with out-of-sample MAE, accuracy
+        and training seconds for both modes
+    """
+    full = StockPredictor()
+    incremental = StockPredictor(incremental=True, trees_per_update=trees_per_update,
+                                 max_trees=max_trees)
+    X = processed_data[full.features]
+    y_reg = processed_data['Target_Price']
+    y_clf = processed_data['Target_UpDown']
+
+    start = int(len(X) * initial_fraction)
+    full.train_models(X.iloc[:start], y_reg.iloc[:start], y_clf.iloc[:start])
+    incremental.train_models(X.iloc[:start], y_reg.iloc[:start], y_clf.iloc[:start])
+
+    rows = []
+    for end in range(start + step, len(X) - step + 1, step):
+        t0 = time.perf_counter()
+        full.train_models(X.iloc[:end], y_reg.iloc[:end], y_clf.iloc[:end])
+        refit_seconds = time.perf_counter() - t0
+
+        recent = slice(max(0, end - window), end)
+        t0 = time.perf_counter()
+        incremental.update_models(X.iloc[recent], y_reg.iloc[recent], y_clf.iloc[recent])
+        incremental_seconds = time.perf_counter() - t0
+
+        X_next = X.iloc[end:end + step]
+        y_next_reg = y_reg.iloc[end:end + step]
+        y_next_clf = y_clf.iloc[end:end + step]
+        rows.append({
+            'date': X.index[end - 1],
+            'refit_mae': mean_absolute_error(y_next_reg, full.reg_model.predict(X_next)),
+            'incremental_mae': mean_absolute_error(y_next_reg, incremental.reg_model.predict(X_next)),
+            'refit_accuracy': accuracy_score(y_next_clf, full.clf_model.predict(X_next)),
+            'incremental_accuracy': accuracy_score(y_next_clf, incremental.clf_model.predict(X_next)),
+            'refit_seconds': refit_seconds,
+            'incremental_seconds': incremental_seconds,
+        })
+
+    return pd.DataFrame(rows).set_index('date')
+
+
+def summarize_comparison(report: pd.DataFrame) -> dict:
+    """Average metrics of a compare_incremental_to_refit report"""
+    refit_time = report['refit_seconds'].sum()
+    incremental_time = report['incremental_seconds'].sum()
+    return {
+        'updates': len(report),
+        'refit_mae': report['refit_mae'].mean(),
+        'incremental_mae': report['incremental_mae'].mean(),
+        'refit_accuracy': report['refit_accuracy'].mean(),
+        'incremental_accuracy': report['incremental_accuracy'].mean(),
+        'speedup': refit_time / incremental_time if incremental_time else np.nan,
+    }
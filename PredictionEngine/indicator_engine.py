@@ -0,0 +1,178 @@
+import math
+import numpy as np
+import pandas as pd
+
+from .feature_engineer import FEATURES, _assemble, _close_series
+
+
+class RollingMean:
+    """
+    Fixed-window moving average updated in O(1) per value.
+
+    Mirrors pandas' rolling mean kernel (Kahan-compensated running sum,
+    sign clamping and the repeated-value shortcut) so that feeding the
+    same series from its first value gives bit-identical results to
+    ``Series.rolling(window).mean()``.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._buffer = [math.nan] * window
+        self._pos = 0
+        self._seen = 0
+        self._nobs = 0
+        self._sum = 0.0
+        self._neg_ct = 0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same_count = 0
+        self._prev_value = math.nan
+
+    def _add(self, val: float):
+        if val != val:
+            return
+        self._nobs += 1
+        y = val - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, val) < 0:
+            self._neg_ct += 1
+        if val == self._prev_value:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._prev_value = val
+
+    def _remove(self, val: float):
+        if val != val:
+            return
+        self._nobs -= 1
+        y = -val - self._comp_remove
+        t = self._sum + y
+        self._comp_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, val) < 0:
+            self._neg_ct -= 1
+
+    def push(self, val: float) -> float:
+        """Add the next value and return the window mean (NaN while warming up)"""
+        val = float(val)
+        if self._seen == 0:
+            self._prev_value = val
+        if self._seen >= self.window:
+            self._remove(self._buffer[self._pos])
+        self._add(val)
+        self._buffer[self._pos] = val
+        self._pos = (self._pos + 1) % self.window
+        self._seen += 1
+
+        if self._nobs < self.window or self._nobs == 0:
+            return math.nan
+        result = self._sum / self._nobs
+        if self._same_count >= self._nobs:
+            result = self._prev_value
+        elif self._neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self._neg_ct == self._nobs and result > 0:
+            result = 0.0
+        return result
+
+
+class IndicatorState:
+    """Rolling state for Lag_1, Lag_2, MA_5, MA_20 and the 14-day RSI"""
+
+    def __init__(self):
+        self._lags = [math.nan, math.nan]
+        self._ma_5 = RollingMean(5)
+        self._ma_20 = RollingMean(20)
+        self._gain = RollingMean(14)
+        self._loss = RollingMean(14)
+
+    def push(self, close: float) -> tuple:
+        """
+        Ingest one close price
+        Args:
+            close: Closing price of the new bar
+        Returns:
+            tuple: (Lag_1, Lag_2, MA_5, MA_20, RSI) for the new bar
+        """
+        close = float(close)
+        lag_1, lag_2 = self._lags
+        self._lags = [close, lag_1]
+
+        ma_5 = self._ma_5.push(close)
+        ma_20 = self._ma_20.push(close)
+
+        # Same gain/loss split as add_technical_features, including the
+        # zero (and negative zero) produced for the first, undefined delta
+        delta = close - lag_1
+        gain = delta if delta > 0 else 0.0
+        loss = -(delta if delta < 0 else 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = np.float64(self._gain.push(gain)) / np.float64(self._loss.push(loss))
+            rsi = float(100 - (100 / (1 + rs)))
+
+        return lag_1, lag_2, ma_5, ma_20, rsi
+
+
+class IncrementalFeatureEngine:
+    """
+    Streaming counterpart of add_technical_features.
+
+    Bars are ingested once (a whole history for a backfill, then one bar
+    or a small batch at a time) and each indicator is updated in O(1) per
+    bar. frame() returns the same values add_technical_features would
+    produce on the full history; the input frames are never modified.
+    """
+
+    def __init__(self):
+        self._state = IndicatorState()
+        self._bars = []
+        self._closes = []
+        self._rows = []
+        self._last_date = None
+
+    def update(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ingest bars dated after the last one seen
+        Args:
+            bars: Raw stock data; rows already ingested are skipped
+        Returns:
+            pd.DataFrame: Feature rows for the newly ingested bars
+        """
+        if self._last_date is not None:
+            bars = bars.loc[bars.index > self._last_date]
+        if bars.empty:
+            return pd.DataFrame(columns=FEATURES, dtype=float)
+
+        closes = _close_series(bars).to_numpy(dtype=float)
+        rows = [self._state.push(close) for close in closes]
+
+        self._bars.append(bars)
+        self._closes.extend(closes.tolist())
+        self._rows.extend(rows)
+        self._last_date = bars.index[-1]
+        return pd.DataFrame(rows, index=bars.index, columns=FEATURES)
+
+    def latest_features(self) -> pd.DataFrame:
+        """One-row feature frame for the most recent bar (input to predict)"""
+        if not self._rows:
+            raise ValueError("No bars ingested yet.")
+        return pd.DataFrame([self._rows[-1]], index=[self._last_date], columns=FEATURES)
+
+    def frame(self) -> pd.DataFrame:
+        """Full engineered frame, equal to add_technical_features on all ingested bars"""
+        if not self._bars:
+            raise ValueError("No bars ingested yet.")
+        if len(self._bars) > 1:
+            self._bars = [pd.concat(self._bars)]
+        values = np.array(self._rows, dtype=float).reshape(-1, len(FEATURES))
+        indicators = {name: values[:, i] for i, name in enumerate(FEATURES)}
+
+        close = np.array(self._closes, dtype=float)
+        next_close = np.append(close[1:], np.nan)
+        indicators['Target_Price'] = next_close
+        indicators['Target_UpDown'] = (next_close > close).astype(int)
+        # Same block layout and dtypes as add_technical_features
+        return _assemble(self._bars[0], indicators)
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from sklearn.metrics import (accuracy_score, auc, confusion_matrix, f1_score,
+                             precision_score, recall_score, roc_curve)
+
+from .model_predictor import EvaluationResult
+from .profiling import profiled
+
+VOLATILITY_WINDOW = 5
+
+
+@dataclass(frozen=True)
+class EvaluationMetrics:
+    """Ready-to-plot arrays and scores derived from one EvaluationResult"""
+    dates: pd.DatetimeIndex
+    actual_price: np.ndarray
+    predicted_price: np.ndarray
+    point_accuracy: np.ndarray
+    return_dates: pd.DatetimeIndex
+    returns_pct: np.ndarray
+    volatility: np.ndarray
+    mae: float
+    rmse: float
+    mape: float
+    accuracy: float
+    precision: float
+    recall: float
+    f1: float
+    confusion: np.ndarray
+    roc_fpr: np.ndarray
+    roc_tpr: np.ndarray
+    roc_auc: float
+    # Per-horizon mae/accuracy of a multi-horizon predictor (None otherwise)
+    horizon_metrics: pd.DataFrame = None
+
+
+@profiled('model.metrics')
+def compute_metrics(evaluation: EvaluationResult,
+                    volatility_window: int = VOLATILITY_WINDOW,
+                    horizon_metrics: pd.DataFrame = None) -> EvaluationMetrics:
+    """
+    Derive every chart series and score the dashboard shows
+    Args:
+        evaluation: Test-split predictions from StockPredictor.evaluate
+        volatility_window: Rolling window (days) for return volatility
+        horizon_metrics: StockPredictor.evaluate_horizons table to carry along
+    Returns:
+        EvaluationMetrics: Arrays aligned to dates/return_dates; the ROC
+        fields are None when probabilities are missing or only one class occurs
+    """
+    actual = evaluation.actual_price
+    predicted = evaluation.predicted_price
+    absolute_error = np.abs(actual - predicted)
+    relative_error = absolute_error / actual
+
+    returns = pd.Series(actual, index=evaluation.dates).pct_change().dropna() * 100
+    volatility = returns.rolling(window=volatility_window).std()
+
+    y_true = evaluation.actual_direction
+    y_pred = evaluation.predicted_direction
+    fpr = tpr = roc_auc = None
+    if evaluation.up_probability is not None and len(np.unique(y_true)) == 2:
+        fpr, tpr, _ = roc_curve(y_true, evaluation.up_probability)
+        roc_auc = auc(fpr, tpr)
+
+    return EvaluationMetrics(
+        dates=evaluation.dates,
+        actual_price=actual,
+        predicted_price=predicted,
+        point_accuracy=100 - relative_error * 100,
+        return_dates=returns.index,
+        returns_pct=returns.to_numpy(),
+        volatility=volatility.to_numpy(),
+        mae=float(np.mean(absolute_error)),
+        rmse=float(np.sqrt(np.mean(absolute_error ** 2))),
+        mape=float(np.mean(relative_error) * 100),
+        accuracy=accuracy_score(y_true, y_pred),
+        precision=precision_score(y_true, y_pred, zero_division=0),
+        recall=recall_score(y_true, y_pred, zero_division=0),
+        f1=f1_score(y_true, y_pred, zero_division=0),
+        confusion=confusion_matrix(y_true, y_pred, labels=[0, 1]),
+        roc_fpr=fpr,
+        roc_tpr=tpr,
+        roc_auc=roc_auc,
+        horizon_metrics=horizon_metrics
+    )
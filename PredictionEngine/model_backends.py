@@ -0,0 +1,66 @@
+"""
+Price regression backends for StockPredictor
+
+Each backend builds an unfitted scikit-learn regressor from override
+parameters; StockPredictor(backend=...) picks one by name and
+STOCK_MODEL_BACKEND sets the default for a deployment.
+
+    forest                   RandomForestRegressor (default, supports incremental updates)
+    hist_gradient_boosting   HistGradientBoostingRegressor: faster fits, small models
+    ridge                    Ridge regression baseline
+    linear                   Ordinary least squares baseline
+"""
+import os
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.multioutput import MultiOutputRegressor
+
+DEFAULT_BACKEND = os.environ.get("STOCK_MODEL_BACKEND", "forest")
+
+
+def _forest(params):
+    return RandomForestRegressor(**{'random_state': 42, **params})
+
+
+def _hist_gradient_boosting(params):
+    return HistGradientBoostingRegressor(**{'random_state': 42, **params})
+
+
+def _ridge(params):
+    return Ridge(**{'alpha': 1.0, **params})
+
+
+def _linear(params):
+    return LinearRegression(**params)
+
+
+# name -> (factory, handles several targets natively)
+REGRESSION_BACKENDS = {
+    'forest': (_forest, True),
+    'hist_gradient_boosting': (_hist_gradient_boosting, False),
+    'ridge': (_ridge, True),
+    'linear': (_linear, True),
+}
+
+
+def make_regressor(backend: str, params: dict = None, multi_output: bool = False):
+    """
+    Unfitted price regressor for a backend
+    Args:
+        backend: Name in REGRESSION_BACKENDS
+        params: Constructor overrides for that estimator
+        multi_output: Fit several targets at once (one per forecast horizon);
+            backends without native support are wrapped in MultiOutputRegressor
+    Returns:
+        A scikit-learn regressor
+    Raises:
+        ValueError: If backend is not registered
+    """
+    if backend not in REGRESSION_BACKENDS:
+        raise ValueError(f"Unknown model backend '{backend}'. "
+                         f"Choose from: {', '.join(REGRESSION_BACKENDS)}")
+    factory, native_multi_output = REGRESSION_BACKENDS[backend]
+    model = factory(dict(params or {}))
+    if multi_output and not native_multi_output:
+        model = MultiOutputRegressor(model)
+    return model
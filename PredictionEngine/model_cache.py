@@ -0,0 +1,154 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+import pandas as pd
+
+from .feature_engineer import FEATURE_SET_VERSION
+
+DEFAULT_CACHE_SIZE = 64
+
+
+def make_cache_key(ticker: str, X_train: pd.DataFrame, y_train_reg: pd.Series,
+                   y_train_clf: pd.Series, params: dict = None) -> str:
+    """
+    Build the cache key for a trained StockPredictor
+    Args:
+        ticker: Stock symbol the models were trained for
+        X_train: Training features
+        y_train_reg: Training regression targets
+        y_train_clf: Training classification targets
+        params: Model hyperparameters, if not the defaults
+    Returns:
+        str: ticker, feature-set version and a hash of the training frame
+        (feature names and hyperparameters included)
+    """
+    digest = hashlib.sha1(','.join(map(str, X_train.columns)).encode())
+    if params:
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    for part in (X_train, y_train_reg, y_train_clf):
+        digest.update(pd.util.hash_pandas_object(part, index=True).values.tobytes())
+    return f"{ticker.upper()}-v{FEATURE_SET_VERSION}-{digest.hexdigest()}"
+
+
+class ModelCache:
+    """
+    LRU cache of trained StockPredictor instances.
+
+    Entries live in memory up to ``max_size``; when ``directory`` is set
+    they are also written there with joblib so other processes (and
+    restarts) can reuse them. Hit/miss counters are exposed via stats().
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, directory: str = None):
+        self.max_size = max_size
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.joblib")
+
+    def get(self, key: str):
+        """Return the cached predictor for key, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        predictor = None
+        if self.directory and os.path.exists(self._path(key)):
+            import joblib
+            predictor = joblib.load(self._path(key))
+
+        with self._lock:
+            if predictor is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, predictor)
+            return predictor
+
+    def put(self, key: str, predictor):
+        """Cache a trained predictor under key"""
+        with self._lock:
+            self._store(key, predictor)
+        if self.directory:
+            import joblib
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            joblib.dump(predictor, tmp_path)
+            os.replace(tmp_path, self._path(key))
+
+    def preload(self, tickers=None) -> list:
+        """
+        Load persisted predictors into memory, newest first, up to max_size
+        Args:
+            tickers: Only load entries for these symbols (None = any ticker)
+        Returns:
+            list: The predictors loaded (entries already in memory are skipped)
+        """
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        version = f"-v{FEATURE_SET_VERSION}-"
+        prefixes = None if tickers is None else tuple(t.strip().upper() + version for t in tickers)
+        files = [entry for entry in os.scandir(self.directory)
+                 if entry.name.endswith('.joblib') and version in entry.name
+                 and (prefixes is None or entry.name.startswith(prefixes))]
+        files.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+
+        import joblib
+        loaded = []
+        # Oldest of the selection first, so the newest end up most recently used
+        for entry in reversed(files[:self.max_size]):
+            key = entry.name[:-len('.joblib')]
+            with self._lock:
+                if key in self._entries:
+                    continue
+            try:
+                predictor = joblib.load(entry.path)
+            except Exception:
+                continue  # partial or stale file; the next put replaces it
+            with self._lock:
+                self._store(key, predictor)
+            loaded.append(predictor)
+        return loaded
+
+    def _store(self, key: str, predictor):
+        self._entries[key] = predictor
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop in-memory entries and reset counters (persisted files are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+            }
+
+
+_default_cache = None
+
+
+def get_default_cache() -> ModelCache:
+    """Shared cache used by analyze_stock (persisted if STOCK_MODEL_CACHE_DIR is set)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ModelCache(directory=os.environ.get("STOCK_MODEL_CACHE_DIR"))
+    return _default_cache
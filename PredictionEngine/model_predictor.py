@@ -1,60 +1,290 @@
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, accuracy_score
+from sklearn.multioutput import MultiOutputClassifier
+from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 
+from .compiled_model import CompiledPredictor
+from .feature_engineer import FEATURES, target_columns
+from .model_backends import DEFAULT_BACKEND, make_regressor
+from .profiling import profiled
+
+@dataclass(frozen=True)
+class EvaluationResult:
+    """Test-split predictions and metrics, computed once per trained model"""
+    dates: pd.DatetimeIndex
+    actual_price: np.ndarray
+    predicted_price: np.ndarray
+    mae: float
+    actual_direction: np.ndarray
+    predicted_direction: np.ndarray
+    up_probability: np.ndarray
+    accuracy: float
+
+def _as_float64(values):
+    """
+    Model inputs upcast to float64 (no copy when they already are)
+    With STOCK_FRAME_DTYPE=float32 frames, scikit-learn would otherwise fit
+    and predict in float32 and the compiled path would stop matching it.
+    """
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64, copy=False)
+    return values.astype(np.float64)
+
+class OnlineClassifier:
+    """
+    Logistic-loss SGD classifier on standardized features.
+    Exposes the same fit/predict/predict_proba surface as LogisticRegression
+    plus partial_fit, so it can be updated with new bars only.
+    """
+    def __init__(self, random_state=42):
+        self.scaler = StandardScaler()
+        self.model = SGDClassifier(loss='log_loss', random_state=random_state)
+
+    def fit(self, X, y):
+        self.scaler = StandardScaler().fit(X)
+        self.model.fit(self.scaler.transform(X), y)
+        return self
+
+    def partial_fit(self, X, y):
+        self.scaler.partial_fit(X)
+        self.model.partial_fit(self.scaler.transform(X), y, classes=[0, 1])
+        return self
+
+    def predict(self, X):
+        return self.model.predict(self.scaler.transform(X))
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(self.scaler.transform(X))
+
 class StockPredictor:
-    def __init__(self):
-        self.reg_model = RandomForestRegressor(random_state=42)
-        self.clf_model = LogisticRegression(max_iter=1000, random_state=42)
-        self.features = ['Lag_1', 'Lag_2', 'MA_5', 'MA_20', 'RSI']
+    def __init__(self, incremental: bool = False, trees_per_update: int = 10, max_trees: int = 200,
+                 features=None, reg_params: dict = None, clf_params: dict = None, horizons=None,
+                 backend: str = None):
+        """
+        Args:
+            incremental: Enable update_models (warm-started forest with a
+                rolling tree budget and an online classifier)
+            trees_per_update: Trees added to the forest per update
+            max_trees: Forest size cap; the oldest trees are dropped beyond it
+            features: Registered indicator names to train on (defaults to
+                FEATURES); must include Lag_1, which predict reports as the last close
+            reg_params: Price regressor overrides (e.g. tuned n_estimators, max_depth)
+            clf_params: LogisticRegression overrides (e.g. tuned C); ignored when incremental
+            horizons: Forecast horizons in trading days (e.g. HORIZONS). The data
+                must come from add_technical_features(..., horizons=horizons); one
+                multi-output forest and one classifier per horizon are trained on
+                the shared feature matrix, and predict returns the whole curve.
+                The first horizon is the one evaluate reports on.
+            backend: Price regressor, a name in REGRESSION_BACKENDS (defaults to
+                DEFAULT_BACKEND, i.e. STOCK_MODEL_BACKEND or 'forest')
+        """
+        if horizons and incremental:
+            raise ValueError("horizons are not supported with incremental=True")
+        self.backend = backend or DEFAULT_BACKEND
+        if incremental and self.backend != 'forest':
+            raise ValueError("incremental=True requires the 'forest' backend")
+        self.horizons = sorted(horizons) if horizons else None
+        self.price_targets, self.direction_targets = target_columns(self.horizons)
+        self.multi_output = len(self.price_targets) > 1
+        self.incremental = incremental
+        self.trees_per_update = trees_per_update
+        self.max_trees = max_trees
+        self.reg_params = dict(reg_params or {})
+        self.clf_params = dict(clf_params or {})
+        if incremental:
+            self.reg_model = RandomForestRegressor(**{'random_state': 42, **self.reg_params, 'warm_start': True})
+            self.clf_model = OnlineClassifier(random_state=42)
+        else:
+            self.reg_model = make_regressor(self.backend, self.reg_params, self.multi_output)
+            self.clf_model = LogisticRegression(**{'max_iter': 1000, 'random_state': 42, **self.clf_params})
+            if self.multi_output:
+                self.clf_model = MultiOutputClassifier(self.clf_model)
+        self.features = list(features or FEATURES)
+        if 'Lag_1' not in self.features:
+            raise ValueError("features must include 'Lag_1'")
+        # (EvaluationResult, EvaluationMetrics) for the last test split, set by run_models
+        self.evaluation_report = None
+        self._compiled = None
     
+    @profiled('model.prepare_data')
     def prepare_data(self, data: pd.DataFrame) -> tuple:
         """Split data into features and targets"""
+        if self.horizons:
+            # Latest bars have no future close yet for the longer horizons
+            data = data[data[self.price_targets].notna().all(axis=1)]
         X = data[self.features]
-        y_reg = data['Target_Price']
-        y_clf = data['Target_UpDown']
+        if self.multi_output:
+            y_reg = data[self.price_targets]
+            y_clf = data[self.direction_targets]
+        else:
+            y_reg = data[self.price_targets[0]]
+            y_clf = data[self.direction_targets[0]]
         
         # Split without shuffling to preserve time order
-        X_train, X_test, y_train_reg, y_test_reg = train_test_split(
-            X, y_reg, test_size=0.2, shuffle=False)
-        _, _, y_train_clf, y_test_clf = train_test_split(
-            X, y_clf, test_size=0.2, shuffle=False)
+        X_train, X_test, y_train_reg, y_test_reg, y_train_clf, y_test_clf = train_test_split(
+            X, y_reg, y_clf, test_size=0.2, shuffle=False)
             
         return X_train, X_test, y_train_reg, y_test_reg, y_train_clf, y_test_clf
     
+    @profiled('model.train')
     def train_models(self, X_train, y_train_reg, y_train_clf):
         """Train both regression and classification models"""
+        X_train, y_train_reg = _as_float64(X_train), _as_float64(y_train_reg)
         self.reg_model.fit(X_train, y_train_reg)
         self.clf_model.fit(X_train, y_train_clf)
+        self._compiled = None
+
+    @profiled('model.update')
+    def update_models(self, X_new, y_new_reg, y_new_clf):
+        """
+        Incrementally update trained models with recent bars only
+        The forest grows trees_per_update trees fitted on X_new and drops
+        its oldest trees beyond max_trees; the classifier takes one
+        partial_fit step. Pass the new bars plus a short trailing window
+        so the new trees see more than a handful of rows.
+        """
+        if not self.incremental:
+            raise ValueError("update_models requires StockPredictor(incremental=True)")
+        X_new, y_new_reg = _as_float64(X_new), _as_float64(y_new_reg)
+
+        forest = self.reg_model
+        # warm_start seeds trees by their position in the forest; once old trees
+        # are dropped the positions repeat, so every update draws from its own stream
+        self._updates = getattr(self, '_updates', 0) + 1
+        base_seed = self.reg_params.get('random_state', 42)
+        forest.random_state = int(np.random.SeedSequence([base_seed or 0, self._updates]).generate_state(1)[0])
+        forest.n_estimators = len(forest.estimators_) + self.trees_per_update
+        forest.fit(X_new, y_new_reg)
+        if len(forest.estimators_) > self.max_trees:
+            forest.estimators_ = forest.estimators_[-self.max_trees:]
+            forest.n_estimators = len(forest.estimators_)
+
+        self.clf_model.partial_fit(X_new, y_new_clf)
+        self._compiled = None
+
+    def __getstate__(self):
+        # The compiled arrays duplicate the fitted models; rebuilt on first use after loading
+        state = self.__dict__.copy()
+        state['_compiled'] = None
+        return state
+
+    def compiled(self) -> CompiledPredictor:
+        """NumPy inference path for the trained models, built on first use"""
+        # getattr: predictors pickled by older versions have no _compiled
+        if getattr(self, '_compiled', None) is None:
+            self._compiled = CompiledPredictor(self)
+        return self._compiled
     
+    @profiled('model.predict')
     def predict(self, X) -> dict:
         """Make predictions for latest data"""
-        price_pred = self.reg_model.predict(X)[0]
-        direction_pred = self.clf_model.predict(X)[0]
+        X = np.asarray(X[self.features], dtype=np.float64)
+        price_pred, direction_pred, up_probability = self.compiled().predict_arrays(X)
+        if not self.horizons:
+            return {
+                'price': price_pred[0],
+                'direction': 'UP' if direction_pred[0] == 1 else 'DOWN',
+                'up_probability': up_probability[0],
+                'last_close': X[0, self.features.index('Lag_1')]  # Previous close price
+            }
+
+        price_pred, direction_pred, up_probability = (
+            np.reshape(a, (len(X), -1))[0] for a in (price_pred, direction_pred, up_probability))
         return {
-            'price': price_pred,
-            'direction': 'UP' if direction_pred == 1 else 'DOWN',
-            'last_close': X['Lag_1'].iloc[0]  # Previous close price
+            'price': price_pred[0],
+            'direction': 'UP' if direction_pred[0] == 1 else 'DOWN',
+            'up_probability': up_probability[0],
+            'last_close': X[0, self.features.index('Lag_1')],
+            # One entry per horizon, from the same single inference call
+            'forecast': [{
+                'horizon': horizon,
+                'price': price_pred[k],
+                'direction': 'UP' if direction_pred[k] == 1 else 'DOWN',
+                'up_probability': up_probability[k]
+            } for k, horizon in enumerate(self.horizons)]
         }
-    
-    def evaluate(self, X_test, y_test_reg, y_test_clf) -> dict:
 
-        reg_preds = self.reg_model.predict(X_test)
-        clf_preds = self.clf_model.predict(X_test)
-        clf_proba = self.clf_model.predict_proba(X_test)[:, 1]  # Probability for class 1 (UP)
+    def tree_predictions(self, X) -> np.ndarray:
+        """
+        Every tree's price prediction for the first row of X (first horizon)
+        Returns:
+            np.ndarray: One price per tree, or None when the backend is not a forest
+        """
+        if not isinstance(self.reg_model, RandomForestRegressor):
+            return None
+        X = np.asarray(X[self.features], dtype=np.float64)[:1]
+        values = self.compiled().regressor.tree_predictions(X)[0]
+        return values[:, 0] if values.ndim == 2 else values
+
+    @profiled('model.predict_many')
+    def predict_many(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predict every row of X in one vectorized pass
+        Args:
+            X: Feature rows (e.g. the latest row of many tickers sharing these models)
+        Returns:
+            pd.DataFrame: price, direction, up_probability and last_close per row;
+            with horizons, price_h, direction_h and up_probability_h per horizon h
+        """
+        values = np.asarray(X[self.features], dtype=np.float64)
+        price, direction, up_probability = self.compiled().predict_arrays(values)
+        if not self.horizons:
+            return pd.DataFrame({
+                'price': price,
+                'direction': np.where(direction == 1, 'UP', 'DOWN'),
+                'up_probability': up_probability,
+                'last_close': values[:, self.features.index('Lag_1')]
+            }, index=X.index)
+
+        price, direction, up_probability = (
+            np.reshape(a, (len(values), -1)) for a in (price, direction, up_probability))
+        columns = {}
+        for k, horizon in enumerate(self.horizons):
+            columns[f'price_{horizon}'] = price[:, k]
+            columns[f'direction_{horizon}'] = np.where(direction[:, k] == 1, 'UP', 'DOWN')
+            columns[f'up_probability_{horizon}'] = up_probability[:, k]
+        columns['last_close'] = values[:, self.features.index('Lag_1')]
+        return pd.DataFrame(columns, index=X.index)
     
-        return {
-            'regression': {
-                'mae': mean_absolute_error(y_test_reg, reg_preds),
-                'actual': y_test_reg,
-                'predicted': reg_preds
-            },
-            'classification': {
-                'accuracy': accuracy_score(y_test_clf, clf_preds),
-                'actual': y_test_clf,
-                'predicted': clf_preds,
-                'proba': clf_proba  
-            }
-        }
+    @profiled('model.evaluate')
+    def evaluate(self, X_test, y_test_reg, y_test_clf) -> EvaluationResult:
+        """Run each model over the test split exactly once (first horizon only)"""
+        reg_preds, clf_preds, clf_proba = self.compiled().predict_arrays(X_test)  # clf_proba: P(UP)
+        if self.multi_output:
+            reg_preds, clf_preds, clf_proba = reg_preds[:, 0], clf_preds[:, 0], clf_proba[:, 0]
+            y_test_reg, y_test_clf = y_test_reg.iloc[:, 0], y_test_clf.iloc[:, 0]
+
+        return EvaluationResult(
+            dates=pd.DatetimeIndex(X_test.index),
+            actual_price=np.asarray(y_test_reg, dtype=float),
+            predicted_price=reg_preds,
+            mae=mean_absolute_error(y_test_reg, reg_preds),
+            actual_direction=np.asarray(y_test_clf),
+            predicted_direction=clf_preds,
+            up_probability=clf_proba,
+            accuracy=accuracy_score(y_test_clf, clf_preds)
+        )
+
+    @profiled('model.evaluate_horizons')
+    def evaluate_horizons(self, X_test, y_test_reg, y_test_clf) -> pd.DataFrame:
+        """
+        Test-split error of every forecast horizon from one inference pass
+        Returns:
+            pd.DataFrame: mae and accuracy indexed by horizon
+        """
+        if not self.horizons:
+            raise ValueError("evaluate_horizons requires StockPredictor(horizons=...)")
+        reg_preds, clf_preds, _ = self.compiled().predict_arrays(X_test)
+        reg_preds = np.reshape(reg_preds, (len(X_test), -1))
+        clf_preds = np.reshape(clf_preds, (len(X_test), -1))
+        y_test_reg = np.reshape(np.asarray(y_test_reg, dtype=float), (len(X_test), -1))
+        y_test_clf = np.reshape(np.asarray(y_test_clf), (len(X_test), -1))
+        return pd.DataFrame({
+            'mae': [mean_absolute_error(y_test_reg[:, k], reg_preds[:, k]) for k in range(len(self.horizons))],
+            'accuracy': [accuracy_score(y_test_clf[:, k], clf_preds[:, k]) for k in range(len(self.horizons))]
+        }, index=pd.Index(self.horizons, name='horizon'))
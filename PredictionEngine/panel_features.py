@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+from .feature_engineer import FEATURES, TARGETS, _close_series
+
+PANEL_COLUMNS = FEATURES + TARGETS
+
+
+def _rolling_mean(values: np.ndarray, window: int, out: np.ndarray, scratch: np.ndarray,
+                  counts: np.ndarray = None):
+    """
+    Trailing mean over the last axis via one cumulative sum
+    Args:
+        values: (tickers, days) array, NaN-free
+        window: Window length in days
+        out: (tickers, days) buffer receiving the result
+        scratch: (tickers, days + 1) buffer for the cumulative sum
+        counts: Optional (tickers, days + 1) cumulative count of missing
+            inputs; windows with a missing input become NaN like pandas
+    """
+    scratch[:, 0] = 0
+    np.cumsum(values, axis=1, out=scratch[:, 1:])
+    out[:, :window - 1] = np.nan
+    np.subtract(scratch[:, window:], scratch[:, :-window], out=out[:, window - 1:])
+    out[:, window - 1:] /= window
+    if counts is not None:
+        out[:, window - 1:][counts[:, window:] != counts[:, :-window]] = np.nan
+
+
+class PanelBuffers:
+    """
+    Work arrays for compute_panel_features on (tickers, days) panels of one shape.
+
+    Pass the same instance to every call (e.g. once per trading day over a
+    fixed universe) so the panel-sized arrays are allocated only once.
+    """
+
+    def __init__(self, n_tickers: int, n_days: int):
+        self.shape = (n_tickers, n_days)
+        self.out = np.empty((len(PANEL_COLUMNS), n_tickers, n_days), dtype=np.float64)
+        self.scratch = np.empty((n_tickers, n_days + 1), dtype=np.float64)
+        self.gain = np.empty((n_tickers, n_days), dtype=np.float64)
+        self.filled = np.empty((n_tickers, n_days), dtype=np.float64)
+        self.missing = np.empty((n_tickers, n_days), dtype=bool)
+        self.counts = np.zeros((n_tickers, n_days + 1), dtype=np.int64)
+
+
+def compute_panel_features(closes: np.ndarray, out: np.ndarray = None,
+                           buffers: PanelBuffers = None) -> np.ndarray:
+    """
+    Compute every model feature and both targets for many tickers at once
+    Args:
+        closes: (tickers, days) array of close prices; NaN marks days a
+            ticker did not trade (e.g. before its listing) and invalidates
+            every window that spans it
+        out: Optional (len(PANEL_COLUMNS), tickers, days) float64 buffer
+            for the result (defaults to buffers.out)
+        buffers: Optional PanelBuffers of the same shape, reused across
+            calls; without it every work array is allocated per call
+    Returns:
+        np.ndarray: (len(PANEL_COLUMNS), tickers, days) panel ordered as
+        PANEL_COLUMNS; values agree with add_technical_features up to
+        floating point rounding of the cumulative sums
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    if closes.ndim != 2:
+        raise ValueError("closes must be a (tickers, days) array")
+    n_tickers, n_days = closes.shape
+    if buffers is None:
+        buffers = PanelBuffers(n_tickers, n_days)
+    elif buffers.shape != closes.shape:
+        raise ValueError(f"buffers are for {buffers.shape} panels, not {closes.shape}")
+    shape = (len(PANEL_COLUMNS), n_tickers, n_days)
+    if out is None:
+        out = buffers.out
+    elif out.shape != shape:
+        raise ValueError(f"out must have shape {shape}")
+
+    lag_1, lag_2, ma_5, ma_20, rsi, target_price, target_updown = out
+    scratch = buffers.scratch
+
+    missing = np.isnan(closes, out=buffers.missing)
+    if missing.any():
+        counts = buffers.counts
+        np.cumsum(missing, axis=1, out=counts[:, 1:])
+        filled = buffers.filled
+        np.copyto(filled, closes)
+        filled[missing] = 0.0
+    else:
+        counts = None
+        filled = closes
+
+    # Lag features
+    lag_1[:, 0] = np.nan
+    lag_1[:, 1:] = closes[:, :-1]
+    lag_2[:, :2] = np.nan
+    lag_2[:, 2:] = closes[:, :-2]
+
+    # Moving averages
+    _rolling_mean(filled, 5, ma_5, scratch, counts)
+    _rolling_mean(filled, 20, ma_20, scratch, counts)
+
+    # RSI: an undefined delta counts as no gain and no loss, as in pandas
+    # (target_price is free until the targets are written, so it holds the deltas)
+    delta = target_price
+    delta[:, 0] = 0
+    np.subtract(closes[:, 1:], closes[:, :-1], out=delta[:, 1:])
+    np.nan_to_num(delta, copy=False, nan=0.0)
+    gain = np.maximum(delta, 0, out=buffers.gain)
+    np.negative(delta, out=delta)
+    np.maximum(delta, 0, out=delta)
+    _rolling_mean(gain, 14, gain, scratch)
+    _rolling_mean(delta, 14, rsi, scratch)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(gain, rsi, out=rsi)
+        rsi += 1
+        np.divide(100, rsi, out=rsi)
+        np.subtract(100, rsi, out=rsi)
+
+    # Targets
+    target_price[:, :-1] = closes[:, 1:]
+    target_price[:, -1] = np.nan
+    np.greater(target_price, closes, out=target_updown)
+
+    return out
+
+
+def valid_rows(panel: np.ndarray) -> np.ndarray:
+    """(tickers, days) mask of rows add_technical_features would keep after dropna()"""
+    return ~np.isnan(panel).any(axis=0)
+
+
+def panel_from_frames(frames: dict) -> tuple:
+    """
+    Stack per-ticker bars into a close-price panel on the union of dates
+    Args:
+        frames: Ticker -> raw stock data
+    Returns:
+        tuple: (tickers, dates, closes) with closes shaped (tickers, days)
+    """
+    closes = pd.concat(
+        {ticker: _close_series(data) for ticker, data in frames.items()}, axis=1)
+    return list(closes.columns), closes.index, np.ascontiguousarray(closes.to_numpy(dtype=np.float64).T)
+
+
+def panel_to_frame(panel: np.ndarray, dates: pd.DatetimeIndex, row: int) -> pd.DataFrame:
+    """Feature/target frame for one ticker of a panel, with incomplete rows dropped"""
+    data = pd.DataFrame(panel[:, row, :].T, index=dates, columns=PANEL_COLUMNS)
+    return data.dropna()
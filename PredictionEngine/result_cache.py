@@ -0,0 +1,126 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, time as dt_time, timedelta
+import threading
+from zoneinfo import ZoneInfo
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_CLOSE = dt_time(16, 30)  # shortly after the 16:00 close so the new bar is published
+
+
+def next_market_close(now: datetime = None, tz=MARKET_TZ, close: dt_time = MARKET_CLOSE) -> datetime:
+    """
+    Next weekday market close strictly after `now`
+    Args:
+        now: Reference time (defaults to the current time)
+        tz: Exchange time zone
+        close: Local time after which the day's bar is considered final
+    Returns:
+        datetime: Time-zone aware expiry instant
+    """
+    now = datetime.now(tz) if now is None else now.astimezone(tz)
+    expiry = datetime.combine(now.date(), close, tzinfo=tz)
+    if expiry <= now:
+        expiry += timedelta(days=1)
+    while expiry.weekday() >= 5:
+        expiry += timedelta(days=1)
+    return expiry
+
+
+class ResultCache:
+    """
+    Process-wide cache of analysis results that expire at the next market close.
+
+    get_or_compute deduplicates concurrent requests: while one caller is
+    computing a key, other callers for the same key wait on that single
+    computation instead of starting their own.
+    """
+
+    def __init__(self, max_entries: int = 128, expiry=next_market_close):
+        self.max_entries = max_entries
+        self.expiry = expiry
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key if it has not expired, else None (never computes)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if datetime.now(expires_at.tzinfo) >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, computing it at most once at a time
+        Args:
+            key: Cache key (e.g. the upper-cased ticker)
+            compute: Zero-argument callable producing the value
+        Returns:
+            Cached or freshly computed value; errors propagate to every
+            waiting caller and nothing is cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if datetime.now(expires_at.tzinfo) < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[key] = (value, self.expiry())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key=None):
+        """Drop one key, or every entry when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'inflight': len(self._inflight),
+            }
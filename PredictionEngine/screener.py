@@ -0,0 +1,211 @@
+"""
+Cross-sectional screener: rank a universe of tickers by predicted move
+
+Usage:
+    python -m PredictionEngine.screener universe.csv --top 25 --rank-by up_probability
+
+Tickers stream through fetch -> add_technical_features -> run_models in
+chunks, and only the best top_n rows are kept in a heap, so memory stays
+flat however large the universe is.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import csv
+from dataclasses import dataclass
+import heapq
+import io
+import itertools
+import math
+import os
+import pandas as pd
+
+from .data_fetcher import fetch_many
+from .feature_engineer import add_technical_features_many
+from .profiling import profiled
+from .shared_frames import open_frame, try_share
+from .stock_predictor import run_models
+
+DEFAULT_CHUNK_SIZE = 50
+# Ranking keys; the other one breaks ties
+RANK_BY = ('expected_return', 'up_probability')
+COLUMNS = ['ticker', 'as_of', 'close', 'predicted_price', 'expected_return',
+           'direction', 'up_probability']
+
+
+@dataclass(frozen=True)
+class ScreenProgress:
+    """Progress report passed to screen's callback after every chunk"""
+    done: int
+    failed: int
+    total: int = None  # None when the universe size is not known up front
+
+
+def read_universe(source):
+    """
+    Stream the tickers of a CSV universe file
+    The 'ticker' or 'symbol' column is used when the header has one,
+    otherwise the first column. Blank rows, '#' comments and duplicates
+    are skipped; symbols are upper-cased.
+    Args:
+        source: Path, or an open text or binary file (e.g. an upload)
+    Yields:
+        str: Ticker symbols in file order
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline='') as f:
+            yield from read_universe(f)
+        return
+    if isinstance(source.read(0), bytes):
+        source = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+
+    rows = csv.reader(source)
+    column, seen = 0, set()
+    for line_number, row in enumerate(rows):
+        cells = [cell.strip() for cell in row]
+        if line_number == 0:
+            names = [cell.lower() for cell in cells]
+            header = next((name for name in ('ticker', 'symbol') if name in names), None)
+            if header is not None:
+                column = names.index(header)
+                continue
+        if len(cells) <= column or not cells[column] or cells[column].startswith('#'):
+            continue
+        ticker = cells[column].upper()
+        if ticker not in seen:
+            seen.add(ticker)
+            yield ticker
+
+
+def _screen_one(ticker: str, data: pd.DataFrame, features) -> dict:
+    """Run the model pipeline for one ticker and reduce it to a table row"""
+    # The ranking only needs the next-day prediction: no shared model cache
+    # (it would evict interactive users' models), test-split scoring or scenarios
+    prediction = run_models(ticker, data, cache=False, features=features,
+                            evaluate=False, simulate=False)['prediction']
+    close = float(data['Close'].iloc[-1])
+    if not (close > 0 and math.isfinite(float(prediction['price']))):
+        raise ValueError(f"No usable prediction for '{ticker}'")
+    return {
+        'ticker': ticker,
+        'as_of': data.index[-1],
+        'close': close,
+        'predicted_price': float(prediction['price']),
+        'expected_return': float(prediction['price']) / close - 1,
+        'direction': prediction['direction'],
+        'up_probability': float(prediction['up_probability']),
+    }
+
+
+def _screen_safe(ticker: str, data: pd.DataFrame, features):
+    try:
+        return _screen_one(ticker, data, features)
+    except Exception:
+        return None
+
+
+def _screen_shared(handle, ticker: str, start: int, stop: int, features):
+    return _screen_safe(ticker, open_frame(handle, start, stop), features)
+
+
+@profiled('screen')
+def screen(tickers, top_n: int = 20, rank_by: str = 'expected_return',
+           chunk_size: int = DEFAULT_CHUNK_SIZE, store=None, features=None,
+           workers: int = 1, progress=None, total: int = None) -> pd.DataFrame:
+    """
+    Rank tickers by predicted move, keeping only the top_n
+    Args:
+        tickers: Iterable of symbols (e.g. read_universe(path)); consumed lazily
+        top_n: Rows to keep
+        rank_by: 'expected_return' (predicted price over the last close) or
+            'up_probability' (classifier probability of an up move)
+        chunk_size: Tickers fetched and engineered together; bounds the bars
+            and features held at once
+        store: Optional BarStore to read bars from
+        features: Registered indicator names to model (defaults to FEATURES)
+        workers: Worker processes for the per-ticker models (1 = in-process,
+            None = one per CPU)
+        progress: Optional callable receiving a ScreenProgress after each chunk
+        total: Universe size for progress reports (defaults to len(tickers) if known)
+    Returns:
+        pd.DataFrame: COLUMNS for the best top_n tickers, best first, indexed
+        by rank; attrs['screened'] and attrs['failed'] hold the counts
+    Raises:
+        ValueError: For an unknown rank_by
+    """
+    if rank_by not in RANK_BY:
+        raise ValueError(f"rank_by must be one of: {', '.join(RANK_BY)}")
+    tiebreak = RANK_BY[1 - RANK_BY.index(rank_by)]
+    if total is None and hasattr(tickers, '__len__'):
+        total = len(tickers)
+
+    # Min-heap of (key, -order, row): heap[0] is the weakest row kept, and
+    # on equal keys the ticker seen first stays
+    heap, order = [], itertools.count()
+    done = failed = 0
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        tickers = iter(tickers)
+        while chunk := list(itertools.islice(tickers, chunk_size)):
+            try:
+                processed = add_technical_features_many(fetch_many(chunk, store=store), features)
+            except Exception:
+                processed = {}  # e.g. the grouped download failed; count the chunk as failed
+            names = list(processed)
+            if pool is None or not names:
+                rows = [_screen_safe(ticker, processed[ticker], features) for ticker in names]
+            else:
+                # Workers map the chunk's features instead of unpickling each frame;
+                # frames that could not join the shared matrix are pickled
+                with try_share(processed) or nullcontext() as shared:
+                    jobs = [pool.submit(_screen_shared, shared.handle, t, *shared.ranges[t], features)
+                            if shared is not None and t in shared.ranges
+                            else pool.submit(_screen_safe, t, processed[t], features)
+                            for t in names]
+                    rows = [job.result() for job in jobs]
+            del processed
+
+            for row in rows:
+                if row is None:
+                    continue
+                item = ((row[rank_by], row[tiebreak]), -next(order), row)
+                if len(heap) < top_n:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            done += len(chunk)
+            failed += len(chunk) - sum(row is not None for row in rows)
+            if progress is not None:
+                progress(ScreenProgress(done, failed, total))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    table = pd.DataFrame([row for *_, row in sorted(heap, reverse=True)], columns=COLUMNS)
+    table.index = pd.RangeIndex(1, len(table) + 1, name='rank')
+    table.attrs.update(screened=done, failed=failed)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('universe', help='CSV file with one ticker per row or a ticker column')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--rank-by', choices=RANK_BY, default='expected_return')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    total = sum(1 for _ in read_universe(args.universe))
+
+    def report(p):
+        print(f"\r{p.done}/{p.total} screened, {p.failed} failed", end='', flush=True)
+
+    table = screen(read_universe(args.universe), args.top, args.rank_by, args.chunk_size,
+                   workers=args.workers, progress=report, total=total)
+    print()
+    print(table.to_string(float_format='{:,.4f}'.format))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""
+Headless HTTP prediction service
+
+Usage:
+    python -m PredictionEngine.service --port 8080
+    python -m PredictionEngine.service --synthetic      # offline, fake bars
+
+Endpoints:
+    GET /predict/{ticker}            one compact prediction
+    GET /predict?tickers=AAPL,MSFT   several predictions in one response
+    GET /health                      cache and in-flight counters
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from .bar_store import DownloadError, TickerNotFoundError
+from .feature_engineer import HORIZONS
+from .result_cache import ResultCache
+from .stock_predictor import analyze_stock, prewarm
+
+MAX_TICKERS_PER_REQUEST = 100
+
+
+def compact_result(results: dict) -> dict:
+    """
+    Reduce an analyze_stock result to a small JSON-serializable payload
+    Args:
+        results: Output of analyze_stock
+    Returns:
+        dict: Next-day forecast (plus the forecast curve of multi-horizon
+        results), a scenario summary and the model's test-split scores
+    """
+    prediction = results['prediction']
+    metrics = results['metrics']
+    payload = {
+        'ticker': results['ticker'],
+        'as_of': results['historical_data'].index[-1].strftime('%Y-%m-%d'),
+        'last_close': round(float(prediction['last_close']), 4),
+        'price': round(float(prediction['price']), 4),
+        'direction': prediction['direction'],
+        'mae': round(float(metrics.mae), 4),
+        'rmse': round(float(metrics.rmse), 4),
+        'mape': round(float(metrics.mape), 4),
+        'accuracy': round(float(metrics.accuracy), 4),
+    }
+    simulation = results.get('simulation')
+    if simulation is not None:
+        lower, upper = simulation.interval(-1, 0.9)
+        payload['scenarios'] = {
+            'horizon': len(simulation.dates),
+            'interval_90': [round(lower, 4), round(upper, 4)],
+            'median': round(float(simulation.bands[simulation.quantiles.index(0.5), -1]), 4),
+            'prob_gain': round(float(simulation.prob_gain[-1]), 4),
+        }
+    if prediction.get('forecast'):
+        payload['forecast'] = [{
+            'horizon': int(point['horizon']),
+            'price': round(float(point['price']), 4),
+            'direction': point['direction'],
+            'up_probability': round(float(point['up_probability']), 4),
+        } for point in prediction['forecast']]
+    return payload
+
+
+class PredictionService:
+    """
+    Serves predictions from warm in-memory state.
+
+    Payloads are kept in a ResultCache until the next market close and
+    trained StockPredictors stay in the model cache, so repeat requests
+    never touch the models. Concurrent requests for a ticker that is
+    still being computed wait on the same computation (the ResultCache
+    deduplicates them), and fetching/training runs on a thread pool of
+    ``workers`` threads so the event loop keeps answering cached requests
+    meanwhile.
+    """
+
+    def __init__(self, store=None, cache=None, workers: int = 4, results: ResultCache = None,
+                 horizons=None):
+        self.store = store
+        self.cache = cache
+        self.horizons = horizons
+        self.results = results or ResultCache()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='predict')
+
+    def prewarm(self, tickers=None) -> int:
+        """Load cached models for tickers (None = the newest ones) before serving"""
+        return prewarm(tickers, cache=self.cache)
+
+    def _compute(self, ticker: str) -> dict:
+        return compact_result(analyze_stock(ticker, store=self.store, cache=self.cache, profile=False,
+                                            horizons=self.horizons))
+
+    async def predict(self, ticker: str) -> dict:
+        """Compact prediction for one ticker, computed at most once at a time"""
+        key = ticker.strip().upper()
+        payload = self.results.get(key)
+        if payload is not None:
+            return payload
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, self.results.get_or_compute,
+                                          key, lambda: self._compute(key))
+
+    async def predict_many(self, tickers: list) -> list:
+        """Predictions for several tickers; failures become {'ticker', 'error'} entries"""
+        async def one(ticker):
+            try:
+                return await self.predict(ticker)
+            except Exception as e:
+                return {'ticker': ticker.strip().upper(), 'error': str(e)}
+
+        return await asyncio.gather(*(one(ticker) for ticker in tickers))
+
+    def stats(self) -> dict:
+        stats = {'results': self.results.stats()}
+        if self.cache:
+            stats['models'] = self.cache.stats()
+        return stats
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Where create_app stores the PredictionService: request.app[SERVICE_KEY]
+SERVICE_KEY = web.AppKey('service', PredictionService)
+
+
+def create_app(service: PredictionService = None):
+    """
+    Build the aiohttp application
+    Args:
+        service: PredictionService to serve (defaults to one on the shared store and cache)
+    Returns:
+        aiohttp.web.Application
+    """
+    service = service or PredictionService()
+
+    async def predict_one(request):
+        try:
+            return web.json_response(await request.app[SERVICE_KEY].predict(request.match_info['ticker']))
+        except TickerNotFoundError as e:
+            return web.json_response({'error': str(e)}, status=404)
+        except DownloadError as e:
+            # The data source is failing; the ticker may well exist
+            return web.json_response({'error': str(e)}, status=503)
+        except Exception as e:
+            return web.json_response({'error': str(e)}, status=500)
+
+    async def predict_many(request):
+        tickers = [t for t in request.query.get('tickers', '').split(',') if t.strip()]
+        if not tickers:
+            return web.json_response({'error': "Pass tickers=AAPL,MSFT,..."}, status=400)
+        if len(tickers) > MAX_TICKERS_PER_REQUEST:
+            return web.json_response(
+                {'error': f"At most {MAX_TICKERS_PER_REQUEST} tickers per request"}, status=400)
+        return web.json_response({'predictions': await request.app[SERVICE_KEY].predict_many(tickers)})
+
+    async def health(request):
+        return web.json_response(request.app[SERVICE_KEY].stats())
+
+    async def on_cleanup(app):
+        app[SERVICE_KEY].close()
+
+    app = web.Application()
+    app[SERVICE_KEY] = service
+    app.router.add_get('/predict/{ticker}', predict_one)
+    app.router.add_get('/predict', predict_many)
+    app.router.add_get('/health', health)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def synthetic_service(workers: int = 4, horizons=None) -> PredictionService:
+    """Service on a temporary BarStore fed by deterministic synthetic bars (no network)"""
+    import tempfile
+    from .bar_store import BarStore
+    from .model_cache import ModelCache
+    from .synthetic import SyntheticDownloader
+
+    source = SyntheticDownloader()
+    store = BarStore(tempfile.mkdtemp(prefix='stock_bars_'), downloader=source,
+                     batch_downloader=source.batch)
+    return PredictionService(store=store, cache=ModelCache(), workers=workers, horizons=horizons)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=4, help='Threads for fetching and training')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='Serve synthetic bars instead of downloading')
+    parser.add_argument('--no-prewarm', action='store_true',
+                        help='Start listening without loading cached models first')
+    parser.add_argument('--forecast', action='store_true',
+                        help='Include the multi-horizon forecast curve (1/5/10/20 days)')
+    args = parser.parse_args()
+
+    horizons = HORIZONS if args.forecast else None
+    if args.synthetic:
+        service = synthetic_service(args.workers, horizons)
+    else:
+        from .model_cache import get_default_cache
+        service = PredictionService(cache=get_default_cache(), workers=args.workers, horizons=horizons)
+    if not args.no_prewarm:
+        print(f"Prewarmed {service.prewarm()} cached models")
+    web.run_app(create_app(service), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
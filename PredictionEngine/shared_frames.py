@@ -0,0 +1,203 @@
+"""
+Hand feature frames to worker processes without pickling them
+
+analyze_many, screen, walk_forward_backtest and tune_hyperparameters
+write their processed frames once into a memory-mapped matrix; each pool
+task then carries only a FrameHandle and the ticker's row range, and the
+worker maps the rows it needs.
+"""
+from contextlib import ExitStack
+from dataclasses import dataclass
+from functools import lru_cache
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Parent directory for shared matrices; by default /dev/shm (RAM) when it has
+# room, else the temp dir. Containers often give /dev/shm only 64 MB.
+SHARED_DIR = os.environ.get("STOCK_SHARED_DIR")
+
+
+def _default_directory(nbytes: int) -> str:
+    """/dev/shm when it has twice nbytes free, else the temp dir"""
+    try:
+        stats = os.statvfs('/dev/shm')
+        if stats.f_bavail * stats.f_frsize >= 2 * nbytes:
+            return '/dev/shm'
+    except (AttributeError, OSError):
+        pass
+    return tempfile.gettempdir()
+
+
+def _reserve(path: str):
+    """
+    Allocate a memory-mapped file's blocks up front
+    A full tmpfs then fails here with OSError (ENOSPC) instead of killing
+    the process with SIGBUS on the first write to an unbacked page.
+    """
+    if hasattr(os, 'posix_fallocate'):
+        with open(path, 'r+b') as f:
+            os.posix_fallocate(f.fileno(), 0, os.fstat(f.fileno()).st_size)
+
+
+@dataclass(frozen=True)
+class FrameHandle:
+    """What a worker needs to open frames of a SharedFrames: two paths and the column names"""
+    values_path: str
+    index_path: str
+    columns: tuple
+    index_name: str = None
+
+
+class SharedFrames:
+    """
+    Same-column frames of many tickers stacked into one memory-mapped matrix.
+
+    The values are written once to a column-major .npy file (in RAM under
+    /dev/shm when it has room) and the index (dates) to a second one.
+    Worker processes receive a small FrameHandle plus a ticker's (start,
+    stop) rows and map the file themselves, instead of unpickling a copy
+    of every DataFrame. Only frames with the most common columns and index
+    dtype are stacked; the other tickers are listed in ``skipped`` for the
+    caller to hand over some other way. Use as a context manager; the
+    files are removed on exit (workers that still have them mapped keep
+    working).
+    """
+
+    def __init__(self, frames: dict, directory: str = None, columns: list = None, dtype=None):
+        """
+        Args:
+            frames: Ticker -> DataFrame with a DatetimeIndex (e.g.
+                add_technical_features_many output)
+            directory: Parent directory for the files (defaults to
+                STOCK_SHARED_DIR, else /dev/shm when it has room, else the temp dir)
+            columns: Columns to share, in this order (defaults to every
+                column; each frame is subset as it is written)
+            dtype: Value dtype (defaults to float32 when every frame is
+                float32, else float64)
+        Raises:
+            ValueError: If frames is empty
+            KeyError: If a frame lacks one of columns
+            OSError: If the files cannot be created, e.g. the disk is full
+        """
+        if not frames:
+            raise ValueError("SharedFrames needs at least one frame")
+        groups = {}
+        for ticker, frame in frames.items():
+            key = tuple(columns) if columns is not None else tuple(frame.columns)
+            groups.setdefault((key, frame.index.dtype), []).append(ticker)
+        (columns, _), tickers = max(groups.items(), key=lambda item: len(item[1]))
+        columns = list(columns)
+        shared = set(tickers)
+        self.skipped = [ticker for ticker in frames if ticker not in shared]
+        frames = {ticker: frames[ticker] for ticker in tickers}
+        first = frames[tickers[0]]
+        index_dtype = first.index.to_numpy().dtype
+        if dtype is None:
+            float32 = all((frame.dtypes[columns] == np.float32).all() for frame in frames.values())
+            dtype = np.float32 if float32 else np.float64
+
+        self.ranges = {}
+        start = 0
+        for ticker, frame in frames.items():
+            self.ranges[ticker] = (start, start + len(frame))
+            start += len(frame)
+
+        nbytes = start * (len(columns) * np.dtype(dtype).itemsize + index_dtype.itemsize)
+        parent = directory or SHARED_DIR or _default_directory(nbytes)
+        self.directory = tempfile.mkdtemp(prefix='stock_frames_', dir=parent)
+        try:
+            values_path = os.path.join(self.directory, 'values.npy')
+            index_path = os.path.join(self.directory, 'index.npy')
+            # Written frame by frame, so the stacked matrix never exists twice in memory
+            values = np.lib.format.open_memmap(values_path, mode='w+', dtype=dtype,
+                                               shape=(start, len(columns)), fortran_order=True)
+            dates = np.lib.format.open_memmap(index_path, mode='w+', dtype=index_dtype,
+                                              shape=(start,))
+            _reserve(values_path)
+            _reserve(index_path)
+            for ticker, frame in frames.items():
+                rows = slice(*self.ranges[ticker])
+                if list(frame.columns) != columns:
+                    frame = frame[columns]
+                values[rows] = frame.to_numpy(dtype=dtype)
+                dates[rows] = frame.index.to_numpy()
+            values.flush()
+            dates.flush()
+            del values, dates
+        except BaseException:
+            self.close()
+            raise
+
+        self.handle = FrameHandle(values_path, index_path, tuple(columns), first.index.name)
+
+    def frame(self, ticker: str) -> pd.DataFrame:
+        """Read-only view of one ticker's frame (what workers get from open_frame)"""
+        return open_frame(self.handle, *self.ranges[ticker])
+
+    def close(self):
+        """Delete the backing files"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def share_all(frames: dict, stack: ExitStack, columns: list = None, dtype=None) -> dict:
+    """
+    Share every frame, with one SharedFrames per index dtype (and column set)
+    Args:
+        frames: Ticker -> DataFrame
+        stack: ExitStack that removes the files when it closes
+        columns: Columns to share (see SharedFrames)
+        dtype: Value dtype (see SharedFrames)
+    Returns:
+        dict: Ticker -> (FrameHandle, start, stop), the arguments of open_frame
+    """
+    rows = {}
+    while frames:
+        shared = stack.enter_context(SharedFrames(frames, columns=columns, dtype=dtype))
+        rows.update((ticker, (shared.handle, *span)) for ticker, span in shared.ranges.items())
+        frames = {ticker: frames[ticker] for ticker in shared.skipped}
+    return rows
+
+
+def try_share(frames: dict, directory: str = None):
+    """
+    SharedFrames of frames, or None when the files cannot be written
+    (e.g. the disk is full); callers then pickle every frame to the workers
+    """
+    try:
+        return SharedFrames(frames, directory)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=2)
+def _mapped(handle: FrameHandle) -> tuple:
+    """(values, dates, columns) of a handle, mapped once per process; older matrices are dropped"""
+    return (np.load(handle.values_path, mmap_mode='r'),
+            np.load(handle.index_path, mmap_mode='r'),
+            pd.Index(handle.columns))
+
+
+def open_frame(handle: FrameHandle, start: int, stop: int) -> pd.DataFrame:
+    """
+    Map rows [start, stop) of a SharedFrames matrix as a DataFrame
+    Only the dates are copied; the values stay a read-only view of the file.
+    Args:
+        handle: SharedFrames.handle
+        start: First row (inclusive)
+        stop: Last row (exclusive)
+    Returns:
+        pd.DataFrame: Same columns, values and index as the frame that was shared
+    """
+    values, dates, columns = _mapped(handle)
+    index = pd.Index(np.array(dates[start:stop]), name=handle.index_name)
+    return pd.DataFrame(values[start:stop], index=index, columns=columns, copy=False)
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+from .profiling import profiled
+
+DEFAULT_PATHS = 5000
+DEFAULT_HORIZON = 20
+# Lower/upper pairs (outermost first) plus the median, as plotted in the fan chart
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+SIMULATION_METHODS = ('bootstrap', 'gbm')
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Per-day price distribution of simulated paths, reduced to plot-ready bands"""
+    dates: pd.DatetimeIndex
+    quantiles: tuple
+    bands: np.ndarray       # (len(quantiles), horizon) price quantiles
+    mean: np.ndarray        # (horizon,) mean simulated price
+    prob_gain: np.ndarray   # (horizon,) share of paths above last_close
+    last_close: float
+    method: str
+    n_paths: int
+    model_prices: np.ndarray = None  # per-tree next-day predictions the paths start from
+
+    def interval(self, day: int = -1, coverage: float = 0.9) -> tuple:
+        """(lower, upper) price bounds covering the central coverage of paths on a day"""
+        lower = self.quantiles.index(round((1 - coverage) / 2, 10))
+        upper = self.quantiles.index(round(1 - (1 - coverage) / 2, 10))
+        return float(self.bands[lower, day]), float(self.bands[upper, day])
+
+
+def _daily_steps(day_rngs: list, method: str, log_returns: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Fill out[k] with day k's log-return draws for every path, each day from its own generator"""
+    for day, rng in enumerate(day_rngs):
+        if method == 'bootstrap':
+            out[day] = log_returns[rng.integers(0, len(log_returns), size=out.shape[1])]
+        else:
+            out[day] = rng.normal(log_returns.mean(), log_returns.std(ddof=1), size=out.shape[1])
+    return out
+
+
+@profiled('model.simulate')
+def simulate_paths(close, horizon: int = DEFAULT_HORIZON, n_paths: int = DEFAULT_PATHS,
+                   method: str = 'bootstrap', model_prices=None, lookback: int = 252,
+                   quantiles=DEFAULT_QUANTILES, chunk_days: int = None,
+                   seed: int = 42) -> SimulationResult:
+    """
+    Simulate future price paths and summarize them per day
+    Daily log returns are either resampled from the last lookback days
+    (bootstrap) or drawn from a normal fit to them (GBM). With
+    model_prices, every path starts from one randomly chosen per-tree
+    forest prediction for the next close, so day one reflects the model's
+    own spread and later days add the historical return noise.
+    Args:
+        close: Close price Series with a DatetimeIndex
+        horizon: Trading days to simulate
+        n_paths: Number of paths
+        method: 'bootstrap' or 'gbm'
+        model_prices: Optional per-tree next-day price predictions
+        lookback: Most recent returns used to fit the step distribution
+        quantiles: Price quantiles reported for each day
+        chunk_days: Simulate this many days at a time, carrying the path
+            states over, so at most n_paths x chunk_days prices are held at
+            once (None = all days in one pass). Every day draws from its own
+            seeded generator, so any chunking gives the same paths.
+        seed: Random seed
+    Returns:
+        SimulationResult
+    Raises:
+        ValueError: For an unknown method or fewer than two usable closes
+    """
+    if method not in SIMULATION_METHODS:
+        raise ValueError(f"Unknown simulation method '{method}'. Choose from: {', '.join(SIMULATION_METHODS)}")
+    close = pd.Series(close).dropna()
+    log_returns = np.diff(np.log(close.to_numpy(dtype=np.float64)))[-lookback:]
+    log_returns = log_returns[np.isfinite(log_returns)]
+    if len(log_returns) < 2:
+        raise ValueError("Need at least three closes to simulate paths")
+
+    # One stream for the starting prices and one per day, independent of chunk_days
+    start_rng, *day_rngs = (np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(horizon + 1))
+    last_close = float(close.iloc[-1])
+    quantiles = tuple(float(q) for q in quantiles)
+    bands = np.empty((len(quantiles), horizon))
+    mean = np.empty(horizon)
+    prob_gain = np.empty(horizon)
+
+    state = np.full(n_paths, np.log(last_close))
+    chunk_days = chunk_days or horizon
+    for start in range(0, horizon, chunk_days):
+        days = slice(start, min(start + chunk_days, horizon))
+        # Day-major rows, with row 0 carrying the path states, so the running sums
+        # and per-day reductions add up in the same order for any chunking
+        steps = np.empty((days.stop - start + 1, n_paths))
+        steps[0] = state
+        _daily_steps(day_rngs[days], method, log_returns, steps[1:])
+        if start == 0 and model_prices is not None:
+            steps[1] = np.log(start_rng.choice(np.asarray(model_prices, dtype=np.float64), n_paths)) - state
+        log_prices = np.cumsum(steps, axis=0, out=steps)
+        state = log_prices[-1].copy()
+        prices = np.exp(log_prices[1:], out=log_prices[1:])
+
+        bands[:, days] = np.quantile(prices, quantiles, axis=1)
+        mean[days] = prices.mean(axis=1)
+        prob_gain[days] = (prices > last_close).mean(axis=1)
+
+    dates = pd.bdate_range(close.index[-1] + pd.offsets.BDay(1), periods=horizon)
+    return SimulationResult(
+        dates=dates,
+        quantiles=quantiles,
+        bands=bands,
+        mean=mean,
+        prob_gain=prob_gain,
+        last_close=last_close,
+        method=method,
+        n_paths=n_paths,
+        model_prices=None if model_prices is None else np.asarray(model_prices, dtype=np.float64)
+    )
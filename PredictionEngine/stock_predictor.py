@@ -1,45 +1,180 @@
 from .data_fetcher import fetch_stock_data
 from .feature_engineer import add_technical_features
+from .model_backends import DEFAULT_BACKEND
 from .model_predictor import StockPredictor
+from .model_cache import get_default_cache, make_cache_key
+from .metrics import compute_metrics
+from .simulation import simulate_paths
+from .tuning import get_default_tuning_store
+from .profiling import Profiler, profile_stage
+import numpy as np
 import pandas as pd
 
-def analyze_stock(ticker: str) -> dict:
+def analyze_stock(ticker: str, store=None, cache=None, profile: bool = True,
+                  trace_memory: bool = False, features=None, horizons=None, group: str = None) -> dict:
     """
     Main function to run full analysis pipeline
     Args:
         ticker: Stock symbol to analyze
+        store: Optional BarStore to read bars from (defaults to the shared store)
+        cache: Optional ModelCache (defaults to the shared cache, False disables it)
+        profile: Record per-stage timings and memory under 'profile'
+        trace_memory: Also measure per-stage peak allocations with tracemalloc
+        features: Registered indicator names to model (defaults to FEATURES)
+        horizons: Forecast horizons in trading days (e.g. HORIZONS); adds the
+            forecast curve under prediction['forecast']
+        group: Tuning group (e.g. a sector) whose tuned settings apply when
+            the ticker has none of its own
     Returns:
         dict: Contains all prediction results and evaluation metrics
     """
+    if not profile:
+        results = _analyze(ticker, store, cache, features, horizons, group)
+        results['profile'] = []
+        return results
+
+    profiler = Profiler(track_memory=trace_memory)
+    with profiler, profile_stage('analyze_stock'):
+        results = _analyze(ticker, store, cache, features, horizons, group)
+    results['profile'] = profiler.records
+    return results
+
+def prewarm(tickers=None, cache=None) -> int:
+    """
+    Pre-warm hook for a fresh process, to call before serving the first request
+    Importing this module loads the model stack (scikit-learn, SciPy); the
+    newest persisted predictors are then read into the in-memory cache with
+    their compiled inference path built.
+    Args:
+        tickers: Only preload models for these symbols (None = the newest of any)
+        cache: ModelCache to fill (defaults to the shared cache)
+    Returns:
+        int: Number of predictors loaded
+    """
+    cache = cache or get_default_cache()
+    loaded = cache.preload(tickers)
+    for predictor in loaded:
+        predictor.compiled()
+    return len(loaded)
+
+def _analyze(ticker: str, store, cache, features, horizons, group) -> dict:
+    # Build the feature set the ticker was tuned on, unless the caller picked one
+    if features is None:
+        tuned = get_default_tuning_store().lookup(ticker, group)
+        features = tuned.get('features') if tuned else None
+
     # Data pipeline
-    raw_data = fetch_stock_data(ticker)
-    processed_data = add_technical_features(raw_data)
-    
+    raw_data = fetch_stock_data(ticker, store=store)
+    processed_data = add_technical_features(raw_data, features, horizons)
+
+    return run_models(ticker, processed_data, cache=cache, features=features, horizons=horizons,
+                      group=group)
+
+def run_models(ticker: str, processed_data: pd.DataFrame, cache=None, features=None,
+               tuning=None, horizons=None, backend=None, group: str = None,
+               evaluate: bool = True, simulate: bool = True) -> dict:
+    """
+    Train, evaluate and predict on already engineered data
+    Args:
+        ticker: Stock symbol the data belongs to
+        processed_data: Output of add_technical_features
+        cache: Optional ModelCache (defaults to the shared cache, False disables it)
+        features: Feature columns to train on (defaults to the tuned feature
+            set when processed_data has all of it, else FEATURES)
+        tuning: Optional TuningStore with tuned hyperparameters (defaults to
+            the shared store, False trains with the default hyperparameters)
+        horizons: Forecast horizons; processed_data must have been built
+            with the same horizons
+        backend: Price regressor name (defaults to STOCK_MODEL_BACKEND or
+            'forest'); tuned regressor settings only apply to the forest
+        group: Tuning group to fall back to when the ticker has no entry
+        evaluate: Score the test split ('evaluation' and 'metrics' are None when False)
+        simulate: Simulate price scenarios ('simulation' is None when False)
+    Returns:
+        dict: Same structure as analyze_stock
+    """
+    if cache is None:
+        cache = get_default_cache()
+    if tuning is None:
+        tuning = get_default_tuning_store()
+    tuned = tuning.lookup(ticker, group) if tuning else None
+    backend = backend or DEFAULT_BACKEND
+    params = {}
+    if tuned:
+        params['clf_params'] = tuned['clf_params']
+        if backend == 'forest':
+            params['reg_params'] = tuned['reg_params']
+        tuned_features = tuned.get('features')
+        if features is None and tuned_features and set(tuned_features) <= set(processed_data.columns):
+            features = tuned_features
+
     # Model pipeline
-    predictor = StockPredictor()
+    predictor = StockPredictor(features=features, horizons=horizons, backend=backend, **params)
     X_train, X_test, y_train_reg, y_test_reg, y_train_clf, y_test_clf = \
         predictor.prepare_data(processed_data)
-    
-    predictor.train_models(X_train, y_train_reg, y_train_clf)
+
+    # Reuse trained models when the training frame (and hyperparameters) have not changed
+    with profile_stage('model.cache_lookup'):
+        key_params = dict(params)
+        if predictor.horizons:
+            key_params['horizons'] = predictor.horizons
+        if backend != 'forest':
+            key_params['backend'] = backend
+        cache_key = make_cache_key(ticker, X_train, y_train_reg, y_train_clf, key_params) if cache else None
+        cached = cache.get(cache_key) if cache else None
+    if cached is not None:
+        predictor = cached
+    else:
+        predictor.train_models(X_train, y_train_reg, y_train_clf)
+
+    # Evaluation and chart metrics are stored on the predictor, so they are
+    # cached (and persisted) with it and only recomputed for a new test split
+    evaluation = metrics = None
+    if evaluate:
+        report = getattr(predictor, 'evaluation_report', None)
+        if not _report_matches(report, X_test, y_test_reg, y_test_clf):
+            evaluation = predictor.evaluate(X_test, y_test_reg, y_test_clf)
+            horizon_metrics = (predictor.evaluate_horizons(X_test, y_test_reg, y_test_clf)
+                               if predictor.horizons else None)
+            report = (evaluation, compute_metrics(evaluation, horizon_metrics=horizon_metrics))
+            predictor.evaluation_report = report
+            if cache:
+                cache.put(cache_key, predictor)
+        evaluation, metrics = report
+    elif cached is None and cache:
+        cache.put(cache_key, predictor)
     
     # Get latest data point for tomorrow's prediction
     latest_features = processed_data[predictor.features].iloc[[-1]]
+
+    # Scenario paths start from the forest's per-tree spread for the next close
+    simulation = None
+    if simulate:
+        simulation = simulate_paths(processed_data['Close'],
+                                    model_prices=predictor.tree_predictions(latest_features))
     
     return {
         'ticker': ticker,
+        'model_cache_hit': cached is not None,
         'historical_data': processed_data,
         'prediction': predictor.predict(latest_features),
-        'evaluation': {
-            **predictor.evaluate(X_test, y_test_reg, y_test_clf),
-            'regression': {
-                'actual': y_test_reg.values,
-                'predicted': predictor.reg_model.predict(X_test)
-            }
-        },
+        'evaluation': evaluation,
+        'metrics': metrics,
+        'simulation': simulation,
         'dates': {
             'train_dates': X_train.index,
             'test_dates': X_test.index
-        },
-        'y_test_reg': y_test_reg,
-        'reg_preds ': predictor.reg_model.predict(X_test)
+        }
     }
+
+def _report_matches(report, X_test, y_test_reg, y_test_clf) -> bool:
+    """Whether a stored (evaluation, metrics) pair was computed on this test split"""
+    # Reports pickled before a metrics field was added are recomputed
+    if report is None or not hasattr(report[1], 'rmse'):
+        return False
+    if isinstance(y_test_reg, pd.DataFrame):  # multi-horizon: evaluation covers the first one
+        y_test_reg, y_test_clf = y_test_reg.iloc[:, 0], y_test_clf.iloc[:, 0]
+    evaluation = report[0]
+    return (evaluation.dates.equals(pd.DatetimeIndex(X_test.index))
+            and np.array_equal(evaluation.actual_price, np.asarray(y_test_reg, dtype=float))
+            and np.array_equal(evaluation.actual_direction, np.asarray(y_test_clf)))
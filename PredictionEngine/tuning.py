@@ -0,0 +1,309 @@
+"""
+Hyperparameter search for StockPredictor
+
+Usage:
+    python -m PredictionEngine.tuning AAPL MSFT NVDA --group tech --workers 4
+
+Forest and logistic-regression settings are searched with successive
+halving over walk-forward folds: every configuration is scored on the
+most recent fold, the best 1/eta move on to more (older) folds, and so on.
+The winners are saved per ticker (and per group) in a TuningStore, where
+run_models picks them up for production refits.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timezone
+import itertools
+import json
+import math
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import log_loss, mean_absolute_error
+
+from .backtest import walk_forward_splits
+from .feature_engineer import FEATURES, TARGETS
+from .shared_frames import open_frame, share_all
+
+DEFAULT_TUNING_DIR = os.environ.get(
+    "STOCK_TUNING_DIR", os.path.join("/tmp", "stock_tuning"))
+
+FOREST_SPACE = {
+    'n_estimators': [25, 50, 100],
+    'max_depth': [3, 6, 12, None],
+    'max_features': [1.0, 0.5, 'sqrt'],
+    'min_samples_leaf': [1, 5],
+}
+LOGISTIC_SPACE = {'C': [0.001, 0.01, 0.1, 1.0, 10.0]}
+# Depth charged to max_depth=None forests by config_cost
+UNBOUNDED_DEPTH = 32
+
+
+def parameter_grid(space: dict) -> list:
+    """Every combination of a {name: [values]} search space, as dicts"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def config_cost(model: str, params: dict, n_features: int) -> float:
+    """
+    Deterministic relative cost of a configuration, used to pick among near-ties
+    Forests cost trees x depth x features tried per split; logistic
+    regression costs its C (weaker regularization, more solver work).
+    Measured fit times would make the pick depend on machine load.
+    """
+    if model == 'forest':
+        max_features = params.get('max_features', 1.0)
+        if max_features == 'sqrt':
+            max_features = math.sqrt(n_features) / n_features
+        elif max_features == 'log2':
+            max_features = math.log2(n_features) / n_features
+        elif isinstance(max_features, int):
+            max_features = max_features / n_features
+        return (params.get('n_estimators', 100) * (params.get('max_depth') or UNBOUNDED_DEPTH)
+                * (max_features or 1.0))
+    return params.get('C', 1.0)
+
+
+def _score_fold(n_features: int, model: str, params: dict, handle, start: int, stop: int,
+                train_start: int, train_end: int, test_end: int) -> tuple:
+    """Fit one configuration on one fold of a ticker's shared frame; returns (loss, fit seconds)"""
+    matrix = open_frame(handle, start, stop).to_numpy()
+    train = matrix[train_start:train_end]
+    test = matrix[train_end:test_end]
+    X_train, X_test = train[:, :n_features], test[:, :n_features]
+
+    t0 = time.perf_counter()
+    if model == 'forest':
+        estimator = RandomForestRegressor(**{'random_state': 42, **params})
+        estimator.fit(X_train, train[:, n_features])
+        seconds = time.perf_counter() - t0
+        return mean_absolute_error(test[:, n_features], estimator.predict(X_test)), seconds
+
+    y_train = train[:, n_features + 1].astype(int)
+    if len(np.unique(y_train)) < 2:
+        return np.nan, 0.0
+    estimator = LogisticRegression(**{'max_iter': 1000, 'random_state': 42, **params})
+    estimator.fit(X_train, y_train)
+    seconds = time.perf_counter() - t0
+    proba = estimator.predict_proba(X_test)[:, 1]
+    return log_loss(test[:, n_features + 1].astype(int), proba, labels=[0, 1]), seconds
+
+
+def successive_halving(model: str, candidates: list, folds: list, n_features: int,
+                       eta: int = 3, min_folds: int = 1, pool=None) -> pd.DataFrame:
+    """
+    Score candidates on a growing number of folds, keeping the best 1/eta each round
+    Args:
+        model: 'forest' (scored by MAE) or 'logistic' (scored by log loss)
+        candidates: Parameter dicts
+        folds: Per fold, the (handle, start, stop, train_start, train_end,
+            test_end) windows of every ticker - its SharedFrames rows
+            (features, then TARGETS) and the fold within them; ordered most
+            recent first
+        n_features: Number of feature columns in the shared frames
+        eta: Reduction factor per round
+        min_folds: Folds used in the first round
+        pool: Executor to run fits on (None = in-process)
+    Returns:
+        pd.DataFrame: One row per (round, candidate) with the mean loss and
+        fit time over the folds used so far, plus the config_cost
+    """
+    survivors = list(range(len(candidates)))
+    budget = min(min_folds, len(folds))
+    scores = {}
+    history = []
+    for round_number in itertools.count():
+        jobs = [(c, j, window) for c in survivors for j in range(budget)
+                if (c, j) not in scores for window in folds[j]]
+        args = [(n_features, model, candidates[c], *window) for c, j, window in jobs]
+        if pool is None:
+            results = [_score_fold(*a) for a in args]
+        else:
+            results = [f.result() for f in [pool.submit(_score_fold, *a) for a in args]]
+        for (c, j, _), result in zip(jobs, results):
+            scores.setdefault((c, j), []).append(result)
+
+        for c in survivors:
+            fold_results = [r for j in range(budget) for r in scores[(c, j)]]
+            history.append({
+                'model': model,
+                'round': round_number,
+                'n_folds': budget,
+                'candidate': c,
+                'params': candidates[c],
+                'loss': np.nanmean([loss for loss, _ in fold_results]) if fold_results else np.nan,
+                'fit_seconds': np.mean([seconds for _, seconds in fold_results]),
+                'cost': config_cost(model, candidates[c], n_features),
+            })
+
+        if len(survivors) == 1 or budget == len(folds):
+            break
+        ranked = sorted(history[-len(survivors):], key=lambda row: (np.nan_to_num(row['loss'], nan=np.inf)))
+        survivors = [row['candidate'] for row in ranked[:max(1, math.ceil(len(survivors) / eta))]]
+        budget = min(len(folds), budget * eta)
+    return pd.DataFrame(history)
+
+
+def _pick(history: pd.DataFrame, tolerance: float) -> pd.Series:
+    """Lowest-cost configuration of the final round whose loss is within tolerance of the best"""
+    final = history[history['round'] == history['round'].max()].dropna(subset=['loss'])
+    good = final[final['loss'] <= final['loss'].min() * (1 + tolerance)]
+    return good.sort_values(['cost', 'loss', 'candidate'], kind='stable').iloc[0]
+
+
+def tune_hyperparameters(processed, features=None, forest_space: dict = None,
+                         logistic_space: dict = None, n_folds: int = 4, min_train_size: int = 120,
+                         eta: int = 3, min_folds: int = 1, tolerance: float = 0.01,
+                         workers: int = None) -> dict:
+    """
+    Search forest and classifier hyperparameters over time-series folds
+    Feature matrices are written once to a SharedFrames matrix mapped by
+    all worker processes (as in walk_forward_backtest).
+    Args:
+        processed: Output of add_technical_features, or a dict of ticker ->
+            output to tune one configuration for a group of tickers
+        features: Feature columns (defaults to FEATURES)
+        forest_space: RandomForestRegressor search space (defaults to FOREST_SPACE)
+        logistic_space: LogisticRegression search space (defaults to LOGISTIC_SPACE)
+        n_folds: Walk-forward folds per ticker
+        min_train_size: Rows in the first training window
+        eta: Successive-halving reduction factor
+        min_folds: Folds scored in the first round
+        tolerance: Relative loss slack within which the cheapest configuration
+            (by config_cost) wins
+        workers: Number of worker processes (None = one per CPU, 1 = in-process)
+    Returns:
+        dict: reg_params, clf_params, their losses and the full search history
+    """
+    if isinstance(processed, pd.DataFrame):
+        processed = {'': processed}
+    features = list(features or FEATURES)
+
+    forest_candidates = parameter_grid(forest_space or FOREST_SPACE)
+    logistic_candidates = parameter_grid(logistic_space or LOGISTIC_SPACE)
+    with ExitStack() as stack:
+        shared = share_all(processed, stack, columns=features + TARGETS, dtype=np.float64)
+        folds = [[] for _ in range(n_folds)]
+        for ticker, data in processed.items():
+            splits = walk_forward_splits(len(data), n_folds, min_train_size=min_train_size)
+            for j, window in enumerate(reversed(splits)):
+                folds[j].append(shared[ticker] + window)
+        folds = [windows for windows in folds if windows]
+
+        pool = None if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+        try:
+            forest = successive_halving('forest', forest_candidates, folds,
+                                        len(features), eta, min_folds, pool)
+            logistic = successive_halving('logistic', logistic_candidates, folds,
+                                          len(features), eta, min_folds, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    best_forest = _pick(forest, tolerance)
+    best_logistic = _pick(logistic, tolerance)
+    return {
+        'reg_params': best_forest['params'],
+        'clf_params': best_logistic['params'],
+        'reg_mae': float(best_forest['loss']),
+        'clf_log_loss': float(best_logistic['loss']),
+        'features': features,
+        'tickers': [ticker for ticker in processed if ticker],
+        'history': pd.concat([forest, logistic], ignore_index=True),
+    }
+
+
+class TuningStore:
+    """
+    Best hyperparameters per ticker or ticker group, one JSON file each.
+
+    lookup(ticker, group) prefers a ticker's own entry and falls back to
+    its group's, so a sector-wide search covers tickers never tuned alone.
+    """
+
+    def __init__(self, root: str = DEFAULT_TUNING_DIR):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9._-]', '_', key.upper()) + ".json")
+
+    def get(self, key: str):
+        """Stored entry for key, or None"""
+        try:
+            with open(self.path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, result: dict):
+        """Save a tune_hyperparameters result (without its history) under key"""
+        entry = {k: v for k, v in result.items() if k != 'history'}
+        entry['tuned_at'] = datetime.now(timezone.utc).isoformat()
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.path(key) + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, self.path(key))
+
+    def lookup(self, ticker: str, group: str = None):
+        """Entry for ticker, else for group, else None"""
+        return self.get(ticker) or (self.get(group) if group else None)
+
+
+_default_tuning_store = None
+
+
+def get_default_tuning_store() -> TuningStore:
+    """Shared store read by run_models (STOCK_TUNING_DIR, /tmp/stock_tuning by default)"""
+    global _default_tuning_store
+    if _default_tuning_store is None:
+        _default_tuning_store = TuningStore()
+    return _default_tuning_store
+
+
+def tune_and_store(processed, group: str = None, store: TuningStore = None, **kwargs) -> dict:
+    """
+    Tune and save the result under every ticker (and the group, if given)
+    Args:
+        processed: Ticker -> output of add_technical_features
+        group: Optional group name (e.g. a sector) to also save under
+        store: TuningStore (defaults to the shared one)
+        **kwargs: Passed to tune_hyperparameters
+    Returns:
+        dict: The tune_hyperparameters result
+    """
+    store = store or get_default_tuning_store()
+    result = tune_hyperparameters(processed, **kwargs)
+    for key in list(processed) + ([group] if group else []):
+        store.put(key, result)
+    return result
+
+
+def main():
+    from .data_fetcher import fetch_many
+    from .feature_engineer import add_technical_features_many
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--group', help='Tune one configuration for all tickers under this name')
+    parser.add_argument('--days', type=int, default=3 * 365, help='Calendar days of history')
+    parser.add_argument('--folds', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    processed = add_technical_features_many(fetch_many(args.tickers, days=args.days))
+    groups = {args.group: processed} if args.group else {t: {t: d} for t, d in processed.items()}
+    for name, frames in groups.items():
+        result = tune_and_store(frames, group=args.group, n_folds=args.folds, workers=args.workers)
+        print(f"{name}: forest {result['reg_params']} (MAE {result['reg_mae']:.4f}), "
+              f"logistic {result['clf_params']} (log loss {result['clf_log_loss']:.4f})")
+
+
+if __name__ == '__main__':
+    main()
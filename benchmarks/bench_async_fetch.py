@@ -0,0 +1,126 @@
+"""
+Benchmark: concurrent AsyncBarFetcher downloads against a local stub server
+
+Usage:
+    python -m benchmarks.bench_async_fetch --tickers 500 --latency 0.05 --throttle 0.1
+
+The stub serves Yahoo chart API responses built from synthetic bars,
+sleeps `latency` seconds per request and answers a `throttle` share of
+requests with HTTP 429, so backoff and the rate limit are exercised
+without any network access.
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+import time
+from urllib.parse import urlparse, parse_qs
+
+from PredictionEngine.async_fetcher import AsyncBarFetcher
+from benchmarks.synthetic import gbm_ohlcv
+
+
+def chart_payload(ticker: str, start: datetime, end: datetime) -> dict:
+    """Yahoo v8 chart response for synthetic bars"""
+    bars = gbm_ohlcv(ticker, start, end)
+    timestamps = [int(ts.timestamp()) + 14 * 3600 for ts in bars.index]
+    return {'chart': {'error': None, 'result': [{
+        'meta': {'symbol': ticker, 'exchangeTimezoneName': 'UTC'},
+        'timestamp': timestamps,
+        'indicators': {
+            'quote': [{
+                'open': bars['Open'].tolist(),
+                'high': bars['High'].tolist(),
+                'low': bars['Low'].tolist(),
+                'close': bars['Close'].tolist(),
+                'volume': bars['Volume'].tolist(),
+            }],
+            'adjclose': [{'adjclose': bars['Close'].tolist()}],
+        },
+    }]}}
+
+
+def start_stub_server(latency: float = 0.0, throttle: float = 0.0, missing=(), failing=()):
+    """
+    Start the stub chart server in a daemon thread; returns (server, base_url)
+    Connections are kept alive (HTTP/1.1), tickers in missing answer 404,
+    tickers in failing always answer 503 and server.connections collects
+    the client address of every request.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _empty_response(self, status: int):
+            self.send_response(status)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def do_GET(self):
+            server.connections.append(self.client_address)
+            time.sleep(latency)
+            if random.random() < throttle:
+                self._empty_response(429)
+                return
+            url = urlparse(self.path)
+            ticker = url.path.rsplit('/', 1)[-1]
+            if ticker in missing:
+                self._empty_response(404)
+                return
+            if ticker in failing:
+                self._empty_response(503)
+                return
+            query = parse_qs(url.query)
+            start = datetime.fromtimestamp(int(query['period1'][0]), timezone.utc).replace(tzinfo=None)
+            end = datetime.fromtimestamp(int(query['period2'][0]), timezone.utc).replace(tzinfo=None)
+            body = json.dumps(chart_payload(ticker, start, end)).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.connections = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v8/finance/chart/{{ticker}}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--throttle', type=float, default=0.1)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--rate', type=float, default=200)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.latency, args.throttle)
+    fetcher = AsyncBarFetcher(base_url=base_url, max_concurrency=args.concurrency,
+                              rate_per_second=args.rate, burst=args.concurrency,
+                              backoff_base=0.05)
+    tickers = [f"SYN{i:04d}" for i in range(args.tickers)]
+    end = datetime.today()
+    start = end - timedelta(days=365)
+
+    t0 = time.perf_counter()
+    frames, errors = fetcher.fetch_many_sync(tickers, start, end)
+    elapsed = time.perf_counter() - t0
+    fetcher.close_sync()
+    server.shutdown()
+
+    sequential = args.tickers * args.latency
+    print(f"fetched {len(frames)}/{args.tickers} tickers in {elapsed:.2f}s "
+          f"({fetcher.retries} retries, {len(errors)} failures; "
+          f"serial latency alone would be {sequential:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: price regression backends side by side
+
+Usage:
+    python -m benchmarks.bench_backends --tickers 5 --years 5
+
+Every backend in REGRESSION_BACKENDS is trained on the same synthetic
+tickers and the same chronological train/test splits, then timed for
+fitting, single-row prediction (StockPredictor.predict, the serving
+path) and a batch prediction over the test split. Model size is the
+pickled regressor, the bulk of what the model cache writes to disk.
+"""
+import argparse
+from datetime import datetime, timedelta
+import pickle
+import time
+
+import pandas as pd
+
+from PredictionEngine.data_fetcher import compact_frame
+from PredictionEngine.feature_engineer import add_technical_features
+from PredictionEngine.model_backends import REGRESSION_BACKENDS
+from PredictionEngine.model_predictor import StockPredictor
+from benchmarks.synthetic import gbm_ohlcv
+
+
+def _best_of(func, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_backend(backend: str, frames: list, repeats: int) -> dict:
+    """Mean fit/predict timings, model size and MAE of one backend over frames"""
+    rows = []
+    for processed in frames:
+        predictor = StockPredictor(backend=backend)
+        X_train, X_test, y_train_reg, y_test_reg, y_train_clf, y_test_clf = \
+            predictor.prepare_data(processed)
+
+        t0 = time.perf_counter()
+        predictor.reg_model.fit(X_train, y_train_reg)
+        fit_seconds = time.perf_counter() - t0
+        predictor.clf_model.fit(X_train, y_train_clf)
+
+        latest = processed[predictor.features].iloc[[-1]]
+        predictor.predict(latest)  # build the compiled path outside the timings
+        rows.append({
+            'fit_ms': fit_seconds * 1000,
+            'predict_one_ms': _best_of(lambda: predictor.predict(latest), repeats) * 1000,
+            'predict_batch_ms': _best_of(lambda: predictor.predict_many(X_test), repeats) * 1000,
+            'model_kb': len(pickle.dumps(predictor.reg_model)) / 1e3,
+            'mae': predictor.evaluate(X_test, y_test_reg, y_test_clf).mae,
+        })
+    return {'backend': backend, **pd.DataFrame(rows).mean().to_dict()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=5)
+    parser.add_argument('--years', type=float, default=5)
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    end = datetime(2025, 1, 1)
+    start = end - timedelta(days=int(365.25 * args.years))
+    frames = [add_technical_features(compact_frame(gbm_ohlcv(f"SYN{i:04d}", start, end)))
+              for i in range(args.tickers)]
+
+    report = pd.DataFrame([bench_backend(backend, frames, args.repeats)
+                           for backend in REGRESSION_BACKENDS]).set_index('backend')
+    print(f"{args.tickers} tickers x {args.years:g} years, {len(frames[0])} rows each "
+          f"(means per ticker; predict timings best of {args.repeats})")
+    print(report.to_string(float_format='{:,.3f}'.format))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: cold import time of the app's entry modules
+
+Usage:
+    python -m benchmarks.bench_import --repeats 5 --top 10
+
+Each module is imported in a fresh interpreter (as a scaled-from-zero
+container would), best of --repeats, minus the bare interpreter start-up.
+--top lists the slowest imports under each module from `python -X importtime`.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+MODULES = [
+    'PredictionEngine',
+    'PredictionEngine.feature_engineer',
+    'frontend',
+    'frontend.visualization',
+    'streamlit_app',
+    'PredictionEngine.stock_predictor',
+    'PredictionEngine.service',
+]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code: str, *flags) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, '-c', code], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+
+
+def import_seconds(module: str, repeats: int) -> float:
+    """Best-of wall time of a fresh interpreter importing module"""
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        _run(f"import {module}")
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def slowest_imports(module: str, top: int) -> list:
+    """(cumulative seconds, name) of the slowest imports below module"""
+    rows = []
+    for line in _run(f"import {module}", '-X', 'importtime').stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative) / 1e6, name.rstrip()))
+    return sorted(rows, reverse=True)[1:top + 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--top', type=int, default=0, help='Also list the N slowest nested imports')
+    args = parser.parse_args()
+
+    baseline = import_seconds('sys', args.repeats)
+    print(f"interpreter start-up: {baseline * 1000:.0f} ms (subtracted below)")
+    for module in MODULES:
+        print(f"{module:<36} {(import_seconds(module, args.repeats) - baseline) * 1000:8.0f} ms")
+        for seconds, name in slowest_imports(module, args.top):
+            print(f"    {name.strip():<32} {seconds * 1000:8.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
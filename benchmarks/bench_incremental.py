@@ -0,0 +1,33 @@
+"""
+Benchmark: incremental StockPredictor updates vs full refits
+
+Usage:
+    python -m benchmarks.bench_incremental --days 1260 --step 5
+"""
+import argparse
+import pandas as pd
+
+from PredictionEngine.feature_engineer import add_technical_features
+from PredictionEngine.incremental import compare_incremental_to_refit, summarize_comparison
+from benchmarks.synthetic import synthetic_closes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--days', type=int, default=1260)
+    parser.add_argument('--step', type=int, default=5)
+    parser.add_argument('--window', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    closes = synthetic_closes(1, args.days, seed=args.seed)[0]
+    dates = pd.bdate_range('2000-01-03', periods=args.days)
+    data = add_technical_features(pd.DataFrame({'Close': closes}, index=dates))
+
+    report = compare_incremental_to_refit(data, step=args.step, window=args.window)
+    for name, value in summarize_comparison(report).items():
+        print(f"{name:>22}: {value:.4f}" if isinstance(value, float) else f"{name:>22}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: memory held by engineered frames for a large universe
+
+Usage:
+    python -m benchmarks.bench_memory --tickers 1000 --years 20
+
+Builds compact bars and features for every synthetic ticker, keeps them
+all alive (as a screener or service process would) and reports the
+bytes held per dtype, measured with tracemalloc.
+"""
+import argparse
+from datetime import datetime, timedelta
+import tracemalloc
+
+from PredictionEngine.data_fetcher import compact_frame
+from PredictionEngine.feature_engineer import add_technical_features
+from benchmarks.synthetic import gbm_ohlcv
+
+
+def held_bytes(n_tickers: int, years: float, dtype: str) -> tuple:
+    """(bytes held by the processed frames, peak bytes while building them)"""
+    end = datetime(2025, 1, 1)
+    start = end - timedelta(days=int(365.25 * years))
+    bars = [gbm_ohlcv(f"SYN{i:04d}", start, end) for i in range(n_tickers)]
+
+    tracemalloc.start()
+    frames = [add_technical_features(compact_frame(ticker_bars, dtype)) for ticker_bars in bars]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del frames
+    return current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--years', type=float, default=20)
+    args = parser.parse_args()
+
+    for dtype in ('float64', 'float32'):
+        current, peak = held_bytes(args.tickers, args.years, dtype)
+        print(f"{dtype}: {current / 1e6:8.1f} MB held for {args.tickers} tickers x {args.years:g} years "
+              f"({current / args.tickers / 1e3:.0f} kB/ticker), peak {peak / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark: per-ticker add_technical_features vs the NumPy panel kernels
+
+Usage:
+    python -m benchmarks.bench_panel_features --tickers 10 500 5000 --days 252
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from PredictionEngine.feature_engineer import add_technical_features
+from PredictionEngine.panel_features import PanelBuffers, compute_panel_features
+from benchmarks.synthetic import synthetic_closes
+
+
+def time_pandas(closes: np.ndarray, dates: pd.DatetimeIndex) -> float:
+    start = time.perf_counter()
+    for row in closes:
+        add_technical_features(pd.DataFrame({'Close': row}, index=dates))
+    return time.perf_counter() - start
+
+
+def time_panel(closes: np.ndarray, repeats: int = 3) -> float:
+    buffers = PanelBuffers(*closes.shape)
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        compute_panel_features(closes, buffers=buffers)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, nargs='+', default=[10, 500, 5000])
+    parser.add_argument('--days', type=int, default=252)
+    args = parser.parse_args()
+
+    dates = pd.bdate_range('2000-01-03', periods=args.days)
+    print(f"{'tickers':>8} {'pandas (s)':>12} {'panel (s)':>12} {'speedup':>9}")
+    for n_tickers in args.tickers:
+        closes = synthetic_closes(n_tickers, args.days)
+        pandas_time = time_pandas(closes, dates)
+        panel_time = time_panel(closes)
+        print(f"{n_tickers:>8} {pandas_time:>12.4f} {panel_time:>12.4f} {pandas_time / panel_time:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: request throughput of the HTTP prediction service on synthetic data
+
+Usage:
+    python -m benchmarks.bench_service --tickers 20 --requests 5000 --concurrency 64
+
+Starts the service in-process on a free port with a synthetic bar source,
+then fires concurrent GET /predict/{ticker} requests spread over the
+tickers. The first wave trains the models (concurrent requests for one
+ticker coalesce onto a single run); the rest are served warm.
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+from PredictionEngine.service import create_app, synthetic_service
+
+
+async def _fire(session, url: str, latencies: list, statuses: list):
+    t0 = time.perf_counter()
+    async with session.get(url) as response:
+        await response.read()
+        statuses.append(response.status)
+    latencies.append(time.perf_counter() - t0)
+
+
+async def run(n_tickers: int, n_requests: int, concurrency: int, workers: int):
+    service = synthetic_service(workers)
+    runner = web.AppRunner(create_app(service))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base = f"http://127.0.0.1:{port}"
+    tickers = [f"SYN{i:04d}" for i in range(n_tickers)]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def phase(urls):
+            latencies, statuses = [], []
+
+            async def bounded(url):
+                async with semaphore:
+                    await _fire(session, url, latencies, statuses)
+
+            t0 = time.perf_counter()
+            await asyncio.gather(*(bounded(url) for url in urls))
+            return time.perf_counter() - t0, np.array(latencies) * 1000, statuses
+
+        cold_urls = [f"{base}/predict/{tickers[i % n_tickers]}" for i in range(concurrency)]
+        cold_seconds, _, cold_statuses = await phase(cold_urls)
+        warm_urls = [f"{base}/predict/{tickers[i % n_tickers]}" for i in range(n_requests)]
+        warm_seconds, warm_ms, warm_statuses = await phase(warm_urls)
+
+    stats = service.stats()
+    await runner.cleanup()
+
+    ok = sum(status == 200 for status in cold_statuses + warm_statuses)
+    print(f"cold: {len(cold_urls)} requests for {n_tickers} tickers in {cold_seconds:.2f}s "
+          f"({stats['results']['misses']} computed, {stats['results']['hits']} served from the cache)")
+    print(f"warm: {n_requests / warm_seconds:,.0f} req/s, latency p50 {np.percentile(warm_ms, 50):.1f}ms "
+          f"p99 {np.percentile(warm_ms, 99):.1f}ms; {ok}/{len(cold_urls) + n_requests} OK")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(run(args.tickers, args.requests, args.concurrency, args.workers))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: handing feature frames to a process pool
+
+Usage:
+    python -m benchmarks.bench_shared_frames --tickers 500 --years 20 --workers 4
+
+Every synthetic ticker's engineered frame is sent to a pool task that
+does a trivial reduction, so the timings are dominated by the handoff:
+either each DataFrame is pickled to its worker (the old analyze_many and
+screen path) or the frames are written once to a SharedFrames matrix and
+each task carries only the handle and a row range.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import itertools
+import pickle
+import time
+
+from PredictionEngine.data_fetcher import compact_frame
+from PredictionEngine.feature_engineer import add_technical_features_many
+from PredictionEngine.shared_frames import SharedFrames, open_frame
+from benchmarks.synthetic import gbm_ohlcv
+
+
+def _reduce(data) -> float:
+    return float(data['Close'].mean())
+
+
+def _reduce_shared(handle, start: int, stop: int) -> float:
+    return _reduce(open_frame(handle, start, stop))
+
+
+def bench_pickled(pool, frames: dict) -> tuple:
+    """(seconds, bytes sent per task, results) when every frame is pickled to its worker"""
+    t0 = time.perf_counter()
+    results = list(pool.map(_reduce, frames.values()))
+    seconds = time.perf_counter() - t0
+    sent = sum(len(pickle.dumps((data,))) for data in frames.values()) / len(frames)
+    return seconds, sent, results
+
+
+def bench_shared(pool, frames: dict) -> tuple:
+    """(seconds, bytes sent per task, results) when workers map one SharedFrames matrix"""
+    t0 = time.perf_counter()
+    with SharedFrames(frames) as shared:
+        starts, stops = zip(*shared.ranges.values())
+        results = list(pool.map(_reduce_shared, itertools.repeat(shared.handle), starts, stops))
+        seconds = time.perf_counter() - t0
+        sent = len(pickle.dumps((shared.handle, starts[0], stops[0])))
+    return seconds, sent, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--years', type=float, default=20)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    end = datetime(2025, 1, 1)
+    start = end - timedelta(days=int(365.25 * args.years))
+    frames = add_technical_features_many({
+        f"SYN{i:04d}": compact_frame(gbm_ohlcv(f"SYN{i:04d}", start, end))
+        for i in range(args.tickers)})
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        pool.submit(int).result()  # start the workers outside the timings
+        pickled_seconds, pickled_bytes, pickled = bench_pickled(pool, frames)
+        shared_seconds, shared_bytes, shared = bench_shared(pool, frames)
+    assert pickled == shared
+
+    print(f"{args.tickers} tickers x {args.years:g} years, {len(next(iter(frames.values())))} rows each")
+    print(f"{'handoff':<10}{'seconds':>10}{'bytes/task':>14}")
+    print(f"{'pickled':<10}{pickled_seconds:>10.3f}{pickled_bytes:>14,.0f}")
+    print(f"{'shared':<10}{shared_seconds:>10.3f}{shared_bytes:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
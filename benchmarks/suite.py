@@ -0,0 +1,182 @@
+"""
+End-to-end pipeline benchmark suite on synthetic data (no network)
+
+Usage:
+    python -m benchmarks.suite run --output benchmarks/baseline.json
+    python -m benchmarks.suite run --quick --output current.json
+    python -m benchmarks.suite compare benchmarks/baseline.json current.json
+
+Two sweeps are timed: history length (1 to 30 years, one ticker) and
+universe size (1 to 1000 tickers, one year). Every case runs the real
+fetch path through a BarStore backed by SyntheticDownloader, then
+add_technical_features, prepare_data, train_models and evaluate for each
+ticker. Stage times are summed over tickers (best of --repeats); peak
+memory comes from a separate tracemalloc pass so it does not skew timings.
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from PredictionEngine.bar_store import BarStore
+from PredictionEngine.data_fetcher import fetch_stock_data
+from PredictionEngine.feature_engineer import add_technical_features
+from PredictionEngine.model_predictor import StockPredictor
+from PredictionEngine.profiling import Profiler, profile_stage
+from benchmarks.synthetic import SyntheticDownloader
+
+STAGES = ['fetch_cold', 'fetch_warm', 'add_technical_features',
+          'prepare_data', 'train_models', 'evaluate']
+
+FULL_CASES = [(years, 1) for years in (1, 5, 10, 30)] + \
+             [(1, tickers) for tickers in (10, 100, 1000)]
+QUICK_CASES = [(1, 1), (5, 1), (1, 10)]
+
+
+def _run_pipeline(years: float, n_tickers: int, track_memory: bool) -> list:
+    """Run every stage for each synthetic ticker and return the profiler records"""
+    tickers = [f"SYN{i:04d}" for i in range(n_tickers)]
+    days = int(round(365.25 * years))
+    profiler = Profiler(track_memory=track_memory)
+    with tempfile.TemporaryDirectory() as root:
+        source = SyntheticDownloader()
+        store = BarStore(root, downloader=source, batch_downloader=source.batch)
+        with profiler:
+            for ticker in tickers:
+                with profile_stage('fetch_cold'):
+                    fetch_stock_data(ticker, store=store, days=days)
+                with profile_stage('fetch_warm'):
+                    raw = fetch_stock_data(ticker, store=store, days=days)
+                with profile_stage('add_technical_features'):
+                    processed = add_technical_features(raw)
+                predictor = StockPredictor()
+                with profile_stage('prepare_data'):
+                    X_train, X_test, y_train_reg, y_test_reg, y_train_clf, y_test_clf = \
+                        predictor.prepare_data(processed)
+                with profile_stage('train_models'):
+                    predictor.train_models(X_train, y_train_reg, y_train_clf)
+                with profile_stage('evaluate'):
+                    predictor.evaluate(X_test, y_test_reg, y_test_clf)
+    return [r for r in profiler.records if r['stage'] in STAGES]
+
+
+def run_case(years: float, n_tickers: int, repeats: int = 3) -> list:
+    """
+    Benchmark one (years, tickers) case
+    Returns:
+        list: One row per stage with total seconds and peak memory bytes
+    """
+    seconds = {stage: float('inf') for stage in STAGES}
+    for _ in range(repeats):
+        totals = dict.fromkeys(STAGES, 0.0)
+        for record in _run_pipeline(years, n_tickers, track_memory=False):
+            totals[record['stage']] += record['seconds']
+        seconds = {stage: min(seconds[stage], totals[stage]) for stage in STAGES}
+
+    peak = dict.fromkeys(STAGES, 0)
+    for record in _run_pipeline(years, n_tickers, track_memory=True):
+        peak[record['stage']] = max(peak[record['stage']], record['peak_memory_bytes'])
+
+    case = f"years={years:g},tickers={n_tickers}"
+    return [{'case': case, 'years': years, 'tickers': n_tickers, 'stage': stage,
+             'seconds': seconds[stage], 'peak_memory_bytes': peak[stage]}
+            for stage in STAGES]
+
+
+def run_suite(cases: list, repeats: int = 3) -> dict:
+    results = []
+    for years, n_tickers in cases:
+        rows = run_case(years, n_tickers, repeats)
+        total = sum(row['seconds'] for row in rows)
+        print(f"{rows[0]['case']:<22} {total:>10.3f}s", file=sys.stderr)
+        results.extend(rows)
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'sklearn': sklearn.__version__,
+            'repeats': repeats,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2,
+            min_seconds: float = 0.005) -> pd.DataFrame:
+    """
+    Diff two suite results
+    Args:
+        baseline: Output of run_suite saved earlier
+        current: Output of run_suite to check
+        threshold: Relative slowdown (or memory growth) flagged as a regression
+        min_seconds: Ignore timing changes on stages faster than this
+    Returns:
+        pd.DataFrame: Per case/stage ratios with a 'regression' flag
+    """
+    keys = ['case', 'stage']
+    old = pd.DataFrame(baseline['results']).set_index(keys)
+    new = pd.DataFrame(current['results']).set_index(keys)
+    table = old[['seconds', 'peak_memory_bytes']].join(
+        new[['seconds', 'peak_memory_bytes']], lsuffix='_base', rsuffix='_new', how='inner')
+    table['time_ratio'] = table['seconds_new'] / table['seconds_base']
+    table['memory_ratio'] = table['peak_memory_bytes_new'] / table['peak_memory_bytes_base'].replace(0, np.nan)
+    slow = (table['time_ratio'] > 1 + threshold) & (table['seconds_new'] >= min_seconds)
+    heavy = table['memory_ratio'] > 1 + threshold
+    table['regression'] = slow | heavy
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help='Run the suite and save results as JSON')
+    run_parser.add_argument('--output', default='benchmarks/baseline.json')
+    run_parser.add_argument('--repeats', type=int, default=3)
+    run_parser.add_argument('--quick', action='store_true', help='Small cases only')
+    run_parser.add_argument('--years', type=float, nargs='+',
+                            help='History lengths for the single-ticker sweep')
+    run_parser.add_argument('--tickers', type=int, nargs='+',
+                            help='Universe sizes for the one-year sweep')
+
+    compare_parser = sub.add_parser('compare', help='Diff results against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.2)
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        if args.years or args.tickers:
+            cases = [(years, 1) for years in (args.years or [])] + \
+                    [(1, tickers) for tickers in (args.tickers or [])]
+        else:
+            cases = QUICK_CASES if args.quick else FULL_CASES
+        results = run_suite(cases, repeats=args.repeats)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved {len(results['results'])} measurements to {args.output}")
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        table = compare(baseline, current, threshold=args.threshold)
+        with pd.option_context('display.width', 200, 'display.max_rows', None,
+                               'display.max_columns', None):
+            print(table[['seconds_base', 'seconds_new', 'time_ratio', 'memory_ratio', 'regression']])
+        regressions = int(table['regression'].sum())
+        print(f"\n{regressions} regression(s) above {args.threshold:.0%}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
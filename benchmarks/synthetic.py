@@ -0,0 +1,16 @@
+"""
+Deterministic synthetic market data for offline benchmarks
+
+gbm_ohlcv and SyntheticDownloader live in PredictionEngine.synthetic (the
+service's --synthetic mode uses them too) and are re-exported here.
+"""
+import numpy as np
+
+from PredictionEngine.synthetic import SyntheticDownloader, gbm_ohlcv
+
+
+def synthetic_closes(n_tickers: int, n_days: int, seed: int = 0) -> np.ndarray:
+    """Geometric Brownian motion close prices shaped (tickers, days)"""
+    rng = np.random.default_rng(seed)
+    log_returns = rng.normal(0.0003, 0.02, size=(n_tickers, n_days))
+    return 100 * np.exp(np.cumsum(log_returns, axis=1))
@@ -1,13 +1,11 @@
-
-from .visualization import render_stock_visualizations
-
 __all__ = ['render_stock_visualizations']
 __version__ = '1.0.0'
 
-# Initialize Streamlit config when module is imported
-import streamlit as st
-st.set_page_config(
-    page_title="Stock Prediction Dashboard",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
\ No newline at end of file
+
+def __getattr__(name):
+    # Loaded on first use so importing frontend stays cheap (and side-effect free);
+    # streamlit_app.py sets the page config itself
+    if name == 'render_stock_visualizations':
+        from .visualization import render_stock_visualizations
+        return render_stock_visualizations
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
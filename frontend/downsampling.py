@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_POINTS = 500
+
+
+def _as_float_x(index) -> np.ndarray:
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(np.float64)
+    if np.issubdtype(np.asarray(index).dtype, np.datetime64):
+        return np.asarray(index).astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return np.asarray(index, dtype=np.float64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets point selection
+    Args:
+        x: Monotonic x values
+        y: y values (no NaN)
+        n_out: Number of points to keep (first and last are always kept)
+    Returns:
+        np.ndarray: Sorted indices of the selected points
+    """
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    if n_out == 2:
+        return np.array([0, n - 1])
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    anchor = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Twice the triangle area between the anchor, each candidate and the next bucket's mean
+        area = np.abs((x[anchor] - avg_x) * (y[start:end] - y[anchor])
+                      - (x[anchor] - x[start:end]) * (avg_y - y[anchor]))
+        anchor = start + int(np.argmax(area))
+        selected[i + 1] = anchor
+    selected[-1] = n - 1
+    return selected
+
+
+def min_max_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Keep the minimum and maximum of each bucket (preserves spikes, suits bars)
+    Args:
+        y: y values (no NaN)
+        n_out: Maximum number of points to keep (first and last are always kept)
+    Returns:
+        np.ndarray: Sorted unique indices of the selected points
+    """
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    selected = [0, n - 1]
+    n_buckets = (n_out - 2) // 2
+    if not n_buckets:
+        return np.array(selected)
+    for bucket in np.array_split(np.arange(n), n_buckets):
+        values = y[bucket]
+        selected.append(bucket[np.argmin(values)])
+        selected.append(bucket[np.argmax(values)])
+    return np.unique(selected)
+
+
+def downsample_xy(x, y, max_points: int = DEFAULT_MAX_POINTS, method: str = 'lttb') -> tuple:
+    """
+    Reduce aligned x/y arrays to at most max_points for plotting
+    Args:
+        x: Dates (DatetimeIndex or datetime64) or numbers, monotonic
+        y: Values; NaNs are dropped first
+        max_points: Point budget (None or 0 keeps everything)
+        method: 'lttb' for lines, 'minmax' for bars and spiky series
+    Returns:
+        tuple: (x, y) subsets of the original points, in order
+    """
+    y = np.asarray(y, dtype=np.float64)
+    keep = ~np.isnan(y)
+    if not keep.all():
+        x, y = x[keep], y[keep]
+    if not max_points or len(y) <= max_points:
+        return x, y
+    if method == 'minmax':
+        indices = min_max_indices(y, max_points)
+    elif method == 'lttb':
+        indices = lttb_indices(_as_float_x(x), y, max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method '{method}'")
+    return x[indices], y[indices]
+
+
+def downsample(series: pd.Series, max_points: int = DEFAULT_MAX_POINTS, method: str = 'lttb') -> pd.Series:
+    """
+    Reduce a series to at most max_points for plotting
+    Args:
+        series: Date-indexed values; NaNs are dropped first
+        max_points: Point budget (None or 0 keeps everything)
+        method: 'lttb' for lines, 'minmax' for bars and spiky series
+    Returns:
+        pd.Series: Subset of the original points, in order
+    """
+    series = series.dropna()
+    if not max_points or len(series) <= max_points:
+        return series
+    x, y = downsample_xy(series.index, series.to_numpy(dtype=np.float64), max_points, method)
+    return pd.Series(y, index=x, name=series.name)
@@ -1,9 +1,76 @@
 # app.py
 import streamlit as st
-from PredictionEngine import analyze_stock
+from PredictionEngine.feature_engineer import HORIZONS
+from PredictionEngine.result_cache import ResultCache
+from frontend.downsampling import DEFAULT_MAX_POINTS
 from frontend.visualization import render_stock_visualizations
 
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    """One result cache shared by every session in this server process"""
+    return ResultCache()
+
+def get_analysis(ticker: str, horizons=None) -> dict:
+    """Analysis for ticker, computed at most once per market day across all users"""
+    from PredictionEngine import analyze_stock  # loads scikit-learn; see warm_engine
+    ticker = ticker.strip().upper()
+    key = (ticker, tuple(horizons)) if horizons else ticker
+    return get_result_cache().get_or_compute(key, lambda: analyze_stock(ticker, horizons=horizons))
+
+@st.cache_resource(show_spinner=False)
+def warm_engine() -> int:
+    """
+    Import the model stack and load cached models once per server process
+    Runs at the end of the first script run, after the page is drawn.
+    """
+    from PredictionEngine import prewarm
+    return prewarm()
+
+def screener_page():
+    """Rank a CSV universe of tickers by predicted move"""
+    from PredictionEngine.screener import RANK_BY, read_universe, screen
+
+    st.subheader("Screener")
+    uploaded = st.file_uploader("Universe CSV (one ticker per row, or a 'ticker' column)", type='csv')
+    path = st.text_input("...or a local CSV path", "universe.csv")
+    col1, col2 = st.columns(2)
+    top_n = col1.number_input("Top N", min_value=1, max_value=1000, value=25)
+    rank_by = col2.selectbox("Rank by", RANK_BY, format_func=lambda key: key.replace('_', ' ').title())
+
+    if st.button("Run screener"):
+        try:
+            source = uploaded if uploaded is not None else path
+            tickers = list(read_universe(source))
+            bar = st.progress(0.0, text=f"Screening {len(tickers)} tickers...")
+
+            def report(p):
+                bar.progress(p.done / max(p.total, 1), text=f"{p.done}/{p.total} screened, {p.failed} failed")
+
+            st.session_state['screener'] = screen(tickers, int(top_n), rank_by, progress=report)
+            bar.empty()
+        except Exception as e:
+            st.session_state.pop('screener', None)
+            st.error(f"An error occurred: {str(e)}")
+
+    table = st.session_state.get('screener')
+    if table is not None:
+        st.caption(f"Top {len(table)} of {table.attrs['screened']} tickers "
+                   f"({table.attrs['failed']} without a usable prediction); click a column to sort")
+        st.dataframe(table, use_container_width=True, column_config={
+            'as_of': st.column_config.DateColumn("As of"),
+            'close': st.column_config.NumberColumn("Close", format="$%.2f"),
+            'predicted_price': st.column_config.NumberColumn("Predicted", format="$%.2f"),
+            'expected_return': st.column_config.NumberColumn("Expected Return", format="percent"),
+            'up_probability': st.column_config.NumberColumn("P(Up)", format="percent"),
+        })
+
 def main():
+    st.set_page_config(
+        page_title="Stock Prediction Dashboard",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
     # Add this at the very beginning of your code, before any other content
     st.markdown("""
     <style>
@@ -44,6 +111,11 @@ def main():
     """, unsafe_allow_html=True)
 
     st.markdown('<h1 class="centered-title">Stock Prediction Dashboard</h1>', unsafe_allow_html=True)
+
+    if st.sidebar.radio("Mode", ["Single ticker", "Screener"]) == "Screener":
+        screener_page()
+        warm_engine()
+        return
     
     # Create columns to align the input and tooltip icon
     col1, col2 = st.columns([10, 1])
@@ -68,20 +140,35 @@ def main():
 
         """, unsafe_allow_html=True)
     
+    show_performance = st.sidebar.checkbox("Show performance", value=False)
+    max_points = st.sidebar.slider("Max points per chart", 100, 5000, DEFAULT_MAX_POINTS, step=100)
+    multi_horizon = st.sidebar.checkbox("Multi-horizon forecast (1/5/10/20 days)", value=False)
+
     if st.button("Analyze"):
         try:
-            results = analyze_stock(ticker)
+            st.session_state['results'] = get_analysis(ticker, HORIZONS if multi_horizon else None)
+        except Exception as e:
+            st.session_state.pop('results', None)
+            st.error(f"An error occurred: {str(e)}")
+
+    # Keep showing the last analysis when other widgets trigger a rerun
+    results = st.session_state.get('results')
+    if results is not None:
+        try:
             # Debug: Print the results structure
             # st.write("Raw results data:", results)
             
             # Ensure required keys exist
-            required_keys = ['historical_data', 'prediction', 'evaluation']
+            required_keys = ['historical_data', 'prediction', 'metrics']
             if all(key in results for key in required_keys):
-                render_stock_visualizations(results)
+                render_stock_visualizations(results, show_performance=show_performance,
+                                            max_points=max_points)
             else:
                 st.error("Invalid data structure received from prediction engine")
         except Exception as e:
             st.error(f"An error occurred: {str(e)}")
 
+    warm_engine()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
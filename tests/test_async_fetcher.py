@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime
+import random
+
+import numpy as np
+import pytest
+
+from PredictionEngine.async_fetcher import AsyncBarFetcher, FetchError
+from PredictionEngine.bar_store import BarStore, DownloadError, TickerNotFoundError
+from benchmarks.bench_async_fetch import start_stub_server
+from PredictionEngine.synthetic import gbm_ohlcv
+
+START = datetime(2025, 1, 1)
+END = datetime(2025, 7, 1)
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**kwargs):
+        server, base_url = start_stub_server(**kwargs)
+        servers.append(server)
+        return server, base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_many_matches_source(stub):
+    _, base_url = stub()
+    with AsyncBarFetcher(base_url=base_url, rate_per_second=1000, burst=100) as fetcher:
+        bars, errors = fetcher.fetch_many_sync(['AAA', 'BBB'], START, END)
+    assert errors == {}
+    for ticker in ('AAA', 'BBB'):
+        expected = gbm_ohlcv(ticker, START, END)
+        assert list(bars[ticker].index) == list(expected.index)
+        np.testing.assert_allclose(bars[ticker]['Close'], expected['Close'])
+
+
+def test_sync_calls_reuse_one_connection(stub):
+    server, base_url = stub()
+    with AsyncBarFetcher(base_url=base_url, rate_per_second=1000, burst=100) as fetcher:
+        for _ in range(3):
+            assert not fetcher('AAA', START, END).empty
+    assert len(server.connections) == 3
+    assert len(set(server.connections)) == 1
+
+
+def test_throttled_requests_are_retried(stub):
+    random.seed(0)
+    _, base_url = stub(throttle=0.3)
+    with AsyncBarFetcher(base_url=base_url, rate_per_second=1000, burst=100,
+                         max_retries=10, backoff_base=0.001) as fetcher:
+        bars, errors = fetcher.fetch_many_sync([f"T{i}" for i in range(20)], START, END)
+    assert errors == {} and len(bars) == 20
+    assert fetcher.retries > 0
+
+
+def test_concurrent_calls_keep_their_own_errors(stub):
+    _, base_url = stub(failing=('DOWN1', 'DOWN2'))
+
+    async def run():
+        async with AsyncBarFetcher(base_url=base_url, rate_per_second=1000, burst=100,
+                                   max_retries=1, backoff_base=0.001) as fetcher:
+            return await asyncio.gather(fetcher.fetch_many(['AAA', 'DOWN1'], START, END),
+                                        fetcher.fetch_many(['BBB', 'DOWN2'], START, END))
+
+    (bars1, errors1), (bars2, errors2) = asyncio.run(run())
+    assert set(bars1) == {'AAA'} and set(errors1) == {'DOWN1'}
+    assert set(bars2) == {'BBB'} and set(errors2) == {'DOWN2'}
+    assert '503' in errors1['DOWN1']
+
+
+def test_unknown_ticker_is_not_an_error(stub):
+    _, base_url = stub(missing=('GONE',))
+    with AsyncBarFetcher(base_url=base_url, rate_per_second=1000, burst=100) as fetcher:
+        bars, errors = fetcher.fetch_many_sync(['AAA', 'GONE'], START, END)
+        assert set(bars) == {'AAA'} and errors == {}
+        assert fetcher('GONE', START, END).empty
+
+
+def test_exhausted_retries_raise(stub, tmp_path):
+    server, base_url = stub(failing=('DOWN',), missing=('GONE',))
+    with AsyncBarFetcher(base_url=base_url, rate_per_second=1000, burst=100,
+                         max_retries=2, backoff_base=0.001) as fetcher:
+        with pytest.raises(FetchError, match='503'):
+            fetcher('DOWN', START, END)
+        assert len(server.connections) == 3
+
+        with pytest.raises(FetchError) as raised:
+            fetcher.batch(['AAA', 'DOWN'], START, END)
+        assert set(raised.value.frames) == {'AAA'} and set(raised.value.errors) == {'DOWN'}
+
+        # The store tells a failing ticker from an unknown one
+        store = BarStore(str(tmp_path), fetcher, fetcher.batch, max_retries=1)
+        with pytest.raises(DownloadError):
+            store.get('DOWN', START, END)
+        with pytest.raises(TickerNotFoundError):
+            store.get('GONE', START, END)
+        assert set(store.get_many(['AAA', 'DOWN'], START, END)) == {'AAA'}
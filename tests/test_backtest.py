@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from PredictionEngine.backtest import walk_forward_backtest, walk_forward_splits
+from PredictionEngine.feature_engineer import add_technical_features
+from PredictionEngine.synthetic import gbm_ohlcv
+
+
+def test_expanding_splits():
+    splits = walk_forward_splits(100, n_folds=4, min_train_size=60)
+    assert splits == [(0, 60, 70), (0, 70, 80), (0, 80, 90), (0, 90, 100)]
+
+
+def test_rolling_splits_keep_the_window_size():
+    splits = walk_forward_splits(100, n_folds=4, min_train_size=60, expanding=False)
+    assert splits == [(0, 60, 70), (10, 70, 80), (20, 80, 90), (30, 90, 100)]
+
+
+def test_splits_end_at_the_last_row():
+    # Leftover rows go to the first training window, never past the end
+    splits = walk_forward_splits(103, n_folds=3, test_size=10, min_train_size=50)
+    assert splits == [(0, 73, 83), (0, 83, 93), (0, 93, 103)]
+    # Too few rows for every fold: the first train window is still min_train_size
+    assert walk_forward_splits(80, n_folds=5, test_size=10, min_train_size=60) == [(0, 60, 70), (0, 70, 80)]
+
+
+@pytest.mark.parametrize('n_rows, test_size', [(60, None), (65, 10), (100, 0)])
+def test_splits_reject_short_series(n_rows, test_size):
+    with pytest.raises(ValueError):
+        walk_forward_splits(n_rows, n_folds=5, test_size=test_size, min_train_size=60)
+
+
+def test_workers_give_identical_scores():
+    processed = {ticker: add_technical_features(gbm_ohlcv(ticker, pd.Timestamp('2023-01-01'),
+                                                          pd.Timestamp('2025-01-01')))
+                 for ticker in ('AAA', 'BBB')}
+    serial = walk_forward_backtest(processed, n_folds=2, min_train_size=250, workers=1)
+    parallel = walk_forward_backtest(processed, n_folds=2, min_train_size=250, workers=2)
+    assert len(serial) == 4 and list(serial['ticker']) == ['AAA', 'AAA', 'BBB', 'BBB']
+    pd.testing.assert_frame_equal(serial, parallel)
@@ -0,0 +1,158 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from PredictionEngine.bar_store import BarStore, DownloadError
+from PredictionEngine.synthetic import SyntheticDownloader, gbm_ohlcv
+
+START = datetime(2024, 1, 1)
+END = datetime(2026, 10, 10)
+
+
+class RecordingDownloader(SyntheticDownloader):
+    """SyntheticDownloader that logs every request and can list tickers late"""
+
+    def __init__(self, listed=None):
+        super().__init__()
+        self.listed = listed or {}
+        self.requests = []
+        self.failures = 0  # calls left that raise
+        self.scale = 1.0   # adjustment factor applied to every price
+        self.last = None   # last date upstream has
+
+    def _bars(self, ticker, start, end):
+        if self.failures:
+            self.failures -= 1
+            raise DownloadError("HTTP 503")
+        bars = gbm_ohlcv(ticker, start, end)
+        bars = bars.loc[bars.index >= self.listed.get(ticker, start)]
+        if self.last is not None:
+            bars = bars.loc[:self.last]
+        prices = ['Open', 'High', 'Low', 'Close']
+        return bars.assign(**{column: bars[column] * self.scale for column in prices})
+
+    def __call__(self, ticker, start, end):
+        self.calls += 1
+        self.requests.append((ticker, pd.Timestamp(start)))
+        return self._bars(ticker, start, end)
+
+    def batch(self, tickers, start, end):
+        self.calls += 1
+        self.requests.extend((ticker, pd.Timestamp(start)) for ticker in tickers)
+        return {ticker: self._bars(ticker, start, end) for ticker in tickers}
+
+
+@pytest.fixture
+def store(tmp_path):
+    downloader = RecordingDownloader(listed={'YOUNG': pd.Timestamp('2026-06-01')})
+    return BarStore(str(tmp_path), downloader, downloader.batch, retry_delay=0)
+
+
+def test_warm_store_skips_network(store):
+    cold = store.get('AAPL', START, END)
+    warm = store.get('AAPL', START, END)
+    assert store.downloader.calls == 1
+    pd.testing.assert_frame_equal(cold, warm, check_freq=False)
+
+
+def test_stale_store_downloads_only_new_bars(store):
+    store.get('AAPL', START, datetime(2026, 9, 1))
+    last = store.read('AAPL').index[-1]
+    store.get('AAPL', START, END)
+    # One overlapping bar to detect re-adjusted history
+    assert store.downloader.requests[-1] == ('AAPL', last)
+    expected = gbm_ohlcv('AAPL', START, END)
+    pd.testing.assert_series_equal(store.read('AAPL')['Close'], expected['Close'], check_freq=False)
+
+
+def test_young_ticker_is_not_refetched(store):
+    for _ in range(3):
+        bars = store.get('YOUNG', START, END)
+    full_window = [r for r in store.downloader.requests if r[1] == pd.Timestamp(START)]
+    assert len(full_window) == 1
+    assert bars.index[0] == pd.Timestamp('2026-06-01')
+
+
+def test_get_many_young_ticker_is_not_refetched(store):
+    for _ in range(3):
+        frames = store.get_many(['AAPL', 'YOUNG'], START, END)
+    full_window = [r for r in store.downloader.requests if r[1] == pd.Timestamp(START)]
+    assert sorted(full_window) == [('AAPL', pd.Timestamp(START)), ('YOUNG', pd.Timestamp(START))]
+    assert set(frames) == {'AAPL', 'YOUNG'}
+
+
+def test_longer_window_refetches_history(store):
+    store.get('AAPL', datetime(2026, 1, 1), END)
+    bars = store.get('AAPL', START, END)
+    assert store.downloader.requests[-1] == ('AAPL', pd.Timestamp(START))
+    assert bars.index[0] < pd.Timestamp('2024-01-08')
+
+
+def test_missing_ticker_raises(tmp_path):
+    store = BarStore(str(tmp_path), lambda *args: pd.DataFrame(), None, retry_delay=0)
+    with pytest.raises(ValueError):
+        store.get('NONE', START, END)
+
+
+def test_failed_check_is_retried(store):
+    store.get('AAPL', START, datetime(2026, 9, 1))
+    store.downloader.failures = store.max_retries
+    stale = store.get('AAPL', START, END)
+    assert stale.index[-1] < pd.Timestamp('2026-09-01')
+    calls = store.downloader.calls
+    bars = store.get('AAPL', START, END)
+    assert store.downloader.calls == calls + 1
+    assert bars.index[-1] == pd.Timestamp('2026-10-09')
+
+
+def test_warm_download_retries(store):
+    store.get('AAPL', START, datetime(2026, 9, 1))
+    store.downloader.failures = 1
+    assert store.get('AAPL', START, END).index[-1] == pd.Timestamp('2026-10-09')
+
+
+def test_missing_session_is_rechecked(tmp_path):
+    downloader = RecordingDownloader()
+    downloader.last = pd.Timestamp('2026-10-08')  # the 9th is late upstream
+    store = BarStore(str(tmp_path), downloader, downloader.batch, retry_delay=0)
+    store.get('AAPL', START, END)
+    store.get('AAPL', START, datetime(2026, 10, 10, 0, 30))
+    assert downloader.calls == 1  # checked recently
+    store.get('AAPL', START, datetime(2026, 10, 10, 2))
+    assert downloader.calls == 2  # over an hour later the missing session is asked for again
+
+    downloader.last = None
+    assert store.get('AAPL', START, datetime(2026, 10, 10, 4)).index[-1] == pd.Timestamp('2026-10-09')
+
+
+@pytest.mark.parametrize('batch', [False, True])
+def test_readjusted_history_is_replaced(store, batch):
+    store.get('AAPL', START, datetime(2026, 9, 1))
+    store.downloader.scale = 0.5  # e.g. a 2:1 split
+    if batch:
+        store.get_many(['AAPL'], START, END)
+    else:
+        store.get('AAPL', START, END)
+    assert store.downloader.requests[-1] == ('AAPL', pd.Timestamp(START))
+    expected = gbm_ohlcv('AAPL', START, END)['Close'] * 0.5
+    pd.testing.assert_series_equal(store.read('AAPL')['Close'], expected, check_freq=False)
+
+
+def test_get_many_failed_batch_is_not_marked(store):
+    store.get_many(['AAPL', 'MSFT'], START, datetime(2026, 9, 1))
+    batch = store.batch_downloader
+
+    def partly_failing(tickers, start, end):
+        frames = batch(tickers, start, end)
+        raise DownloadError("1 failed", frames={'AAPL': frames['AAPL']}, errors={'MSFT': "HTTP 503"})
+
+    store.batch_downloader = partly_failing
+    frames = store.get_many(['AAPL', 'MSFT'], START, END)
+    assert frames['AAPL'].index[-1] == pd.Timestamp('2026-10-09')
+    assert frames['MSFT'].index[-1] < pd.Timestamp('2026-09-01')
+
+    store.batch_downloader = batch
+    store.get_many(['AAPL', 'MSFT'], START, END)
+    assert store.downloader.requests[-1][0] == 'MSFT'
+    assert store.read('MSFT').index[-1] == pd.Timestamp('2026-10-09')
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from PredictionEngine.bar_store import BarStore
+from PredictionEngine.batch import analyze_many
+from PredictionEngine.feature_engineer import add_technical_features, add_technical_features_many
+from PredictionEngine.synthetic import SyntheticDownloader
+
+
+class FakeSource(SyntheticDownloader):
+    """Synthetic bars, except BAD (no Close column) and GONE (no bars)"""
+
+    def __call__(self, ticker, start, end):
+        if ticker == 'GONE':
+            return pd.DataFrame()
+        bars = super().__call__(ticker, start, end)
+        return bars.drop(columns='Close') if ticker == 'BAD' else bars
+
+    def batch(self, tickers, start, end):
+        return {ticker: self(ticker, start, end) for ticker in tickers}
+
+
+@pytest.fixture
+def store(tmp_path):
+    source = FakeSource()
+    return BarStore(str(tmp_path), source, source.batch)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_one_bad_ticker_does_not_sink_the_batch(store, workers):
+    results = {r['ticker']: r for r in analyze_many(['AAA', 'BAD', 'BBB', 'GONE'], workers=workers,
+                                                    store=store)}
+    assert set(results) == {'AAA', 'BAD', 'BBB', 'GONE'}
+    assert 'Close' in results['BAD']['error']
+    assert 'error' in results['GONE']
+    for ticker in ('AAA', 'BBB'):
+        assert 'error' not in results[ticker]
+        assert results[ticker]['prediction']['direction'] in ('UP', 'DOWN')
+        assert results[ticker]['profile'][-1]['stage'] == 'run_models'
+
+
+def test_feature_errors_are_collected_per_ticker(store):
+    frames = {ticker: store.get(ticker, pd.Timestamp('2024-01-01'), pd.Timestamp('2025-01-01'))
+              for ticker in ('AAA', 'BAD', 'BBB')}
+    with pytest.raises(KeyError):
+        add_technical_features_many(frames)
+
+    errors = {}
+    processed = add_technical_features_many(frames, errors=errors)
+    assert set(processed) == {'AAA', 'BBB'} and set(errors) == {'BAD'}
+    pd.testing.assert_frame_equal(processed['AAA'], add_technical_features(frames['AAA']))
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from frontend.downsampling import downsample, downsample_xy, lttb_indices, min_max_indices
+
+N = 1000
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    values = 100 + np.cumsum(rng.normal(size=N))
+    values[[137, 612]] = [500.0, -300.0]  # spikes
+    return pd.Series(values, index=pd.bdate_range('2020-01-01', periods=N), name='Close')
+
+
+@pytest.mark.parametrize('n_out', [2, 3, 4, 7, 50, 499])
+def test_lttb_keeps_endpoints_within_budget(series, n_out):
+    indices = lttb_indices(np.arange(N, dtype=np.float64), series.to_numpy(), n_out)
+    assert len(indices) == n_out
+    assert indices[0] == 0 and indices[-1] == N - 1
+    assert (np.diff(indices) > 0).all()
+
+
+@pytest.mark.parametrize('n_out', [2, 3, 4, 7, 50, 499])
+def test_minmax_keeps_endpoints_and_extrema(series, n_out):
+    y = series.to_numpy()
+    indices = min_max_indices(y, n_out)
+    assert len(indices) <= n_out
+    assert indices[0] == 0 and indices[-1] == N - 1
+    assert (np.diff(indices) > 0).all()
+    if n_out >= 4:
+        assert {137, 612} <= set(indices)
+        # Every bucket keeps its own extremes
+        for bucket in np.array_split(np.arange(N), (n_out - 2) // 2):
+            assert bucket[np.argmax(y[bucket])] in indices and bucket[np.argmin(y[bucket])] in indices
+
+
+def test_short_inputs_are_kept_whole():
+    y = np.arange(10.0)
+    np.testing.assert_array_equal(lttb_indices(y, y, 10), np.arange(10))
+    np.testing.assert_array_equal(min_max_indices(y, 50), np.arange(10))
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_downsample_returns_original_points(series, method):
+    series = series.copy()
+    series.iloc[[10, 20]] = np.nan
+    reduced = downsample(series, 100, method)
+    assert len(reduced) <= 100
+    assert reduced.index[0] == series.index[0] and reduced.index[-1] == series.index[-1]
+    pd.testing.assert_series_equal(reduced, series.loc[reduced.index])
+    assert series.max() == reduced.max() and series.min() == reduced.min()
+
+    x, y = downsample_xy(series.index, series.to_numpy(), max_points=0)
+    assert len(y) == N - 2
+
+
+def test_unknown_method(series):
+    with pytest.raises(ValueError):
+        downsample(series, 100, 'every_nth')
@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+from PredictionEngine import feature_registry
+from PredictionEngine.feature_engineer import add_technical_features, add_technical_features_many
+from PredictionEngine.feature_registry import (INDICATORS, compute_indicators, register_indicator,
+                                               resolve, warmup_rows)
+from PredictionEngine.model_predictor import StockPredictor
+from PredictionEngine.synthetic import gbm_ohlcv
+
+BARS = gbm_ohlcv('AAA', pd.Timestamp('2024-01-01'), pd.Timestamp('2025-01-01'))
+
+
+def test_resolve_orders_dependencies_first():
+    order = resolve(['RSI', 'Return_1', 'Lag_1'])
+    assert sorted(order) == sorted(['_delta', '_avg_gain_14', '_avg_loss_14', 'RSI', 'Lag_1', 'Return_1'])
+    for name in order:
+        for dependency in INDICATORS[name].depends:
+            assert dependency in ('Close', 'High', 'Low') or order.index(dependency) < order.index(name)
+    # Shared intermediates are listed once
+    assert resolve(['BB_Upper', 'BB_Lower']).count('MA_20') == 1
+
+
+def test_resolve_rejects_unknown_and_circular(monkeypatch):
+    with pytest.raises(ValueError, match="Unknown feature 'Nope'"):
+        resolve(['Nope'])
+    monkeypatch.setattr(feature_registry, 'INDICATORS', dict(INDICATORS))
+    register_indicator('_b', depends=('_c',))(lambda c: c)
+    register_indicator('_c', depends=('_b',))(lambda b: b)
+    with pytest.raises(ValueError, match='Circular feature dependency: _b -> _c -> _b'):
+        resolve(['_b'])
+
+
+@pytest.mark.parametrize('names, expected', [
+    (['Lag_3'], 3),
+    (['MA_20'], 19),
+    (['Return_1'], 1),
+    (['RSI'], 14),
+    (['MACD_Signal'], 33),
+    (['Lag_1', 'MA_5'], 4),
+    (['Close', 'Lag_2'], 2),
+    (['Close'], 0),
+])
+def test_warmup_rows(names, expected):
+    assert warmup_rows(names) == expected
+    values = compute_indicators(lambda column: BARS[column], names)
+    leading_nans = max(int(series.isna().sum()) for series in values.values())
+    # An upper bound: RSI's gain/loss split turns the first NaN delta into 0
+    assert leading_nans == expected or (names == ['RSI'] and leading_nans == expected - 1)
+
+
+def test_compute_indicators_only_reads_what_it_needs():
+    read = []
+
+    def column(name):
+        read.append(name)
+        return BARS[name]
+
+    values = compute_indicators(column, ['Return_1', 'ATR'])
+    assert list(values) == ['Return_1', 'ATR'] and sorted(read) == ['Close', 'High', 'Low']
+    expected = add_technical_features(BARS, features=['Return_1', 'ATR'])
+    pd.testing.assert_series_equal(values['ATR'].loc[expected.index], expected['ATR'], check_names=False)
+
+
+def test_raw_columns_pass_through():
+    values = compute_indicators(lambda column: BARS[column], ['Lag_1', 'Close', 'Volume'])
+    pd.testing.assert_series_equal(values['Close'], BARS['Close'])
+
+    features = ['Lag_1', 'Close', 'Volume']
+    processed = add_technical_features(BARS, features=features)
+    pd.testing.assert_series_equal(processed['Close'], BARS['Close'].loc[processed.index], check_dtype=False)
+    many = add_technical_features_many({'AAA': BARS}, features=features)
+    pd.testing.assert_frame_equal(many['AAA'], processed)
+
+    predictor = StockPredictor(features=features, reg_params={'n_estimators': 5})
+    X_train, _, y_train_reg, _, y_train_clf, _ = predictor.prepare_data(processed)
+    predictor.train_models(X_train, y_train_reg, y_train_clf)
+    assert predictor.predict(processed.iloc[[-1]])['last_close'] == processed['Lag_1'].iloc[-1]
@@ -0,0 +1,19 @@
+import numpy as np
+
+from PredictionEngine.model_predictor import StockPredictor
+
+
+def test_updates_do_not_reuse_tree_seeds():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 5))
+    y = X[:, 0] + rng.normal(size=300)
+    predictor = StockPredictor(incremental=True, trees_per_update=5, max_trees=20,
+                               reg_params={'n_estimators': 20})
+    predictor.train_models(X, y, (y > 0).astype(int))
+
+    seeds = [tree.random_state for tree in predictor.reg_model.estimators_]
+    for _ in range(6):
+        predictor.update_models(X[-100:], y[-100:], (y[-100:] > 0).astype(int))
+        assert len(predictor.reg_model.estimators_) == 20
+        seeds += [tree.random_state for tree in predictor.reg_model.estimators_[-5:]]
+    assert len(set(seeds)) == len(seeds)
@@ -0,0 +1,17 @@
+import pandas as pd
+import pytest
+
+from PredictionEngine.data_fetcher import compact_frame
+from PredictionEngine.feature_engineer import add_technical_features
+from PredictionEngine.indicator_engine import IncrementalFeatureEngine
+from PredictionEngine.synthetic import gbm_ohlcv
+
+
+@pytest.mark.parametrize('dtype', ['float64', 'float32'])
+def test_frame_equals_batch_features(dtype):
+    bars = compact_frame(gbm_ohlcv('AAA', pd.Timestamp('2023-01-01'), pd.Timestamp('2025-01-01')), dtype)
+    engine = IncrementalFeatureEngine()
+    engine.update(bars.iloc[:300])
+    engine.update(bars.iloc[300:])
+    pd.testing.assert_frame_equal(engine.frame(), add_technical_features(bars),
+                                  check_exact=True, check_freq=False)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from PredictionEngine.metrics import compute_metrics
+from PredictionEngine.model_predictor import EvaluationResult
+
+
+@pytest.fixture
+def evaluation():
+    actual = np.array([100.0, 102.0, 101.0, 105.0])
+    predicted = np.array([101.0, 100.0, 101.0, 109.0])
+    return EvaluationResult(
+        dates=pd.bdate_range('2025-01-06', periods=4),
+        actual_price=actual,
+        predicted_price=predicted,
+        mae=1.75,
+        actual_direction=np.array([1, 0, 1, 1]),
+        predicted_direction=np.array([1, 1, 1, 0]),
+        up_probability=np.array([0.9, 0.6, 0.7, 0.4]),
+        accuracy=0.5,
+    )
+
+
+def test_scores_match_hand_computed_values(evaluation):
+    metrics = compute_metrics(evaluation)
+    # Errors are 1, 2, 0 and 4
+    assert metrics.mae == pytest.approx(7 / 4)
+    assert metrics.rmse == pytest.approx(np.sqrt(21 / 4))
+    assert metrics.mape == pytest.approx((1 / 100 + 2 / 102 + 0 + 4 / 105) / 4 * 100)
+    # Directions: 2 of 4 right; 2 of 3 UP calls right; 2 of 3 actual UPs caught
+    assert metrics.accuracy == pytest.approx(0.5)
+    assert metrics.precision == pytest.approx(2 / 3)
+    assert metrics.recall == pytest.approx(2 / 3)
+    assert metrics.f1 == pytest.approx(2 / 3)
+    np.testing.assert_array_equal(metrics.confusion, [[0, 1], [1, 2]])
+    # The DOWN day (P(up) 0.6) ranks below two of the three UP days
+    assert metrics.roc_auc == pytest.approx(2 / 3)
+    np.testing.assert_allclose(metrics.point_accuracy, [99.0, 100 - 200 / 102, 100.0, 100 - 400 / 105])
+
+
+def test_returns_and_single_class(evaluation):
+    metrics = compute_metrics(evaluation, volatility_window=2)
+    np.testing.assert_allclose(metrics.returns_pct, [2.0, -100 / 102, 400 / 101])
+    assert list(metrics.return_dates) == list(evaluation.dates[1:])
+    assert np.isnan(metrics.volatility[0])
+    assert metrics.volatility[1] == pytest.approx(np.std([2.0, -100 / 102], ddof=1))
+
+    one_class = compute_metrics(EvaluationResult(**{**evaluation.__dict__,
+                                                   'actual_direction': np.ones(4, dtype=int)}))
+    assert one_class.roc_auc is None and one_class.roc_fpr is None
@@ -0,0 +1,82 @@
+import os
+
+import pandas as pd
+import pytest
+
+from PredictionEngine import model_cache
+from PredictionEngine.feature_engineer import add_technical_features
+from PredictionEngine.model_cache import ModelCache, make_cache_key
+from PredictionEngine.model_predictor import StockPredictor
+from PredictionEngine.synthetic import gbm_ohlcv
+
+
+@pytest.fixture
+def split():
+    bars = gbm_ohlcv('AAA', pd.Timestamp('2023-01-01'), pd.Timestamp('2025-01-01'))
+    predictor = StockPredictor(reg_params={'n_estimators': 10})
+    X_train, _, y_train_reg, _, y_train_clf, _ = predictor.prepare_data(add_technical_features(bars))
+    return X_train, y_train_reg, y_train_clf
+
+
+def test_key_tracks_data_params_and_feature_version(split, monkeypatch):
+    X_train, y_reg, y_clf = split
+    key = make_cache_key('aaa', X_train, y_reg, y_clf)
+    assert key == make_cache_key('AAA', X_train.copy(), y_reg.copy(), y_clf.copy())
+    assert key.startswith(f"AAA-v{model_cache.FEATURE_SET_VERSION}-")
+
+    changed = X_train.copy()
+    changed.iloc[-1, 0] += 0.01
+    assert make_cache_key('AAA', changed, y_reg, y_clf) != key
+    assert make_cache_key('AAA', X_train.iloc[1:], y_reg.iloc[1:], y_clf.iloc[1:]) != key
+    assert make_cache_key('AAA', X_train, y_reg, y_clf, {'n_estimators': 10}) != key
+
+    monkeypatch.setattr(model_cache, 'FEATURE_SET_VERSION', model_cache.FEATURE_SET_VERSION + 1)
+    assert make_cache_key('AAA', X_train, y_reg, y_clf) != key
+
+
+def test_hits_and_misses():
+    cache = ModelCache()
+    assert cache.get('a') is None
+    cache.put('a', 'model-a')
+    assert cache.get('a') == 'model-a'
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'size': 1}
+
+
+def test_lru_eviction_order():
+    cache = ModelCache(max_size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now least recently used
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_reload_from_disk(split, tmp_path):
+    X_train, y_reg, y_clf = split
+    predictor = StockPredictor(reg_params={'n_estimators': 10})
+    predictor.train_models(X_train, y_reg, y_clf)
+    key = make_cache_key('AAA', X_train, y_reg, y_clf)
+    ModelCache(directory=str(tmp_path)).put(key, predictor)
+
+    fresh = ModelCache(directory=str(tmp_path))
+    loaded = fresh.get(key)
+    assert loaded is not predictor
+    pd.testing.assert_frame_equal(loaded.predict_many(X_train.iloc[-5:]), predictor.predict_many(X_train.iloc[-5:]))
+    assert fresh.stats()['hits'] == 1 and fresh.get(key) is loaded
+
+
+def test_preload_keeps_the_newest_files(tmp_path):
+    writer = ModelCache(directory=str(tmp_path))
+    version = model_cache.FEATURE_SET_VERSION
+    keys = [f"T{i}-v{version}-hash" for i in range(4)]
+    for age, key in enumerate(reversed(keys)):
+        writer.put(key, key)
+        stamp = 1_700_000_000 - age * 60  # keys[-1] is the newest file
+        os.utime(writer._path(key), (stamp, stamp))
+    writer.put(f"OLD-v{version - 1}-hash", 'stale feature set')
+
+    cache = ModelCache(max_size=2, directory=str(tmp_path))
+    assert sorted(cache.preload()) == sorted(keys[-2:])
+    assert list(cache._entries) == keys[-2:]  # newest is most recently used
+    assert ModelCache(directory=str(tmp_path)).preload(['t0']) == [keys[0]]
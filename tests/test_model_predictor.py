@@ -0,0 +1,80 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from PredictionEngine.data_fetcher import compact_frame
+from PredictionEngine.feature_engineer import HORIZONS, add_technical_features
+from PredictionEngine.model_backends import REGRESSION_BACKENDS
+from PredictionEngine.model_predictor import StockPredictor
+from PredictionEngine.stock_predictor import run_models
+from PredictionEngine.synthetic import gbm_ohlcv
+
+
+def _trained(backend='forest', dtype='float64'):
+    bars = gbm_ohlcv('AAA', pd.Timestamp('2022-01-01'), pd.Timestamp('2025-01-01'))
+    data = add_technical_features(compact_frame(bars, dtype))
+    params = {'n_estimators': 20} if backend == 'forest' else {}
+    predictor = StockPredictor(reg_params=params, backend=backend)
+    X_train, X_test, y_train_reg, _, y_train_clf, _ = predictor.prepare_data(data)
+    predictor.train_models(X_train, y_train_reg, y_train_clf)
+    return predictor, X_test
+
+
+def test_pickle_leaves_out_compiled_models():
+    predictor, X_test = _trained()
+    before = len(pickle.dumps(predictor))
+    expected = predictor.predict_many(X_test)
+    assert predictor._compiled is not None
+    assert len(pickle.dumps(predictor)) == before
+
+    restored = pickle.loads(pickle.dumps(predictor))
+    assert restored._compiled is None
+    pd.testing.assert_frame_equal(restored.predict_many(X_test), expected)
+
+
+@pytest.mark.parametrize('dtype', ['float64', 'float32'])
+@pytest.mark.parametrize('backend', list(REGRESSION_BACKENDS))
+def test_compiled_matches_sklearn(backend, dtype):
+    predictor, X_test = _trained(backend, dtype)
+    # The predictor feeds its models float64, whatever the frame dtype
+    X = X_test[predictor.features].astype(np.float64)
+    result = predictor.predict_many(X_test)
+    np.testing.assert_array_equal(result['price'], predictor.reg_model.predict(X))
+    np.testing.assert_array_equal(result['up_probability'], predictor.clf_model.predict_proba(X)[:, 1])
+
+
+@pytest.mark.parametrize('backend', ['ridge', 'linear'])
+def test_float32_frames_fit_in_float64(backend):
+    predictor, _ = _trained(backend, 'float32')
+    assert predictor.reg_model.coef_.dtype == np.float64
+    assert predictor.clf_model.coef_.dtype == np.float64
+
+
+def test_multi_horizon_forecast_uses_the_last_bar():
+    bars = gbm_ohlcv('AAA', pd.Timestamp('2022-01-01'), pd.Timestamp('2025-01-01'))
+    data = add_technical_features(bars, horizons=HORIZONS)
+    # The latest bars are kept without targets so they can still be forecast
+    assert data.index[-1] == bars.index[-1]
+    assert data['Target_Price'].isna().sum() == 1
+    assert data[f'Target_Price_{max(HORIZONS)}'].isna().sum() == max(HORIZONS)
+
+    predictor = StockPredictor(reg_params={'n_estimators': 20}, horizons=HORIZONS)
+    X_train, X_test, y_train_reg, y_test_reg, y_train_clf, y_test_clf = predictor.prepare_data(data)
+    assert list(y_train_reg.columns) == ['Target_Price'] + [f'Target_Price_{h}' for h in HORIZONS[1:]]
+    for frame in (y_train_reg, y_test_reg, y_train_clf, y_test_clf):
+        assert not frame.isna().any().any()
+    assert len(X_train) + len(X_test) == len(data) - max(HORIZONS)
+    assert X_test.index[-1] == data.index[-max(HORIZONS) - 1]
+
+    predictor.train_models(X_train, y_train_reg, y_train_clf)
+    prediction = predictor.predict(data.iloc[[-1]])
+    assert [entry['horizon'] for entry in prediction['forecast']] == HORIZONS
+    assert prediction['forecast'][0]['price'] == prediction['price']
+    assert prediction['last_close'] == data['Lag_1'].iloc[-1]
+
+    results = run_models('AAA', data, cache=False, tuning=False, horizons=HORIZONS, simulate=False)
+    assert results['dates']['test_dates'][-1] == data.index[-max(HORIZONS) - 1]
+    assert len(results['prediction']['forecast']) == len(HORIZONS)
+    assert results['prediction']['last_close'] == data['Lag_1'].iloc[-1]
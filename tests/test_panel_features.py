@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from PredictionEngine.feature_engineer import add_technical_features
+from PredictionEngine.panel_features import (PANEL_COLUMNS, PanelBuffers, compute_panel_features,
+                                             panel_from_frames, panel_to_frame)
+from PredictionEngine.synthetic import gbm_ohlcv
+
+END = datetime(2025, 1, 1)
+# Ragged histories: later listings leave NaN at the start of their panel rows
+STARTS = {'AAA': datetime(2023, 1, 1), 'BBB': datetime(2023, 6, 15), 'CCC': datetime(2024, 9, 1)}
+
+
+@pytest.fixture
+def frames():
+    return {ticker: gbm_ohlcv(ticker, start, END) for ticker, start in STARTS.items()}
+
+
+def test_panel_matches_per_ticker_features(frames):
+    tickers, dates, closes = panel_from_frames(frames)
+    panel = compute_panel_features(closes)
+    for row, ticker in enumerate(tickers):
+        expected = add_technical_features(frames[ticker])
+        actual = panel_to_frame(panel, dates, row)
+        pd.testing.assert_index_equal(actual.index, expected.index, exact=False)
+        for column in PANEL_COLUMNS:
+            np.testing.assert_allclose(actual[column].to_numpy(), expected[column].to_numpy(dtype=float),
+                                       rtol=1e-9, err_msg=f"{ticker} {column}")
+
+
+def test_buffers_are_reused(frames):
+    _, _, closes = panel_from_frames(frames)
+    buffers = PanelBuffers(*closes.shape)
+    expected = compute_panel_features(closes)
+    first = compute_panel_features(closes, buffers=buffers)
+    again = compute_panel_features(closes, buffers=buffers)
+    assert first is again is buffers.out
+    np.testing.assert_array_equal(again, expected)
+
+    with pytest.raises(ValueError):
+        compute_panel_features(closes[:, 1:], buffers=buffers)
@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import threading
+import time
+
+import pytest
+
+from PredictionEngine.result_cache import MARKET_TZ, ResultCache, next_market_close
+
+WAITERS = 4
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _run_concurrently(cache, compute):
+    """Start WAITERS calls for one key and release compute once all of them joined it"""
+    release = threading.Event()
+
+    def blocked():
+        release.wait(5)
+        return compute()
+
+    with ThreadPoolExecutor(WAITERS) as pool:
+        futures = [pool.submit(cache.get_or_compute, 'AAA', blocked) for _ in range(WAITERS)]
+        _wait_for(lambda: cache.stats()['hits'] == WAITERS - 1)
+        release.set()
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except Exception as e:
+                outcomes.append(e)
+    return outcomes
+
+
+def test_concurrent_callers_compute_once():
+    cache = ResultCache()
+    calls = []
+    outcomes = _run_concurrently(cache, lambda: calls.append(1) or {'ticker': 'AAA'})
+    assert len(calls) == 1
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    assert cache.stats() == {'hits': WAITERS - 1, 'misses': 1, 'size': 1, 'inflight': 0}
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = ResultCache()
+
+    def fail():
+        raise RuntimeError("download failed")
+
+    outcomes = _run_concurrently(cache, fail)
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert cache.stats()['size'] == 0 and cache.stats()['inflight'] == 0
+
+    assert cache.get_or_compute('AAA', lambda: 'recovered') == 'recovered'
+    assert cache.get('AAA') == 'recovered'
+
+
+def test_entries_expire_at_the_market_close():
+    close = datetime.now(MARKET_TZ) + timedelta(hours=1)
+    cache = ResultCache(expiry=lambda: close)
+    assert cache.get_or_compute('AAA', lambda: 'first') == 'first'
+    assert cache.get_or_compute('AAA', lambda: 'second') == 'first'
+
+    close = datetime.now(MARKET_TZ)  # the close has passed for the next entry
+    cache.invalidate('AAA')
+    assert cache.get_or_compute('AAA', lambda: 'second') == 'second'
+    assert cache.get('AAA') is None
+    assert cache.get_or_compute('AAA', lambda: 'third') == 'third'
+    assert cache.stats()['misses'] == 3
+
+
+@pytest.mark.parametrize('now, expected', [
+    (datetime(2025, 10, 15, 9, 0), datetime(2025, 10, 15, 16, 30)),   # Wednesday morning
+    (datetime(2025, 10, 15, 16, 29), datetime(2025, 10, 15, 16, 30)),
+    (datetime(2025, 10, 15, 16, 30), datetime(2025, 10, 16, 16, 30)),  # strictly after now
+    (datetime(2025, 10, 17, 16, 30), datetime(2025, 10, 20, 16, 30)),  # Friday close -> Monday
+    (datetime(2025, 10, 18, 12, 0), datetime(2025, 10, 20, 16, 30)),   # Saturday
+])
+def test_next_market_close(now, expected):
+    assert next_market_close(now.replace(tzinfo=MARKET_TZ)) == expected.replace(tzinfo=MARKET_TZ)
+
+
+def test_next_market_close_converts_to_exchange_time():
+    # 21:00 UTC is 17:00 in New York during daylight saving time, after the close
+    now = datetime.fromisoformat('2025-10-15T21:00:00+00:00')
+    assert next_market_close(now) == datetime(2025, 10, 16, 16, 30, tzinfo=MARKET_TZ)
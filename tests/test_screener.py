@@ -0,0 +1,56 @@
+import io
+
+import pandas as pd
+import pytest
+
+from PredictionEngine import stock_predictor
+from PredictionEngine.bar_store import BarStore
+from PredictionEngine.screener import read_universe, screen
+from PredictionEngine.synthetic import SyntheticDownloader
+
+TICKERS = [f"T{i:02d}" for i in range(7)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    source = SyntheticDownloader()
+    return BarStore(str(tmp_path), source, source.batch)
+
+
+@pytest.fixture(autouse=True)
+def no_shared_cache(monkeypatch):
+    def shared_cache():
+        raise AssertionError("the screener must not use the shared model cache")
+    monkeypatch.setattr(stock_predictor, 'get_default_cache', shared_cache)
+
+
+def test_read_universe():
+    source = io.BytesIO(b"Name,Symbol\nApple, aapl\n,\n#x,#y\nMS,msft\nA2,AAPL\n")
+    assert list(read_universe(source)) == ['AAPL', 'MSFT']
+    assert list(read_universe(io.StringIO("aapl\nmsft\n"))) == ['AAPL', 'MSFT']
+
+
+@pytest.mark.parametrize('rank_by', ['expected_return', 'up_probability'])
+def test_top_k_matches_full_ranking(store, rank_by):
+    full = screen(TICKERS, top_n=len(TICKERS), rank_by=rank_by, chunk_size=3, store=store)
+    top = screen(TICKERS, top_n=3, rank_by=rank_by, chunk_size=2, store=store)
+
+    assert list(full.index) == list(range(1, len(TICKERS) + 1))
+    assert sorted(full['ticker']) == TICKERS
+    assert list(full[rank_by]) == sorted(full[rank_by], reverse=True)
+    assert list(top['ticker']) == list(full['ticker'][:3])
+    assert top.attrs == {'screened': len(TICKERS), 'failed': 0}
+
+
+def test_progress_and_failures(tmp_path):
+    source = SyntheticDownloader()
+
+    def downloader(ticker, start, end):
+        return pd.DataFrame() if ticker == 'BAD' else source(ticker, start, end)
+
+    store = BarStore(str(tmp_path), downloader, None, retry_delay=0)
+    reports = []
+    table = screen(TICKERS[:3] + ['BAD'], top_n=2, chunk_size=2, store=store, progress=reports.append)
+    assert len(table) == 2
+    assert table.attrs == {'screened': 4, 'failed': 1}
+    assert [(p.done, p.failed, p.total) for p in reports] == [(2, 0, 4), (4, 1, 4)]
@@ -0,0 +1,99 @@
+import asyncio
+import tempfile
+import warnings
+
+import pandas as pd
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from PredictionEngine.bar_store import BarStore, DownloadError
+from PredictionEngine.model_cache import ModelCache
+from PredictionEngine.service import SERVICE_KEY, PredictionService, create_app
+from PredictionEngine.synthetic import SyntheticDownloader
+
+
+class FakeSource(SyntheticDownloader):
+    """Synthetic bars, except GONE (unknown ticker), DOWN (source failing) and SHORT (too little history)"""
+
+    def __call__(self, ticker, start, end):
+        if ticker == 'GONE':
+            return pd.DataFrame()
+        if ticker == 'DOWN':
+            raise DownloadError("HTTP 503 for 'DOWN'")
+        bars = super().__call__(ticker, start, end)
+        return bars.iloc[-10:] if ticker == 'SHORT' else bars
+
+
+def _serve(test):
+    """Run test(client, service) against the app on a fake source"""
+    source = FakeSource()
+    store = BarStore(tempfile.mkdtemp(prefix='stock_bars_'), downloader=source,
+                     batch_downloader=None, retry_delay=0)
+    service = PredictionService(store=store, cache=ModelCache(), workers=2)
+
+    async def run():
+        async with TestClient(TestServer(create_app(service))) as client:
+            return await test(client, service)
+
+    return asyncio.run(run())
+
+
+def test_predict_one_returns_compact_payload():
+    async def test(client, service):
+        response = await client.get('/predict/aaa')
+        assert response.status == 200
+        payload = await response.json()
+        assert payload['ticker'] == 'AAA'
+        assert payload['direction'] in ('UP', 'DOWN')
+        assert {'price', 'last_close', 'mae', 'accuracy', 'scenarios'} <= set(payload)
+
+        again = await client.get('/predict/AAA')
+        assert await again.json() == payload
+        assert service.stats()['results']['hits'] >= 1
+
+    _serve(test)
+
+
+def test_concurrent_requests_coalesce():
+    async def test(client, service):
+        responses = await asyncio.gather(*(client.get('/predict/BBB') for _ in range(4)))
+        payloads = [await response.json() for response in responses]
+        assert all(payload == payloads[0] for payload in payloads)
+        assert service.stats()['results']['misses'] == 1
+
+    _serve(test)
+
+
+@pytest.mark.parametrize('ticker, status', [('GONE', 404), ('DOWN', 503), ('SHORT', 500)])
+def test_errors_map_to_status(ticker, status):
+    async def test(client, service):
+        response = await client.get(f'/predict/{ticker}')
+        assert response.status == status
+        assert 'error' in await response.json()
+
+    _serve(test)
+
+
+def test_predict_many_reports_failures_per_ticker():
+    async def test(client, service):
+        response = await client.get('/predict', params={'tickers': 'AAA,GONE'})
+        assert response.status == 200
+        predictions = (await response.json())['predictions']
+        assert [p['ticker'] for p in predictions] == ['AAA', 'GONE']
+        assert 'price' in predictions[0] and 'error' in predictions[1]
+
+        assert (await client.get('/predict')).status == 400
+        assert (await client.get('/health')).status == 200
+
+    _serve(test)
+
+
+def test_app_key_holds_the_service():
+    service = PredictionService(workers=1)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')  # e.g. aiohttp's NotAppKeyWarning
+            app = create_app(service)
+        assert app[SERVICE_KEY] is service
+    finally:
+        service.close()
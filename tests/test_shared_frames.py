@@ -0,0 +1,123 @@
+from contextlib import ExitStack
+from datetime import datetime
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from PredictionEngine import batch, shared_frames
+from PredictionEngine.bar_store import BarStore
+from PredictionEngine.batch import analyze_many
+from PredictionEngine.shared_frames import SharedFrames, open_frame, share_all, try_share
+from PredictionEngine.synthetic import gbm_ohlcv, SyntheticDownloader
+
+TICKERS = ['AAA', 'BBB', 'CCC']
+
+
+def _frames(dtype=np.float64):
+    frames = {}
+    for i, ticker in enumerate(TICKERS):
+        frames[ticker] = gbm_ohlcv(ticker, datetime(2020 - i, 1, 1), datetime(2021, 1, 1)).astype(dtype)
+    return frames
+
+
+@pytest.fixture
+def store(tmp_path):
+    source = SyntheticDownloader()
+    return BarStore(str(tmp_path), source, source.batch)
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_round_trip(tmp_path, dtype):
+    frames = _frames(dtype)
+    with SharedFrames(frames, str(tmp_path)) as shared:
+        assert shared.skipped == []
+        for ticker, frame in frames.items():
+            mapped = open_frame(shared.handle, *shared.ranges[ticker])
+            pd.testing.assert_frame_equal(mapped, frame, check_freq=False)
+            assert mapped.index.dtype == frame.index.dtype
+            assert not mapped.to_numpy().flags.writeable
+            pd.testing.assert_frame_equal(shared.frame(ticker), frame, check_freq=False)
+
+
+def test_files_removed_on_close(tmp_path):
+    with SharedFrames(_frames(), str(tmp_path)) as shared:
+        assert os.path.exists(shared.handle.values_path)
+    assert not os.path.exists(shared.directory)
+    assert os.listdir(tmp_path) == []
+
+
+def test_mismatched_columns_are_skipped(tmp_path):
+    frames = _frames()
+    frames['BBB'] = frames['BBB'].assign(Extra=1.0)
+    with SharedFrames(frames, str(tmp_path)) as shared:
+        assert shared.skipped == ['BBB']
+        assert list(shared.ranges) == ['AAA', 'CCC']
+        pd.testing.assert_frame_equal(shared.frame('CCC'), frames['CCC'], check_freq=False)
+
+
+def test_small_shm_falls_back_to_temp_dir(tmp_path, monkeypatch):
+    class Full:
+        f_bavail, f_frsize = 1, 4096
+
+    monkeypatch.setattr(shared_frames, 'SHARED_DIR', None)
+    monkeypatch.setattr(shared_frames.os, 'statvfs', lambda path: Full())
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    assert shared_frames._default_directory(10 ** 6) == str(tmp_path)
+    with SharedFrames(_frames()) as shared:
+        assert os.path.dirname(shared.directory) == str(tmp_path)
+
+
+def test_unwritable_directory_gives_none(tmp_path):
+    assert try_share(_frames(), str(tmp_path / 'missing')) is None
+
+
+def _predictions(results):
+    results = list(results)
+    assert not [r for r in results if 'error' in r]
+    return {r['ticker']: r['prediction']['price'] for r in results}
+
+
+def test_analyze_many_workers_match_in_process(store):
+    expected = _predictions(analyze_many(TICKERS, workers=1, store=store))
+    assert _predictions(analyze_many(TICKERS, workers=2, store=store)) == expected
+
+
+def test_analyze_many_pickles_what_cannot_be_shared(store, tmp_path, monkeypatch):
+    expected = _predictions(analyze_many(TICKERS, workers=1, store=store))
+    features = batch.add_technical_features_many
+
+    def with_odd_frame(raw_frames, **kwargs):
+        processed = features(raw_frames, **kwargs)
+        processed['BBB'] = processed['BBB'].assign(Extra=1.0)
+        return processed
+
+    monkeypatch.setattr(batch, 'add_technical_features_many', with_odd_frame)
+    assert _predictions(analyze_many(TICKERS, workers=2, store=store)) == expected
+
+    monkeypatch.setattr(shared_frames, 'SHARED_DIR', str(tmp_path / 'missing'))
+    assert _predictions(analyze_many(TICKERS, workers=2, store=store)) == expected
+
+
+def test_column_subset_and_dtype(tmp_path):
+    frames = _frames(np.float32)
+    with SharedFrames(frames, str(tmp_path), columns=['Close', 'Open'], dtype=np.float64) as shared:
+        mapped = shared.frame('BBB')
+        assert list(mapped.columns) == ['Close', 'Open'] and mapped.dtypes.eq(np.float64).all()
+        np.testing.assert_array_equal(mapped.to_numpy(), frames['BBB'][['Close', 'Open']].to_numpy(np.float64))
+
+
+def test_share_all_covers_every_index_dtype():
+    frames = _frames()
+    frames['CCC'] = frames['CCC'].set_axis(frames['CCC'].index.astype('datetime64[s]'))
+    with ExitStack() as stack:
+        shared = share_all(frames, stack, columns=['Close'])
+        assert set(shared) == set(TICKERS)
+        assert len({handle for handle, *_ in shared.values()}) == 2
+        for ticker, frame in frames.items():
+            mapped = open_frame(*shared[ticker])
+            pd.testing.assert_frame_equal(mapped, frame[['Close']], check_freq=False)
+        directories = {os.path.dirname(handle.values_path) for handle, *_ in shared.values()}
+    assert not any(os.path.exists(directory) for directory in directories)
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from PredictionEngine.simulation import simulate_paths
+from PredictionEngine.synthetic import gbm_ohlcv
+
+CLOSE = gbm_ohlcv('AAA', pd.Timestamp('2023-01-01'), pd.Timestamp('2025-01-01'))['Close']
+
+
+@pytest.mark.parametrize('method', ['bootstrap', 'gbm'])
+@pytest.mark.parametrize('chunk_days', [1, 3, 7])
+def test_chunking_gives_identical_paths(method, chunk_days):
+    model_prices = CLOSE.iloc[-1] * np.linspace(0.98, 1.03, 20)
+    whole = simulate_paths(CLOSE, n_paths=500, method=method, model_prices=model_prices, seed=7)
+    chunked = simulate_paths(CLOSE, n_paths=500, method=method, model_prices=model_prices, seed=7,
+                             chunk_days=chunk_days)
+    np.testing.assert_array_equal(chunked.bands, whole.bands)
+    np.testing.assert_array_equal(chunked.mean, whole.mean)
+    np.testing.assert_array_equal(chunked.prob_gain, whole.prob_gain)
+    assert chunked.interval() == whole.interval()
+
+
+def test_seed_changes_the_paths():
+    first = simulate_paths(CLOSE, n_paths=500, seed=1)
+    assert not np.array_equal(first.mean, simulate_paths(CLOSE, n_paths=500, seed=2).mean)
+    np.testing.assert_array_equal(first.bands, simulate_paths(CLOSE, n_paths=500, seed=1).bands)
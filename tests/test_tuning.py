@@ -0,0 +1,61 @@
+import pandas as pd
+
+from PredictionEngine.feature_engineer import add_technical_features
+from PredictionEngine.stock_predictor import run_models
+from PredictionEngine.synthetic import gbm_ohlcv
+from PredictionEngine.tuning import TuningStore, _pick, config_cost, tune_and_store, tune_hyperparameters
+
+
+def _processed(ticker='AAA'):
+    return add_technical_features(gbm_ohlcv(ticker, pd.Timestamp('2022-01-01'), pd.Timestamp('2025-01-01')))
+
+
+class RecordingCache:
+    """ModelCache stand-in that never hits and keeps what run_models stores"""
+
+    def __init__(self):
+        self.stored = []
+
+    def get(self, key):
+        return None
+
+    def put(self, key, predictor):
+        self.stored.append(predictor)
+
+
+def test_pick_ignores_fit_times():
+    history = pd.DataFrame({
+        'round': [0, 0, 0],
+        'candidate': [0, 1, 2],
+        'loss': [1.000, 1.005, 1.2],
+        'fit_seconds': [0.1, 5.0, 0.01],
+        'cost': [config_cost('forest', {'n_estimators': 100, 'max_depth': None}, 5),
+                 config_cost('forest', {'n_estimators': 25, 'max_depth': 3}, 5),
+                 config_cost('forest', {'n_estimators': 25, 'max_depth': 3}, 5)],
+    })
+    assert _pick(history, tolerance=0.01)['candidate'] == 1
+
+
+def test_search_is_repeatable():
+    space = {'n_estimators': [5, 10], 'max_depth': [2, None]}
+    runs = [tune_hyperparameters(_processed(), forest_space=space, logistic_space={'C': [0.1, 1.0]},
+                                 n_folds=2, workers=1) for _ in range(2)]
+    assert runs[0]['reg_params'] == runs[1]['reg_params']
+    assert runs[0]['clf_params'] == runs[1]['clf_params']
+
+
+def test_run_models_applies_group_entry_and_features(tmp_path):
+    store = TuningStore(str(tmp_path))
+    tune_and_store({'BBB': _processed('BBB')}, group='tech', store=store,
+                   features=['Lag_1', 'MA_5', 'RSI'], forest_space={'n_estimators': [7], 'max_depth': [3]},
+                   logistic_space={'C': [0.5]}, n_folds=2, workers=1)
+
+    cache = RecordingCache()
+    run_models('AAA', _processed('AAA'), cache=cache, tuning=store, group='tech')
+    predictor = cache.stored[-1]
+    assert predictor.features == ['Lag_1', 'MA_5', 'RSI']
+    assert predictor.reg_model.n_estimators == 7
+    assert predictor.clf_model.C == 0.5
+
+    run_models('AAA', _processed('AAA'), cache=cache, tuning=store)
+    assert cache.stored[-1].reg_model.n_estimators == 100